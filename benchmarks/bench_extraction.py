@@ -0,0 +1,71 @@
+"""Microbenchmarks for response extraction.
+
+Times each extractor in src.extraction on a mix of typical responses
+(clean answers, answers wrapped in prose, fenced code) and reports the
+per-call cost, so parser regressions show up before an offline scoring run.
+
+Usage:
+    python -m benchmarks.bench_extraction
+    python -m benchmarks.bench_extraction --number 20000 --json
+"""
+
+import argparse
+import json
+import timeit
+from typing import Callable, Dict, List
+
+from src import extraction
+
+CODE_RESPONSES = [
+    "```python\ndef fibonacci(n):\n    a, b = 0, 1\n    for _ in range(n):\n        a, b = b, a + b\n    return a\n```",
+    "Here is the implementation:\n\ndef is_palindrome(s):\n    s = s.replace(' ', '').lower()\n    return s == s[::-1]\n",
+    "Sure! " * 40 + "\n```\nclass Stack:\n    def __init__(self):\n        self.items = []\n```\nHope this helps.",
+]
+
+JSON_RESPONSES = [
+    '{"person": "Jeff Bezos", "organization": "Amazon", "location": "Seattle"}',
+    'The entities are:\n```json\n{\n  "person": "Jeff Bezos",\n  "organization": "Amazon",\n  "location": "Seattle"\n}\n```',
+    'Note {not json} first. ' * 10 + '{"person": "A", "tags": ["x", "y"], "nested": {"k": "}"}}',
+]
+
+NUMBER_RESPONSES = [
+    "205.625",
+    "The customer pays $43.20 in total.",
+    "After simplifying, x = -4 or x = 1.5",
+    "Total revenue was 1,234,567.89 USD for the year.",
+]
+
+def _bench(func: Callable[[str], object], inputs: List[str], number: int) -> float:
+    """Mean microseconds per call over all inputs."""
+    def run():
+        for text in inputs:
+            func(text)
+    seconds = min(timeit.repeat(run, number=number, repeat=3))
+    return seconds / (number * len(inputs)) * 1e6
+
+def run_benchmarks(number: int = 5000) -> Dict[str, float]:
+    """Return microseconds per call for each extractor."""
+    return {
+        "extract_code_block": _bench(extraction.extract_code_block, CODE_RESPONSES, number),
+        "extract_json": _bench(extraction.extract_json, JSON_RESPONSES, number),
+        "extract_number": _bench(extraction.extract_number, NUMBER_RESPONSES, number),
+        "extract_numbers": _bench(extraction.extract_numbers, NUMBER_RESPONSES, number),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response extraction")
+    parser.add_argument("--number", type=int, default=5000, help="Iterations per input")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    backend = "orjson" if extraction.orjson is not None else "json"
+    print(f"JSON backend: {backend}")
+    for name, micros in results.items():
+        print(f"{name:<20} {micros:8.2f} us/call")
+
+if __name__ == "__main__":
+    main()
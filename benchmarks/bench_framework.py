@@ -0,0 +1,238 @@
+"""End-to-end benchmarks of the evaluation framework itself.
+
+Measures the framework's own overhead - not the model's - against a local
+mock server with zero latency:
+
+- ``client.generate``: prompts/sec and p50/p99 latency of LLMClient.generate
+- ``metrics.summary_<n>``: MetricsCollector.get_summary_statistics over n samples
+- ``monitor.add_metric``: PerformanceMonitor.add_metric cost per call
+- ``database.persist_results``: TestResult rows written per second via src.database
+- ``report.write``: streaming results and writing test_metrics.json
+
+Each benchmark runs ``--repeat`` times and reports its median run, so one
+noisy measurement does not fail the comparison. Benchmarks of framework
+modules missing from the tree (an older base branch without
+``src/mock_server.py``, say) are skipped rather than failing the whole run.
+
+Results are saved as JSON and can be compared against a saved baseline;
+``--baseline`` exits non-zero when any benchmark regresses by more than
+``--tolerance``.
+
+Usage:
+    python -m benchmarks.bench_framework --save benchmark_results.json
+    python -m benchmarks.bench_framework --baseline benchmark_baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)]
+
+def _result(value: float, unit: str, higher_is_better: bool, **extra) -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better, **extra}
+
+def bench_client_generate(requests: int = 1000, concurrency: int = 16) -> Dict[str, Any]:
+    """Throughput and latency of LLMClient.generate against a zero-latency mock server."""
+    from src.llm_client import LLMClient
+    from src.mock_server import MockServer
+
+    async def run(url: str) -> Tuple[List[float], float]:
+        latencies: List[float] = []
+        semaphore = asyncio.Semaphore(concurrency)
+        async with LLMClient(base_url=url, api_key="mock", model_name="mock", max_connections=concurrency) as client:
+            async def one(i: int):
+                async with semaphore:
+                    start = time.perf_counter()
+                    await client.generate(f"Benchmark prompt {i}", max_tokens=16)
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+            await one(-1)  # warm the connection pool
+            latencies.clear()
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(requests)))
+            return latencies, time.perf_counter() - start
+
+    with MockServer() as server:
+        latencies, elapsed = asyncio.run(run(server.url))
+    return _result(
+        requests / elapsed, "prompts/s", True,
+        p50_ms=_percentile(latencies, 50), p99_ms=_percentile(latencies, 99), concurrency=concurrency
+    )
+
+def bench_metrics_summary(samples: int) -> Dict[str, Any]:
+    """Time MetricsCollector.get_summary_statistics over `samples` responses."""
+    from src.metrics import MetricsCollector, ResponseMetrics
+
+    rng = random.Random(0)
+    collector = MetricsCollector()
+    for _ in range(samples):
+        collector.add_response_metrics(ResponseMetrics(
+            response_time=rng.lognormvariate(5, 0.5),
+            token_count=rng.randint(10, 500),
+            completion_status="stop",
+            tokens_per_second=rng.uniform(10, 100),
+            cost=0.001
+        ))
+    start = time.perf_counter()
+    collector.get_summary_statistics()
+    return _result((time.perf_counter() - start) * 1000, "ms", False, samples=samples)
+
+def bench_monitor_add_metric(calls: int = 5000) -> Dict[str, Any]:
+    """Mean cost of PerformanceMonitor.add_metric with a growing window."""
+    from src.metrics import PerformanceMonitor
+
+    monitor = PerformanceMonitor()
+    start = time.perf_counter()
+    for i in range(calls):
+        monitor.add_metric({"latency_ms": float(i)})
+    return _result((time.perf_counter() - start) / calls * 1e6, "us/call", False, calls=calls)
+
+def bench_persist_results(rows: int = 2000) -> Dict[str, Any]:
+    """TestResult rows written per second through the src.database models."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.database import Base, EvaluationRun, ModelRegistry, TestResult
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        model = ModelRegistry(
+            model_name="bench", model_version="1", provider_type="off_prem_api",
+            provider_name="mock", model_type="text-generation"
+        )
+        session.add(model)
+        session.flush()
+        run = EvaluationRun(model_id=model.model_id, run_status="success", run_metadata={})
+        session.add(run)
+        session.flush()
+
+        start = time.perf_counter()
+        session.add_all([
+            TestResult(
+                run_id=run.run_id, test_name=f"tests/test_bench.py::test_{i}",
+                result_value={"outcome": "passed", "score": 1.0}, pass_fail=True, execution_time=0.1
+            )
+            for i in range(rows)
+        ])
+        session.commit()
+        elapsed = time.perf_counter() - start
+        session.close()
+        engine.dispose()
+    return _result(rows / elapsed, "rows/s", True, rows=rows)
+
+def bench_report_write(results: int = 10000) -> Dict[str, Any]:
+    """Time to stream results and build test_metrics.json from the stream."""
+    from src.result_stream import ResultStreamWriter
+    from src.test_aggregator import write_metrics_report
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stream_path = os.path.join(tmp, "test_metrics.jsonl")
+        start = time.perf_counter()
+        with ResultStreamWriter(stream_path) as stream:
+            for i in range(results):
+                stream.write({
+                    "test_name": f"tests/test_bench.py::test_{i}", "outcome": "passed",
+                    "duration": 0.1, "timestamp": "2024-01-01T00:00:00"
+                })
+        write_metrics_report(stream_path, os.path.join(tmp, "test_metrics.json"), "bench")
+        elapsed = time.perf_counter() - start
+    return _result(elapsed * 1000, "ms", False, results=results)
+
+def _median_run(func: Callable[[], Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """Run a benchmark `repeat` times and return its median run, with every value in ``runs``."""
+    runs = sorted((func() for _ in range(max(1, repeat))), key=lambda result: result["value"])
+    return {**runs[(len(runs) - 1) // 2], "runs": [result["value"] for result in runs]}
+
+def run_benchmarks(quick: bool = False, repeat: int = 1) -> Dict[str, Dict[str, Any]]:
+    """Run every benchmark `repeat` times; `quick` uses small sizes (for smoke tests)."""
+    scale = 100 if quick else 1
+    benchmarks: Dict[str, Callable[[], Dict[str, Any]]] = {
+        "client.generate": lambda: bench_client_generate(max(20, 1000 // scale)),
+        "metrics.summary_10k": lambda: bench_metrics_summary(10_000 // scale),
+        "metrics.summary_1m": lambda: bench_metrics_summary(1_000_000 // scale),
+        "monitor.add_metric": lambda: bench_monitor_add_metric(5000 // scale),
+        "database.persist_results": lambda: bench_persist_results(2000 // scale),
+        "report.write": lambda: bench_report_write(10_000 // scale),
+    }
+    if quick:
+        # Reduced sizes are not comparable with full runs
+        benchmarks = {f"{name}.quick": func for name, func in benchmarks.items()}
+
+    results = {}
+    for name, func in benchmarks.items():
+        try:
+            results[name] = _median_run(func, repeat)
+        except ModuleNotFoundError as e:
+            if not (e.name or "").startswith("src."):
+                raise
+            print(f"Skipping {name}: {e.name} is not in this tree", file=sys.stderr)
+    return results
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Return a message for every benchmark more than `tolerance` worse than the baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base["value"]:
+            continue
+        change = (result["value"] - base["value"]) / base["value"]
+        worse = -change if result["higher_is_better"] else change
+        if worse > tolerance:
+            regressions.append(
+                f"{name}: {result['value']:.4g} {result['unit']} vs baseline {base['value']:.4g} ({worse:+.0%} worse)"
+            )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the evaluation framework against a local mock server")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results saved with --save")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before failing")
+    parser.add_argument("--quick", action="store_true", help="Small sizes for a fast smoke run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark; the median run is reported")
+    args = parser.parse_args()
+
+    # The client reads its retry settings; the mock server needs no real credentials
+    for name, value in (("API_BASE_URL", "http://127.0.0.1:9/"), ("API_KEY", "mock"), ("MODEL_NAME", "mock")):
+        os.environ.setdefault(name, value)
+
+    results = run_benchmarks(args.quick, args.repeat)
+    for name, result in results.items():
+        extra = "".join(
+            f"  {key}={value:.4g}" if isinstance(value, float) else f"  {key}={value}"
+            for key, value in result.items() if key not in ("value", "unit", "higher_is_better", "runs")
+        )
+        print(f"{name:<30} {result['value']:12.4g} {result['unit']:<10}{extra}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "timestamp": datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "benchmarks": results
+            }, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Import-time benchmark for the src package.
+
+Imports each module in a fresh interpreter under ``python -X importtime``,
+with the API settings removed from the environment, and reports the
+cumulative import time and which heavy dependencies were pulled in. The
+database and reporting modules must import without API credentials and
+without pydantic, httpx or tenacity; ``--check`` fails when they do not, so
+CI catches an eager import before it slows down every test run.
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --check --max-ms 1500
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+# Modules that must stay light: they are imported by database tooling and reports
+LIGHT_MODULES = ["src.config", "src.database", "src.test_aggregator", "src.result_stream"]
+
+# Modules that legitimately need the HTTP stack, reported for reference
+OTHER_MODULES = ["src.evaluation_engine", "src.llm_client"]
+
+HEAVY_DEPENDENCIES = ["pydantic", "pydantic_settings", "httpx", "tenacity", "numpy"]
+
+API_ENV = ["API_BASE_URL", "API_KEY", "MODEL_NAME"]
+
+_PROBE = (
+    "import {module}; import json, sys; "
+    "print(json.dumps([m for m in {heavy!r} if m in sys.modules]))"
+)
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """Import a module in a clean interpreter and return its timing and heavy dependencies."""
+    env = {key: value for key, value in os.environ.items() if key not in API_ENV}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_DEPENDENCIES)],
+        capture_output=True, text=True, env=env
+    )
+    result: Dict[str, Any] = {"module": module, "ok": proc.returncode == 0, "cumulative_ms": None, "heavy": []}
+    if proc.returncode != 0:
+        result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+        return result
+
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            result["cumulative_ms"] = int(parts[1]) / 1000
+    result["heavy"] = json.loads(proc.stdout.strip().splitlines()[-1])
+    return result
+
+def run_benchmarks(modules: List[str]) -> List[Dict[str, Any]]:
+    """Measure every module in its own interpreter."""
+    return [measure_import(module) for module in modules]
+
+def check(results: List[Dict[str, Any]], max_ms: Optional[float] = None) -> List[str]:
+    """Return a message for every light module that fails, is heavy, or is too slow."""
+    problems = []
+    for result in results:
+        if result["module"] not in LIGHT_MODULES:
+            continue
+        if not result["ok"]:
+            problems.append(f"{result['module']} does not import without API settings: {result['error']}")
+            continue
+        if result["heavy"]:
+            problems.append(f"{result['module']} imports {', '.join(result['heavy'])}")
+        if max_ms is not None and result["cumulative_ms"] is not None and result["cumulative_ms"] > max_ms:
+            problems.append(f"{result['module']} took {result['cumulative_ms']:.0f} ms (limit {max_ms:.0f} ms)")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of the src package")
+    parser.add_argument("--module", action="append", help="Module to measure (repeatable)")
+    parser.add_argument("--check", action="store_true", help="Fail if light modules regress")
+    parser.add_argument("--max-ms", type=float, help="Cumulative import time limit for light modules")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.module or LIGHT_MODULES + OTHER_MODULES)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            if not result["ok"]:
+                print(f"{result['module']:<24} FAILED  {result['error']}")
+                continue
+            heavy = ", ".join(result["heavy"]) or "-"
+            print(f"{result['module']:<24} {result['cumulative_ms']:8.1f} ms  heavy: {heavy}")
+
+    if args.check:
+        problems = check(results, args.max_ms)
+        for problem in problems:
+            print(f"FAIL: {problem}", file=sys.stderr)
+        sys.exit(1 if problems else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Checkpointed, resumable evaluation runs.
+
+Every finished case is written to ``test_results`` under the run's
+``evaluation_runs`` row as soon as it completes, so a run that dies midway
+(OOM, network, CI time limit) keeps everything it finished. Resuming the run
+by its ID skips the cases already recorded, and the final report is built
+from both parts.
+
+Usage:
+    python -m src.evaluation_engine --dataset cases.jsonl --checkpoint
+    python -m src.evaluation_engine --dataset cases.jsonl --resume <run id>
+    pytest --checkpoint
+    pytest --resume <run id>
+"""
+
+import json
+import uuid
+from typing import Any, Dict, Optional
+
+from .database import EvaluationRun, TestResult
+
+class RunCheckpoint:
+    """Records results of one evaluation run as they complete."""
+
+    def __init__(self, session, run: EvaluationRun, commit_every: int = 1):
+        """Initialize the checkpoint.
+
+        Args:
+            session: Database session owned by the checkpoint (closed by close())
+            run: The evaluation_runs row results are recorded under
+            commit_every: Results buffered per commit; 1 commits every result
+        """
+        self.session = session
+        self.run = run
+        self.run_id = str(run.run_id)
+        self._run_key = run.run_id
+        self.commit_every = max(1, commit_every)
+        self._pending = 0
+
+    @classmethod
+    def start(cls, session, metadata: Optional[Dict[str, Any]] = None, model_id=None, **kwargs) -> "RunCheckpoint":
+        """Create a new run in the "running" state."""
+        run = EvaluationRun(model_id=model_id, run_status="running", run_metadata=dict(metadata or {}))
+        session.add(run)
+        session.commit()
+        return cls(session, run, **kwargs)
+
+    @classmethod
+    def attach(cls, session, run_id: str, **kwargs) -> "RunCheckpoint":
+        """Record into an existing run without changing its status or metadata.
+
+        Used by parallel workers, whose parent process started (or resumed)
+        the run and is the only one to finish it.
+        """
+        try:
+            key = uuid.UUID(str(run_id))
+        except ValueError:
+            raise ValueError(f"Invalid run ID '{run_id}'") from None
+        run = session.query(EvaluationRun).filter(EvaluationRun.run_id == key).first()
+        if run is None:
+            raise ValueError(f"No evaluation run with ID {run_id}")
+        return cls(session, run, **kwargs)
+
+    @classmethod
+    def resume(cls, session, run_id: str, **kwargs) -> "RunCheckpoint":
+        """Reopen an existing run; raises ValueError if there is no such run."""
+        checkpoint = cls.attach(session, run_id, **kwargs)
+        run = checkpoint.run
+        metadata = dict(run.run_metadata or {})
+        metadata["resumed"] = metadata.get("resumed", 0) + 1
+        run.run_metadata = metadata
+        run.run_status = "running"
+        session.commit()
+        return checkpoint
+
+    def completed(self, retry_failed: bool = False) -> Dict[str, Dict[str, Any]]:
+        """The latest recorded result of every finished case, by test name.
+
+        Skipped cases never count as finished; with `retry_failed`, failed
+        ones do not either, so they run again on resume.
+        """
+        self.flush()
+        rows = (
+            self.session.query(TestResult)
+            .filter(TestResult.run_id == self._run_key)
+            .order_by(TestResult.created_at)
+        )
+        latest: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            value = row.result_value
+            if isinstance(value, str):
+                value = json.loads(value)
+            latest[row.test_name] = value
+        unfinished = {"skipped", "failed"} if retry_failed else {"skipped"}
+        return {name: value for name, value in latest.items() if value.get("outcome") not in unfinished}
+
+    def record(self, result: Dict[str, Any]):
+        """Add one result record (test_metrics format); committed every `commit_every` results."""
+        value = json.loads(json.dumps(result, default=str))
+        self.session.add(TestResult(
+            run_id=self._run_key,
+            test_name=result["test_name"],
+            result_value=value,
+            pass_fail=result.get("outcome") == "passed",
+            execution_time=result.get("duration")
+        ))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self.flush()
+
+    def flush(self):
+        """Commit buffered results."""
+        if self._pending:
+            self.session.commit()
+            self._pending = 0
+
+    def finish(self, status: str, metadata: Optional[Dict[str, Any]] = None):
+        """Commit remaining results and set the run's final status and metadata."""
+        self.run.run_status = status
+        self.run.run_metadata = {**(self.run.run_metadata or {}), **(metadata or {})}
+        self._pending = 0
+        self.session.commit()
+
+    def close(self):
+        """Commit anything pending and close the session."""
+        self.flush()
+        self.session.close()
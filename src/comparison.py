@@ -0,0 +1,271 @@
+"""Multi-model comparison runs.
+
+Evaluates one dataset against several model endpoints concurrently. Each
+endpoint gets its own LLMClient with its own connection pool and rate
+limits, so a slow or throttled model does not hold back the others. Every
+model's results are streamed to their own JSONL file and recorded as a
+``model_registry`` row, an ``evaluation_runs`` row and ``test_results`` rows;
+one comparison report summarizes all models side by side.
+
+Usage:
+    python -m src.comparison --models models.json --dataset cases.jsonl --report comparison.json
+
+models.json holds a list of endpoints; the first one is the baseline the
+others are compared against:
+    [{"name": "baseline", "model_name": "llama-2-70b"},
+     {"name": "candidate", "model_name": "llama-3-70b", "api_base_url": "http://gpu1:8000/",
+      "api_key_env": "CANDIDATE_KEY", "requests_per_second": 5, "max_concurrency": 16}]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from .evaluation_engine import (
+    CaseResult, EvaluationCase, EvaluationEngine, load_cases_from_db, load_cases_from_jsonl, summarize_results
+)
+from .llm_client import LLMClient
+from .rate_limiter import RateLimiter
+from .result_stream import ResultStreamWriter
+from .scheduler import EvaluationScheduler
+
+@dataclass
+class ModelEndpoint:
+    """One model to evaluate and how to reach it."""
+
+    name: str
+    model_name: str
+    api_base_url: Optional[str] = None
+    api_key: Optional[str] = None
+    api_key_env: Optional[str] = None
+    model_version: str = "unknown"
+    provider_name: str = "openai-compatible"
+    provider_type: str = "off_prem_api"
+    requests_per_second: Optional[float] = None
+    max_concurrency: int = 16
+
+    def resolved_api_key(self) -> Optional[str]:
+        """The API key, read from api_key_env when given so keys stay out of config files."""
+        if self.api_key_env:
+            return os.environ[self.api_key_env]
+        return self.api_key
+
+    def create_client(self) -> LLMClient:
+        """Create an independent client with this endpoint's pool and rate limits."""
+        return LLMClient(
+            base_url=self.api_base_url,
+            api_key=self.resolved_api_key(),
+            model_name=self.model_name,
+            max_connections=self.max_concurrency,
+            rate_limiter=RateLimiter(self.requests_per_second, max_concurrency=self.max_concurrency)
+        )
+
+def load_endpoints(path: str) -> List[ModelEndpoint]:
+    """Load endpoint definitions from a JSON list (or {"models": [...]})."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data["models"]
+    endpoints = [ModelEndpoint(**entry) for entry in data]
+    names = [endpoint.name for endpoint in endpoints]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Endpoint names must be unique: {names}")
+    return endpoints
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name)
+
+def record_model_run(session, endpoint: ModelEndpoint, results: Sequence[CaseResult], summary: Dict[str, Any]):
+    """Write the registry row (reused if present), an evaluation run and its test results."""
+    from .database import EvaluationRun, ModelRegistry, TestResult
+
+    model = session.query(ModelRegistry).filter_by(
+        model_name=endpoint.model_name, model_version=endpoint.model_version
+    ).first()
+    if model is None:
+        model = ModelRegistry(
+            model_name=endpoint.model_name,
+            model_version=endpoint.model_version,
+            provider_type=endpoint.provider_type,
+            provider_name=endpoint.provider_name,
+            model_type="text-generation"
+        )
+        session.add(model)
+        session.flush()
+
+    run = EvaluationRun(
+        model_id=model.model_id,
+        run_status=summary["status"],
+        run_metadata={
+            "mode": "comparison",
+            "endpoint": endpoint.name,
+            "api_base_url": endpoint.api_base_url,
+            "metrics": summary["metrics"],
+            "total_cases": summary["total_cases"]
+        }
+    )
+    session.add(run)
+    session.flush()
+    session.add_all([
+        TestResult(
+            run_id=run.run_id,
+            test_name=result.case.test_name,
+            result_value=result.to_record(),
+            pass_fail=result.passed,
+            execution_time=result.latency_ms / 1000
+        )
+        for result in results
+    ])
+    session.commit()
+    return run
+
+def build_comparison_report(
+    endpoints: Sequence[ModelEndpoint],
+    results: Dict[str, List[CaseResult]],
+    summaries: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Side-by-side summary: per-model metrics and per-model wins/losses against the first model."""
+    baseline = endpoints[0].name
+    by_case = {
+        name: {result.case.case_id: result for result in model_results}
+        for name, model_results in results.items()
+    }
+
+    models = {}
+    for endpoint in endpoints:
+        summary = summaries[endpoint.name]
+        latencies = sorted(r.latency_ms for r in results[endpoint.name])
+        entry = {
+            "model_name": endpoint.model_name,
+            "model_version": endpoint.model_version,
+            "status": summary["status"],
+            "metrics": summary["metrics"],
+            "mean_score": summary["mean_score"],
+            "suites": summary["suites"],
+            "latency_ms": {
+                "median": latencies[len(latencies) // 2] if latencies else None,
+                "p95": latencies[max(0, math.ceil(len(latencies) * 0.95) - 1)] if latencies else None
+            }
+        }
+        if endpoint.name != baseline:
+            wins = losses = 0
+            for case_id, result in by_case[endpoint.name].items():
+                other = by_case[baseline].get(case_id)
+                if other is None:
+                    continue
+                wins += result.passed and not other.passed
+                losses += other.passed and not result.passed
+            entry["vs_baseline"] = {"wins": wins, "losses": losses}
+        models[endpoint.name] = entry
+
+    return {
+        "baseline": baseline,
+        "timestamp": datetime.utcnow().isoformat(),
+        "total_cases": len(next(iter(by_case.values()), {})),
+        "models": models
+    }
+
+class ComparisonRunner:
+    """Evaluate the same cases against several endpoints at once."""
+
+    def __init__(
+        self,
+        endpoints: Sequence[ModelEndpoint],
+        output_dir: str = "comparison_results",
+        session_factory=None,
+        time_budget: Optional[float] = None
+    ):
+        """Initialize the runner.
+
+        Args:
+            endpoints: Models to compare; the first one is the baseline
+            output_dir: Directory for the per-model result streams
+            session_factory: Callable returning a database session; results are
+                not recorded in the database if None
+            time_budget: Seconds for the whole comparison; cases that no longer
+                fit are skipped, lowest suite priority first
+        """
+        if not endpoints:
+            raise ValueError("At least one endpoint is required")
+        self.endpoints = list(endpoints)
+        self.output_dir = output_dir
+        self.session_factory = session_factory
+        self.time_budget = time_budget
+
+    async def _evaluate(
+        self,
+        endpoint: ModelEndpoint,
+        cases: Sequence[EvaluationCase],
+        scheduler: EvaluationScheduler
+    ) -> List[CaseResult]:
+        path = os.path.join(self.output_dir, f"{_slug(endpoint.name)}.jsonl")
+        with ResultStreamWriter(path) as stream:
+            async with endpoint.create_client() as client:
+                engine = EvaluationEngine(client, scheduler=scheduler, name=endpoint.name)
+                return await engine.run(cases, on_result=lambda r: stream.write(r.to_record()))
+
+    async def run(self, cases: Sequence[EvaluationCase]) -> Dict[str, Any]:
+        """Run every endpoint concurrently and return the comparison report."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        # One scheduler shares the run time fairly across (model, suite) groups;
+        # each endpoint's own limiter still caps its requests in flight
+        scheduler = EvaluationScheduler(
+            sum(endpoint.max_concurrency for endpoint in self.endpoints), time_budget=self.time_budget
+        )
+        all_results = await asyncio.gather(
+            *(self._evaluate(endpoint, cases, scheduler) for endpoint in self.endpoints)
+        )
+        results = {endpoint.name: r for endpoint, r in zip(self.endpoints, all_results)}
+        summaries = {name: summarize_results(r) for name, r in results.items()}
+
+        if self.session_factory is not None:
+            session = self.session_factory()
+            try:
+                for endpoint in self.endpoints:
+                    record_model_run(session, endpoint, results[endpoint.name], summaries[endpoint.name])
+            finally:
+                session.close()
+
+        return build_comparison_report(self.endpoints, results, summaries)
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate one dataset against several models concurrently")
+    parser.add_argument("--models", required=True, help="JSON file listing model endpoints")
+    parser.add_argument("--dataset", help="JSONL dataset to evaluate instead of the database")
+    parser.add_argument("--suite", action="append", help="Suite name to include (repeatable)")
+    parser.add_argument("--category", action="append", help="Suite category to include (repeatable)")
+    parser.add_argument("--limit", type=int, help="Maximum number of cases to load")
+    parser.add_argument("--output-dir", default="comparison_results", help="Directory for per-model result streams")
+    parser.add_argument("--report", default="comparison_report.json", help="Comparison report file")
+    parser.add_argument("--no-db", action="store_true", help="Do not record runs in the database")
+    parser.add_argument("--time-budget", type=float, help="Seconds for the whole comparison")
+    args = parser.parse_args()
+
+    from .database import get_session
+
+    endpoints = load_endpoints(args.models)
+    if args.dataset:
+        cases = load_cases_from_jsonl(args.dataset)
+    else:
+        session = get_session()
+        try:
+            cases = load_cases_from_db(session, args.suite, args.category, args.limit)
+        finally:
+            session.close()
+
+    runner = ComparisonRunner(
+        endpoints, args.output_dir, None if args.no_db else get_session, time_budget=args.time_budget
+    )
+    report = asyncio.run(runner.run(cases))
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
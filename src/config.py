@@ -1,36 +1,48 @@
-"""Configuration management for the LLM evaluation framework."""
-
-import os
-from typing import Optional
-from pydantic import SecretStr, AnyHttpUrl
-from pydantic_settings import BaseSettings
-
-class Settings(BaseSettings):
-    """Application settings loaded from environment variables."""
-    
-    # API Configuration
-    api_base_url: AnyHttpUrl
-    api_key: SecretStr
-    model_name: str  # Changed from llm_model_name to match env var
-    
-    # Database Configuration
-    database_url: str
-    
-    # Test Configuration
-    test_timeout: int = 30  # seconds
-    max_retries: int = 3
-    retry_delay: int = 1  # seconds
-
-    model_config = {
-        'env_file': '.env',
-        'env_file_encoding': 'utf-8',
-        'protected_namespaces': ('settings_',)
-    }
+"""Configuration management for the LLM evaluation framework.
+
+Settings are built from the environment (and ``.env``) on first use rather
+than at import time, so modules that only need the database, such as the
+database tooling and report generators, import quickly and work without API
+credentials. ``settings`` is a lazy proxy: ``settings.model_name`` builds
+the settings on first access and caches them.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+@lru_cache(maxsize=None)
+def get_settings():
+    """Return the cached application settings, building them on first call."""
+    from .settings_schema import Settings
+
+    return Settings()
+
+def reset_settings():
+    """Drop the cached settings so the next access re-reads the environment."""
+    get_settings.cache_clear()
+
+class _LazySettings:
+    """Forwards attribute access to get_settings()."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_settings())
 
 # Global settings instance
-settings = Settings(
-    api_base_url=os.environ["API_BASE_URL"],
-    api_key=os.environ["API_KEY"],
-    model_name=os.environ["MODEL_NAME"],  # Changed to match the class attribute
-    database_url=os.environ.get("DATABASE_URL", "sqlite:///database/llm_evaluation.db"),
-)
\ No newline at end of file
+settings = _LazySettings()
+
+def __getattr__(name: str) -> Any:
+    # Settings is re-exported lazily so importing this module stays cheap
+    if name == "Settings":
+        from .settings_schema import Settings
+
+        return Settings
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
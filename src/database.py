@@ -4,10 +4,11 @@ import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-from sqlalchemy import create_engine, Column, String, Integer, DateTime, JSON, ForeignKey, Enum, Interval, TypeDecorator
+from sqlalchemy import create_engine, event, Column, String, Integer, Float, Boolean, DateTime, JSON, ForeignKey, Enum, Interval, TypeDecorator
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 
 from .config import settings
+from .tracing import tracer
 
 # Custom UUID type for SQLite compatibility
 class UUID(TypeDecorator):
@@ -125,8 +126,64 @@ def init_db():
     Base.metadata.create_all(engine)
     return engine
 
+class EvaluationRun(Base):
+    """A single evaluation session against one model."""
+    
+    __tablename__ = "evaluation_runs"
+    
+    run_id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    model_id = Column(UUID(), ForeignKey('model_registry.model_id'))
+    run_timestamp = Column(DateTime, default=datetime.utcnow)
+    run_status = Column(String(50), nullable=False)
+    run_metadata = Column(JSON)
+    
+    results = relationship("TestResult", back_populates="run")
+
+    def __repr__(self):
+        return f"<EvaluationRun(run_id='{self.run_id}', status='{self.run_status}')>"
+
+class TestResult(Base):
+    """Outcome of one test within an evaluation run."""
+    
+    __tablename__ = "test_results"
+    __test__ = False  # not a pytest test class
+    
+    result_id = Column(UUID(), primary_key=True, default=uuid.uuid4)
+    run_id = Column(UUID(), ForeignKey('evaluation_runs.run_id'))
+    test_name = Column(String(255), nullable=False)
+    result_value = Column(JSON, nullable=False)
+    pass_fail = Column(Boolean)
+    execution_time = Column(Float)  # seconds
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    run = relationship("EvaluationRun", back_populates="results")
+
+    def __repr__(self):
+        return f"<TestResult(test='{self.test_name}', pass_fail={self.pass_fail})>"
+
+def _instrument_session(session):
+    """Wrap each commit of the session in a db.commit span."""
+    def before_commit(session):
+        session.info["commit_span"] = tracer.start_span(
+            "db.commit",
+            {"db.pending_objects": len(session.new) + len(session.dirty) + len(session.deleted)}
+        )
+
+    def end_commit(session, status="ok"):
+        span = session.info.pop("commit_span", None)
+        if span is not None:
+            span.status = status
+            tracer.end_span(span)
+
+    event.listen(session, "before_commit", before_commit)
+    event.listen(session, "after_commit", end_commit)
+    event.listen(session, "after_soft_rollback", lambda session, previous_transaction: end_commit(session, "error"))
+
 def get_session():
     """Get a database session."""
     engine = create_engine(settings.database_url)
     Session = sessionmaker(bind=engine)
-    return Session()
\ No newline at end of file
+    session = Session()
+    if tracer.enabled:
+        _instrument_session(session)
+    return session
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Request deadlines.
+
+A deadline is an absolute point in time by which a unit of work must finish.
+It is stored in a context variable, so everything awaited underneath - the
+retries of a request, the samples of a pass@k prompt, the embedding calls of
+a scorer - shares the remaining budget instead of each starting a fresh
+timeout. Nested deadlines can only shorten the budget, never extend it.
+
+Usage:
+    with deadline(case.timeout_seconds):
+        response = await client.generate(prompt)
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """Raised when a request is started or still running after its deadline."""
+
+class Deadline:
+    """An absolute monotonic deadline."""
+
+    def __init__(self, seconds: float):
+        """Initialize the deadline.
+
+        Args:
+            seconds: Budget from now, in seconds
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (negative once it has passed)."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raise DeadlineExceeded if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.2f}s exceeded")
+
+    def __repr__(self) -> str:
+        return f"Deadline(seconds={self.seconds}, remaining={self.remaining():.3f})"
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+
+def current_deadline() -> Optional[Deadline]:
+    """The innermost active deadline, or None."""
+    return _current.get()
+
+@contextlib.contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Run the block under a deadline of `seconds`, or the enclosing one if sooner.
+
+    With `seconds=None` the enclosing deadline (if any) is kept unchanged.
+    """
+    outer = _current.get()
+    if seconds is None:
+        yield outer
+        return
+    inner = Deadline(seconds)
+    if outer is not None and outer.expires_at <= inner.expires_at:
+        inner = outer
+    token = _current.set(inner)
+    try:
+        yield inner
+    finally:
+        _current.reset(token)
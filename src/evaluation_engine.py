@@ -0,0 +1,586 @@
+"""Data-driven evaluation engine.
+
+Executes evaluation cases loaded from ``unit_tests`` rows (or a JSONL
+dataset) concurrently through a single pooled LLMClient and scores each
+response with a pluggable scorer. This is the bulk counterpart of the pytest
+suites: one process can evaluate thousands of cases without one test
+function per case.
+
+Usage:
+    python -m src.evaluation_engine --category mathematics --concurrency 32
+    python -m src.evaluation_engine --dataset cases.jsonl --report report.json
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .deadline import deadline
+from .extraction import extract_number
+from .keyword_scorer import compile_keywords
+from .prompt_templates import PrefixCacheStats, order_by_prefix
+from .result_stream import ResultStreamWriter
+from .scheduler import EvaluationScheduler, WorkAborted
+from .sequential import METHODS as SEQUENTIAL_METHODS, SequentialTest
+from .test_aggregator import calculate_model_metrics, determine_run_status
+
+# A scorer takes the response text and the case's expected_output and
+# returns a score in [0, 1] (or an awaitable of one); a case passes when the
+# score reaches 1.
+Scorer = Callable[[str, Dict[str, Any]], float]
+
+SCORERS: Dict[str, Scorer] = {}
+
+def register_scorer(*test_types: str) -> Callable[[Scorer], Scorer]:
+    """Register a scorer for one or more test types."""
+    def decorator(func: Scorer) -> Scorer:
+        for test_type in test_types:
+            SCORERS[test_type] = func
+        return func
+    return decorator
+
+@dataclass
+class EvaluationCase:
+    """A single prompt with its expected output."""
+
+    case_id: str
+    test_name: str
+    test_type: str
+    input_data: Dict[str, Any]
+    expected_output: Dict[str, Any]
+    suite_name: Optional[str] = None
+    priority: int = 1
+    timeout_seconds: Optional[int] = None
+    max_tokens: Optional[int] = None
+    temperature: float = 0.0
+
+@dataclass
+class CaseResult:
+    """Outcome of evaluating one case."""
+
+    case: EvaluationCase
+    passed: bool
+    score: float
+    response_text: Optional[str] = None
+    error: Optional[str] = None
+    latency_ms: float = 0.0
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    skipped: bool = False
+
+    def to_record(self) -> Dict[str, Any]:
+        """Convert to the result record format used by test_metrics streams."""
+        return {
+            "test_name": self.case.test_name,
+            "case_id": self.case.case_id,
+            "suite_name": self.case.suite_name,
+            "outcome": "skipped" if self.skipped else "passed" if self.passed else "failed",
+            "score": self.score,
+            "error_message": self.error,
+            "duration": self.latency_ms / 1000,
+            "response": self.response_text,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+    @classmethod
+    def from_record(cls, case: EvaluationCase, record: Dict[str, Any]) -> "CaseResult":
+        """Rebuild a result from its to_record() form, e.g. one checkpointed by an earlier run."""
+        passed = record.get("outcome") == "passed"
+        return cls(
+            case=case,
+            passed=passed,
+            score=record.get("score", 1.0 if passed else 0.0),
+            response_text=record.get("response"),
+            error=record.get("error_message"),
+            latency_ms=(record.get("duration") or 0.0) * 1000,
+            skipped=record.get("outcome") == "skipped"
+        )
+
+def score_numeric(text: str, expected: Dict[str, Any], tolerance: float = 0.01) -> float:
+    """Pass if the first number in the response matches the expected result (or any of a list)."""
+    value = extract_number(text)
+    if value is None:
+        return 0.0
+    targets = expected["result"] if isinstance(expected["result"], list) else [expected["result"]]
+    return float(any(abs(value - float(target)) < tolerance for target in targets))
+
+def score_keywords(text: str, expected: Dict[str, Any]) -> float:
+    """Pass if any expected keyword appears in the response (substring match)."""
+    return compile_keywords(expected["keywords"], mode="any").score(text)
+
+def score_key_phrase(text: str, expected: Dict[str, Any]) -> float:
+    """Pass if the key phrase appears in the response."""
+    return compile_keywords([expected["key_phrase"]], mode="any").score(text)
+
+def score_answer(text: str, expected: Dict[str, Any]) -> float:
+    """Pass on an exact (case-insensitive) answer match."""
+    return float(text.strip().lower().rstrip(".") == str(expected["answer"]).lower())
+
+def score_key_points(text: str, expected: Dict[str, Any]) -> float:
+    """Fraction of key points present in the response."""
+    return compile_keywords(expected["key_points"], mode="fraction").score(text)
+
+# Scorers selected by the shape of expected_output when the test type has none registered
+_SCORERS_BY_KEY = [
+    ("result", score_numeric),
+    ("keywords", score_keywords),
+    ("key_phrase", score_key_phrase),
+    ("answer", score_answer),
+    ("key_points", score_key_points),
+]
+
+def get_scorer(case: EvaluationCase) -> Scorer:
+    """Return the scorer for a case: by test type, else by expected_output shape."""
+    if case.test_type in SCORERS:
+        return SCORERS[case.test_type]
+    for key, scorer in _SCORERS_BY_KEY:
+        if key in case.expected_output:
+            return scorer
+    raise ValueError(f"No scorer for test type '{case.test_type}' with expected output {list(case.expected_output)}")
+
+def build_prompt(input_data: Dict[str, Any]) -> str:
+    """Build a prompt from stored input_data in the formats the pytest suites use."""
+    if "prompt" in input_data:
+        return input_data["prompt"]
+    if "premises" in input_data:
+        return (
+            f"Given these premises:\n{input_data['premises']}\n\n"
+            f"Question: {input_data['question']}\nProvide a direct answer without explanation."
+        )
+    if "scenario" in input_data:
+        return f"{input_data['scenario']}\n\n{input_data['question']}\nAnswer briefly in one line."
+    if "article" in input_data:
+        return f"Please summarize this article concisely: {input_data['article']}"
+    return "\n\n".join(str(value) for value in input_data.values())
+
+def _loads(value: Any) -> Dict[str, Any]:
+    """JSON columns may come back as text when rows were inserted with raw SQL."""
+    if isinstance(value, str):
+        return json.loads(value)
+    return value or {}
+
+def load_cases_from_db(
+    session,
+    suite_names: Optional[List[str]] = None,
+    categories: Optional[List[str]] = None,
+    limit: Optional[int] = None
+) -> List[EvaluationCase]:
+    """Load evaluation cases from unit_tests rows joined with their suites."""
+    from .database import UnitTest, UnitTestSuite
+
+    query = session.query(UnitTest, UnitTestSuite).join(UnitTestSuite, UnitTest.suite_id == UnitTestSuite.suite_id)
+    if suite_names:
+        query = query.filter(UnitTestSuite.suite_name.in_(suite_names))
+    if categories:
+        query = query.filter(UnitTestSuite.category.in_(categories))
+    if limit:
+        query = query.limit(limit)
+
+    return [
+        EvaluationCase(
+            case_id=str(test.test_id),
+            test_name=f"{suite.suite_name}::{test.test_name}",
+            test_type=test.test_type,
+            input_data=_loads(test.input_data),
+            expected_output=_loads(test.expected_output),
+            suite_name=suite.suite_name,
+            priority=suite.priority,
+            timeout_seconds=test.timeout_seconds
+        )
+        for test, suite in query
+    ]
+
+def load_cases_from_jsonl(path: str) -> List[EvaluationCase]:
+    """Load evaluation cases from a JSONL dataset.
+
+    Each line holds ``input_data``/``expected_output`` objects as stored in
+    ``unit_tests`` (or the ``prompt``/``expected`` shorthand), plus optional
+    ``id``, ``test_name``, ``test_type``, ``suite`` and ``priority`` fields.
+    """
+    cases = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            input_data = row.get("input_data") or {"prompt": row["prompt"]}
+            expected_output = row.get("expected_output") or {"result": row["expected"]}
+            case_id = str(row.get("id", line_number))
+            cases.append(EvaluationCase(
+                case_id=case_id,
+                test_name=row.get("test_name", f"{os.path.basename(path)}::{case_id}"),
+                test_type=row.get("test_type", "dataset"),
+                input_data=input_data,
+                expected_output=expected_output,
+                suite_name=row.get("suite"),
+                priority=row.get("priority", 1),
+                timeout_seconds=row.get("timeout_seconds"),
+                max_tokens=row.get("max_tokens"),
+                temperature=row.get("temperature", 0.0)
+            ))
+    return cases
+
+class EvaluationEngine:
+    """Evaluate many cases concurrently through one LLM client."""
+
+    def __init__(
+        self,
+        client,
+        concurrency: int = 16,
+        scorers: Optional[Dict[str, Scorer]] = None,
+        prefix_order: bool = True,
+        scheduler: Optional[EvaluationScheduler] = None,
+        name: Optional[str] = None
+    ):
+        """Initialize the engine.
+
+        Args:
+            client: An LLMClient (or compatible) instance
+            concurrency: Maximum number of in-flight requests (ignored with a shared scheduler)
+            scorers: Extra scorers by test type, overriding the registered ones
+            prefix_order: Send cases sharing a prompt prefix back to back, for server prefix caches
+            scheduler: Scheduler shared with other engines; each run gets its own if None
+            name: Label that keeps this engine's suites apart from other engines' in a shared scheduler
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.scorers = dict(scorers or {})
+        self.prefix_order = prefix_order
+        self.scheduler = scheduler
+        self.name = name
+        self.prefix_cache = PrefixCacheStats()
+        self._semantic: Optional[Scorer] = None
+
+    def _scorer(self, case: EvaluationCase) -> Scorer:
+        if case.test_type in self.scorers:
+            return self.scorers[case.test_type]
+        if case.test_type not in SCORERS and ("references" in case.expected_output or "reference" in case.expected_output):
+            return self._semantic_scorer()
+        return get_scorer(case)
+
+    def _semantic_scorer(self) -> Scorer:
+        """Embedding similarity scorer sharing the engine's client, created on first use."""
+        if self._semantic is None:
+            from .config import settings
+            from .semantic_scorer import SemanticScorer, VectorCache
+
+            self._semantic = SemanticScorer(self.client, VectorCache(settings.embedding_cache_dir)).as_scorer()
+        return self._semantic
+
+    async def evaluate_case(self, case: EvaluationCase) -> CaseResult:
+        """Generate and score a single case; errors are captured as failures."""
+        start = time.perf_counter()
+        try:
+            # The case's timeout covers generation (with its retries) and scoring
+            with deadline(case.timeout_seconds):
+                prompt = build_prompt(case.input_data)
+                self.prefix_cache.observe(prompt)
+                response = await self.client.generate(
+                    prompt=prompt,
+                    max_tokens=case.max_tokens,
+                    temperature=case.temperature
+                )
+                self.prefix_cache.record_usage(response.get("usage"))
+                text = response["choices"][0]["text"].strip()
+                score = self._scorer(case)(text, case.expected_output)
+                if inspect.isawaitable(score):
+                    score = await score
+            metrics = await self.client.analyze_response(response)
+            return CaseResult(
+                case=case,
+                passed=score >= 1.0,
+                score=score,
+                response_text=text,
+                latency_ms=(time.perf_counter() - start) * 1000,
+                metrics=metrics
+            )
+        except Exception as e:
+            return CaseResult(
+                case=case,
+                passed=False,
+                score=0.0,
+                error=f"{type(e).__name__}: {e}",
+                latency_ms=(time.perf_counter() - start) * 1000
+            )
+
+    async def run(
+        self,
+        cases: Iterable[EvaluationCase],
+        on_result: Optional[Callable[[CaseResult], None]] = None
+    ) -> List[CaseResult]:
+        """Evaluate all cases through the scheduler, in completion order.
+
+        Cases start by suite priority (lowest value first) with fair share
+        across suites; within a suite they keep the given (or prefix) order.
+        Cases the scheduler aborts for lack of time budget are reported as
+        skipped.
+        """
+        return await self._run_batch(cases, self.scheduler or EvaluationScheduler(self.concurrency), on_result)
+
+    async def _run_batch(
+        self,
+        cases: Iterable[EvaluationCase],
+        scheduler: EvaluationScheduler,
+        on_result: Optional[Callable[[CaseResult], None]]
+    ) -> List[CaseResult]:
+        if self.prefix_order:
+            cases = order_by_prefix(cases, key=lambda case: build_prompt(case.input_data))
+
+        async def collect(case: EvaluationCase, future: "asyncio.Future[CaseResult]") -> CaseResult:
+            try:
+                return await future
+            except WorkAborted as e:
+                return CaseResult(case=case, passed=False, score=0.0, error=f"WorkAborted: {e}", skipped=True)
+
+        tasks = [
+            asyncio.ensure_future(collect(case, scheduler.submit(
+                lambda case=case: self.evaluate_case(case),
+                priority=case.priority,
+                group=(self.name, case.suite_name)
+            )))
+            for case in cases
+        ]
+        results = []
+        for next_result in asyncio.as_completed(tasks):
+            result = await next_result
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return results
+
+    async def run_sequential(
+        self,
+        cases: Iterable[EvaluationCase],
+        make_test: Callable[[int], SequentialTest],
+        seed: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        on_result: Optional[Callable[[CaseResult], None]] = None
+    ) -> Tuple[List[CaseResult], Dict[str, SequentialTest]]:
+        """Evaluate each suite's cases in random order until its pass rate is decided.
+
+        Suites are sampled without replacement, `batch_size` cases at a time
+        (the concurrency by default), and stop as soon as their sequential
+        test decides; cases never sampled produce no result.
+
+        Args:
+            cases: Cases to sample from
+            make_test: Creates a suite's SequentialTest given the suite's number of cases
+            seed: Seed for the sampling order
+            batch_size: Cases evaluated between decisions
+            on_result: Called with every result as it completes
+
+        Returns:
+            The results of the evaluated cases and the sequential test per suite
+        """
+        suites: Dict[str, List[EvaluationCase]] = {}
+        for case in cases:
+            suites.setdefault(case.suite_name or "default", []).append(case)
+        rng = random.Random(seed)
+        for suite_cases in suites.values():
+            rng.shuffle(suite_cases)
+        scheduler = self.scheduler or EvaluationScheduler(self.concurrency)
+        batch_size = batch_size or self.concurrency
+        tests = {name: make_test(len(suite_cases)) for name, suite_cases in suites.items()}
+        results: List[CaseResult] = []
+
+        async def run_suite(name: str, suite_cases: List[EvaluationCase]):
+            test = tests[name]
+            for start in range(0, len(suite_cases), batch_size):
+                batch = suite_cases[start:start + batch_size]
+                position = {id(case): i for i, case in enumerate(batch)}
+                batch_results = await self._run_batch(batch, scheduler, on_result)
+                results.extend(batch_results)
+                # Feed outcomes in sampling order, so decisions do not depend on completion order
+                for result in sorted(batch_results, key=lambda r: position[id(r.case)]):
+                    if not result.skipped:
+                        test.add(result.passed)
+                if test.decision is not None or all(result.skipped for result in batch_results):
+                    return
+
+        await asyncio.gather(*(run_suite(name, suite_cases) for name, suite_cases in suites.items()))
+        return results, tests
+
+def summarize_results(results: List[CaseResult]) -> Dict[str, Any]:
+    """Summarize case results overall and per suite."""
+    records = [result.to_record() for result in results]
+    metrics = calculate_model_metrics(records)
+    suites: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        suite = suites.setdefault(result.case.suite_name or "default", {"total": 0, "passed": 0, "skipped": 0})
+        suite["total"] += 1
+        suite["passed"] += result.passed
+        suite["skipped"] += result.skipped
+    for suite in suites.values():
+        suite["pass_rate"] = suite["passed"] / suite["total"]
+
+    return {
+        "metrics": metrics,
+        "status": determine_run_status(metrics),
+        "total_cases": len(results),
+        "mean_score": sum(r.score for r in results) / len(results) if results else 0.0,
+        "suites": suites
+    }
+
+async def _run_cli(args) -> Dict[str, Any]:
+    from .checkpoint import RunCheckpoint
+    from .config import settings
+    from .database import get_session
+    from .llm_client import LLMClient
+
+    if args.dataset:
+        cases = load_cases_from_jsonl(args.dataset)
+    else:
+        session = get_session()
+        try:
+            cases = load_cases_from_db(session, args.suite, args.category, args.limit)
+        finally:
+            session.close()
+
+    checkpoint = None
+    previous: List[CaseResult] = []
+    if args.resume:
+        checkpoint = RunCheckpoint.resume(get_session(), args.resume)
+        done = checkpoint.completed(retry_failed=args.retry_failed)
+        previous = [CaseResult.from_record(case, done[case.test_name]) for case in cases if case.test_name in done]
+        cases = [case for case in cases if case.test_name not in done]
+    elif args.checkpoint:
+        checkpoint = RunCheckpoint.start(get_session(), {
+            "mode": "evaluation_engine",
+            "model_name": settings.model_name,
+            "dataset": args.dataset,
+            "suites": args.suite,
+            "categories": args.category,
+            "total_cases": len(cases)
+        })
+    if checkpoint is not None:
+        print(f"Run ID: {checkpoint.run_id} ({len(previous)} cases already done)", file=sys.stderr)
+
+    with ResultStreamWriter(args.output) as stream:
+        for result in previous:
+            stream.write(result.to_record())
+
+        def on_result(result: CaseResult):
+            record = result.to_record()
+            stream.write(record)
+            if checkpoint is not None:
+                checkpoint.record(record)
+
+        async with LLMClient() as client:
+            scheduler = EvaluationScheduler(
+                args.concurrency, time_budget=args.time_budget, abort_margin=args.abort_margin
+            )
+            engine = EvaluationEngine(client, prefix_order=args.prefix_order, scheduler=scheduler)
+            if args.sequential:
+                results, tests = await engine.run_sequential(
+                    cases,
+                    lambda population: SequentialTest(
+                        args.threshold, args.sequential, args.confidence, population=population
+                    ),
+                    seed=args.seed,
+                    on_result=on_result
+                )
+                summary = summarize_results(results)
+                summary["sequential"] = {name: test.summary() for name, test in tests.items()}
+            else:
+                # A resumed run reports on the checkpointed and the new results together
+                results = previous + await engine.run(cases, on_result=on_result)
+                summary = summarize_results(results)
+            summary["prefix_cache"] = engine.prefix_cache.summary()
+            summary["scheduler"] = scheduler.stats()
+            if args.judge:
+                summary["quality"] = await _judge_results(client, results, args)
+
+    if checkpoint is not None:
+        summary["run_id"] = checkpoint.run_id
+        summary["resumed_cases"] = len(previous)
+        checkpoint.finish(summary["status"], {"metrics": summary["metrics"], "total_cases": summary["total_cases"]})
+        checkpoint.close()
+    return summary
+
+async def _judge_results(client, results: List[CaseResult], args) -> Optional[Dict[str, float]]:
+    """Grade every answered case with the LLM judge and average the quality scores."""
+    from .judge import JudgeItem, JudgePipeline, VerdictCache
+    from .metrics import MetricsCollector
+
+    items = [
+        JudgeItem(
+            item_id=result.case.case_id,
+            prompt=build_prompt(result.case.input_data),
+            response=result.response_text,
+            reference=result.case.expected_output.get("reference")
+        )
+        for result in results
+        if result.response_text
+    ]
+    cache = VerdictCache(args.judge_cache)
+    try:
+        pipeline = JudgePipeline(
+            client,
+            judge_model=args.judge_model,
+            batch_size=args.judge_batch_size,
+            concurrency=args.concurrency,
+            cache=cache
+        )
+        collector = MetricsCollector()
+        await pipeline.judge_into(collector, items)
+    finally:
+        cache.close()
+    return collector.get_summary_statistics().get("quality")
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate unit_tests rows or a JSONL dataset in bulk")
+    parser.add_argument("--dataset", help="JSONL dataset to evaluate instead of the database")
+    parser.add_argument("--suite", action="append", help="Suite name to include (repeatable)")
+    parser.add_argument("--category", action="append", help="Suite category to include (repeatable)")
+    parser.add_argument("--limit", type=int, help="Maximum number of cases to load")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum in-flight requests")
+    parser.add_argument(
+        "--time-budget", type=float,
+        help="Seconds for the whole run; cases that no longer fit are skipped, lowest priority first"
+    )
+    parser.add_argument(
+        "--abort-margin", type=float, default=0.0,
+        help="With less than this many seconds of the budget left, only top-priority suites start"
+    )
+    parser.add_argument(
+        "--sequential", choices=SEQUENTIAL_METHODS,
+        help="Sample each suite in random order and stop once its pass rate is decided"
+    )
+    parser.add_argument("--threshold", type=float, default=0.8, help="Suite pass rate for --sequential")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Required confidence for --sequential")
+    parser.add_argument("--seed", type=int, help="Seed for the --sequential sampling order")
+    parser.add_argument(
+        "--checkpoint", action="store_true",
+        help="Record every result in evaluation_runs/test_results as it completes, so the run can be resumed"
+    )
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume a checkpointed run, evaluating only unfinished cases")
+    parser.add_argument("--retry-failed", action="store_true", help="With --resume, evaluate failed cases again too")
+    parser.add_argument(
+        "--no-prefix-order", dest="prefix_order", action="store_false",
+        help="Send cases in dataset order instead of grouped by shared prompt prefix"
+    )
+    parser.add_argument("--output", default="evaluation_results.jsonl", help="Result stream (.gz for gzip)")
+    parser.add_argument("--report", help="Write the summary report to this JSON file")
+    parser.add_argument("--judge", action="store_true", help="Grade responses with an LLM judge (QualityMetrics)")
+    parser.add_argument("--judge-model", help="Judge model (defaults to MODEL_NAME)")
+    parser.add_argument("--judge-batch-size", type=int, default=5, help="Responses graded per judge call")
+    parser.add_argument("--judge-cache", default="judge_verdicts.jsonl", help="Verdict cache file")
+    args = parser.parse_args()
+    if args.resume and args.sequential:
+        parser.error("--resume cannot be combined with --sequential")
+
+    summary = asyncio.run(_run_cli(args))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(summary, f, indent=2)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Extraction of structured answers from model responses.
+
+Shared parsers for the three answer shapes the suites score: fenced code,
+JSON objects and numeric answers. All patterns are compiled once at import
+and each extractor tries a cheap fast path (plain substring checks, parsing
+the whole response) before scanning, since most well-behaved responses hit
+it. ``orjson`` is used for JSON parsing when installed.
+"""
+
+import json
+import re
+from typing import Any, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+_JSON_ERRORS: tuple = (ValueError,)
+if orjson is not None:
+    _JSON_ERRORS = (ValueError, orjson.JSONDecodeError)
+
+_CODE_FENCE = re.compile(r"```(?:python|py)?\s*(.*?)\s*```", re.DOTALL)
+_CODE_START = re.compile(r"^[ \t]*(?:def|class) ", re.MULTILINE)
+
+# Optional sign and currency symbol, digits with optional thousands separators,
+# decimals and exponent: "-$1,234.50", "43.20", ".5", "1.5e-3"
+_NUMBER = re.compile(
+    r"(?<![\w.])([-+−]?)[$€£¥]?\s?"
+    r"((?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|\.\d+)"
+    r"(?:[eE]([-+]?\d+))?"
+)
+
+def loads(text: str) -> Any:
+    """Parse JSON text, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def extract_code_block(text: str) -> str:
+    """Extract code from markdown-style code blocks or plain text.
+
+    Returns the first fenced block, else everything from the first line that
+    starts a function or class, else the stripped text.
+    """
+    if "```" in text:
+        match = _CODE_FENCE.search(text)
+        if match:
+            return match.group(1).strip()
+
+    match = _CODE_START.search(text)
+    if match:
+        return text[match.start():]
+    return text.strip()
+
+def _balanced_end(text: str, start: int) -> int:
+    """Index just past the bracket matching text[start], or -1 if unbalanced."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+def extract_json(text: str, arrays: bool = False) -> Optional[Any]:
+    """Return the first balanced JSON object in text, or None.
+
+    Handles responses that wrap the JSON in prose or code fences. With arrays
+    set, a top-level JSON array is accepted as well.
+    """
+    openers = "{[" if arrays else "{"
+    stripped = text.strip()
+    if stripped[:1] in openers:
+        try:
+            return loads(stripped)
+        except _JSON_ERRORS:
+            pass
+
+    position = 0
+    while True:
+        starts = [i for i in (text.find(opener, position) for opener in openers) if i != -1]
+        if not starts:
+            return None
+        start = min(starts)
+        end = _balanced_end(text, start)
+        if end != -1:
+            try:
+                return loads(text[start:end])
+            except _JSON_ERRORS:
+                pass
+        position = start + 1
+
+def _to_float(match) -> float:
+    sign, digits, exponent = match.groups()
+    value = float(digits.replace(",", "") + (f"e{exponent}" if exponent else ""))
+    return -value if sign in ("-", "−") else value
+
+def extract_number(text: str) -> Optional[float]:
+    """Return the first number in text, ignoring currency symbols, separators and units."""
+    match = _NUMBER.search(text)
+    return _to_float(match) if match else None
+
+def extract_numbers(text: str) -> List[float]:
+    """Return every number in text, in order."""
+    return [_to_float(match) for match in _NUMBER.finditer(text)]
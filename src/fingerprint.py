@@ -0,0 +1,92 @@
+"""Fingerprints for skipping evaluations whose inputs have not changed.
+
+A fingerprint combines everything that can change a test's outcome: the
+prompt data, the source of the scoring code and the identity of the model
+endpoint, including the settings that change its requests or scores. When a previous result with the same fingerprint exists in the
+``test_results`` table it can be reused instead of calling the model again.
+"""
+
+import hashlib
+import inspect
+import json
+import sys
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional
+
+from .database import TestResult
+
+def _hash(parts: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def model_identity(
+    model_name: str,
+    api_base_url: str,
+    model_version: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None
+) -> Dict[str, str]:
+    """Identify the model endpoint a result was produced by.
+
+    `options` are further settings that change the requests sent or how the
+    responses are scored (system prompt, sampling, embedding model, ...).
+    """
+    identity = {
+        "model_name": model_name,
+        "api_base_url": str(api_base_url),
+        "model_version": model_version or ""
+    }
+    for key, value in (options or {}).items():
+        identity[key] = "" if value is None else str(value)
+    return identity
+
+def compute_fingerprint(prompt_data: Any, scorer_sources: List[str], identity: Dict[str, str]) -> str:
+    """Hash prompt data, scorer source code and model identity into one fingerprint."""
+    return _hash([
+        json.dumps(prompt_data, sort_keys=True, default=str),
+        *scorer_sources,
+        json.dumps(identity, sort_keys=True)
+    ])
+
+def module_sources(*modules: ModuleType, package: str = "src") -> List[str]:
+    """Source of the given modules plus the framework modules they use for scoring.
+
+    Any module or callable from ``package`` referenced in a module's globals
+    is included, and so are the ones those modules reference in turn, so
+    edits to shared helpers anywhere down the import chain also change the
+    fingerprint.
+    """
+    sources: Dict[str, str] = {}
+    queue = list(modules)
+    while queue:
+        module = queue.pop()
+        if module.__name__ in sources:
+            continue
+        sources[module.__name__] = inspect.getsource(module)
+        for obj in list(vars(module).values()):
+            name = obj.__name__ if inspect.ismodule(obj) else getattr(obj, "__module__", None)
+            if not isinstance(name, str) or name in sources:
+                continue
+            if name == package or name.startswith(package + "."):
+                dependency = sys.modules.get(name)
+                if dependency is not None:
+                    queue.append(dependency)
+    return [sources[name] for name in sorted(sources)]
+
+def find_reusable_result(session, test_name: str, fingerprint: str, lookback: int = 20) -> Optional[TestResult]:
+    """Return the most recent result for test_name recorded with the same fingerprint."""
+    recent = (
+        session.query(TestResult)
+        .filter(TestResult.test_name == test_name)
+        .order_by(TestResult.created_at.desc())
+        .limit(lookback)
+    )
+    for result in recent:
+        value = result.result_value
+        if isinstance(value, str):
+            value = json.loads(value)
+        if isinstance(value, dict) and value.get("fingerprint") == fingerprint:
+            return result
+    return None
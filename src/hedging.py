@@ -0,0 +1,75 @@
+"""Hedged requests for tail latency.
+
+A hedged request sends a duplicate when the first attempt has not answered
+within the client's recent p95 latency and takes whichever response arrives
+first, cancelling the other. Only the few slow requests are duplicated
+(about 5% extra load at p95), but a stuck request no longer dominates the
+run time.
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+class LatencyWindow:
+    """Latencies of the most recent successful requests."""
+
+    def __init__(self, size: int = 200):
+        """Initialize the window.
+
+        Args:
+            size: Number of recent samples kept
+        """
+        self._samples = deque(maxlen=size)
+
+    def record(self, latency_ms: float):
+        self._samples.append(latency_ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None if it is empty."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+async def hedged(call: Callable[[int], Awaitable[Any]], delay: float, on_hedge: Optional[Callable[[], None]] = None) -> Any:
+    """Run call(0); if it has not finished after `delay` seconds, also run call(1).
+
+    Returns the first successful result. If the first attempt fails before
+    the hedge is sent its error is raised as is; once both are running, an
+    error is only raised if both fail.
+
+    Args:
+        call: Starts attempt number 0 (primary) or 1 (hedge)
+        delay: Seconds to wait for the primary before hedging
+        on_hedge: Called when the hedge is sent
+    """
+    tasks = {asyncio.ensure_future(call(0))}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return done.pop().result()
+
+        if on_hedge is not None:
+            on_hedge()
+        tasks.add(asyncio.ensure_future(call(1)))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        # Also reached when the caller is cancelled: no attempt outlives the call
+        unfinished = [task for task in tasks if not task.done()]
+        for task in unfinished:
+            task.cancel()
+        if unfinished:
+            await asyncio.gather(*unfinished, return_exceptions=True)
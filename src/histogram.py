@@ -0,0 +1,188 @@
+"""HDR-style latency histograms.
+
+Values are counted in log-linear buckets that keep a fixed number of
+significant digits, so a histogram holding millions of samples stays a few
+kilobytes while every percentile is accurate to that relative precision
+(0.1% at the default three digits). Histograms from several runs or workers
+merge exactly, and serialize to a short base64 string for reports.
+
+Closed-loop drivers that pause while a request is stuck under-report the
+tail ("coordinated omission"): the requests that should have been sent
+during the stall are never measured. ``record_corrected`` back-fills them
+when the driver intends to send at a fixed interval, as HdrHistogram's
+recordValueWithExpectedInterval does.
+"""
+
+import base64
+import math
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies in milliseconds, stored in microseconds."""
+
+    PERCENTILES = (50, 90, 95, 99, 99.9)
+
+    def __init__(self, significant_digits: int = 3):
+        """Initialize the histogram.
+
+        Args:
+            significant_digits: Decimal digits of precision kept for every value (1-5)
+        """
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.significant_digits = significant_digits
+        sub_bucket_count = 2 ** math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._half_count = sub_bucket_count // 2
+        self._half_magnitude = int(math.log2(self._half_count))
+        self._counts: Dict[int, int] = {}
+        self.total_count = 0
+        self._total_us = 0
+        self._min_us: Optional[int] = None
+        self._max_us = 0
+
+    # Bucket arithmetic, as in HdrHistogram with a unit magnitude of 1 us
+
+    def _index(self, value_us: int) -> int:
+        bucket = max(0, value_us.bit_length() - (self._half_magnitude + 1))
+        sub_bucket = value_us >> bucket
+        return ((bucket + 1) << self._half_magnitude) + sub_bucket - self._half_count
+
+    def _value_range(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest values (us) counted in a bucket index."""
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        low = sub_bucket << bucket
+        return low, low + (1 << bucket) - 1
+
+    def record(self, value_ms: float, count: int = 1):
+        """Count a latency (milliseconds) `count` times."""
+        value_us = max(0, int(round(value_ms * 1000)))
+        index = self._index(value_us)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += count
+        self._total_us += value_us * count
+        self._min_us = value_us if self._min_us is None else min(self._min_us, value_us)
+        self._max_us = max(self._max_us, value_us)
+
+    def record_corrected(self, value_ms: float, expected_interval_ms: float):
+        """Record a latency from a driver meant to send every `expected_interval_ms`.
+
+        While the request was outstanding, the requests that would have been
+        sent at the expected interval were not; each is recorded with the
+        latency it would have seen (value - interval, value - 2 * interval, ...).
+        """
+        self.record(value_ms)
+        if expected_interval_ms <= 0:
+            return
+        missing = value_ms - expected_interval_ms
+        while missing >= expected_interval_ms:
+            self.record(missing)
+            missing -= expected_interval_ms
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's counts to this one (in place) and return self."""
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self._total_us += other._total_us
+        if other._min_us is not None:
+            self._min_us = other._min_us if self._min_us is None else min(self._min_us, other._min_us)
+        self._max_us = max(self._max_us, other._max_us)
+        return self
+
+    def __add__(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        return LatencyHistogram(self.significant_digits).merge(self).merge(other)
+
+    def __len__(self) -> int:
+        return self.total_count
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency (ms) at or below which `pct` percent of samples fall, or None if empty."""
+        if not self.total_count:
+            return None
+        rank = max(1, math.ceil(self.total_count * pct / 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                # The bucket's highest value, capped by the largest value recorded
+                return min(self._value_range(index)[1], self._max_us) / 1000
+        return self._max_us / 1000
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self._total_us / self.total_count / 1000 if self.total_count else None
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min_us / 1000 if self._min_us is not None else None
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max_us / 1000 if self.total_count else None
+
+    def buckets(self) -> Iterator[Tuple[float, float, int]]:
+        """(low ms, high ms, count) for every non-empty bucket, in order."""
+        for index in sorted(self._counts):
+            low, high = self._value_range(index)
+            yield low / 1000, high / 1000, self._counts[index]
+
+    def summary(self, percentiles: Iterable[float] = PERCENTILES) -> Dict[str, Optional[float]]:
+        """Count, mean, min, max and percentiles, in the style of the other summaries."""
+        summary: Dict[str, Optional[float]] = {
+            "count": self.total_count, "mean": self.mean, "min": self.min, "max": self.max
+        }
+        for pct in percentiles:
+            summary[f"p{pct:g}".replace(".", "")] = self.percentile(pct)
+        return summary
+
+    def encode(self) -> str:
+        """Compact serialization: zlib-compressed varints, base64 encoded."""
+        values: List[int] = [self.significant_digits, self._min_us or 0, self._max_us, self._total_us]
+        previous = 0
+        for index in sorted(self._counts):
+            values.extend((index - previous, self._counts[index]))
+            previous = index
+        return base64.b64encode(zlib.compress(_encode_varints(values))).decode("ascii")
+
+    @classmethod
+    def decode(cls, data: str) -> "LatencyHistogram":
+        """Rebuild a histogram from encode() output."""
+        values = _decode_varints(zlib.decompress(base64.b64decode(data)))
+        histogram = cls(values[0])
+        index = 0
+        for delta, count in zip(values[4::2], values[5::2]):
+            index += delta
+            histogram._counts[index] = count
+            histogram.total_count += count
+        if histogram.total_count:
+            histogram._min_us = values[1]
+        histogram._max_us = values[2]
+        histogram._total_us = values[3]
+        return histogram
+
+def _encode_varints(values: Iterable[int]) -> bytes:
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+def _decode_varints(data: bytes) -> List[int]:
+    values, value, shift = [], 0, 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value, shift = 0, 0
+    return values
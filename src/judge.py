@@ -0,0 +1,260 @@
+"""LLM-as-judge scoring for QualityMetrics.
+
+Candidate responses are graded by a judge model on the four QualityMetrics
+criteria. To keep the judge's cost well below the cost of the run being
+judged:
+
+- several responses are graded in one judge call, which returns a JSON array
+  of verdicts (items the judge skips or mangles are retried one at a time)
+- judge calls run concurrently through a single LLMClient
+- verdicts are cached in an append-only JSONL file keyed by judge model,
+  rubric and the judged item, so re-judging an unchanged response is free
+
+Usage:
+    pipeline = JudgePipeline(client, cache=VerdictCache("judge_verdicts.jsonl"))
+    verdicts = await pipeline.judge_into(collector, items)
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+from tenacity import RetryError
+
+from .deadline import DeadlineExceeded
+from .extraction import extract_json
+from .metrics import MetricsCollector, QualityMetrics
+from .result_stream import ResultStreamWriter, iter_results
+
+CRITERIA = ("relevance", "coherence", "factual_accuracy", "grammar")
+
+DEFAULT_RUBRIC = """Grade each response on a 1-5 scale for each criterion:
+- relevance: does it answer the prompt that was asked?
+- coherence: is it logically organized and internally consistent?
+- factual_accuracy: are its claims correct (and consistent with the reference, if given)?
+- grammar: is it fluent and free of grammatical errors?
+1 means very poor and 5 means excellent."""
+
+@dataclass
+class JudgeItem:
+    """A response to be graded, with the prompt that produced it."""
+
+    item_id: str
+    prompt: str
+    response: str
+    reference: Optional[str] = None
+
+@dataclass
+class JudgeVerdict:
+    """Judge scores for one item, normalized to 0-1."""
+
+    relevance: float
+    coherence: float
+    factual_accuracy: float
+    grammar: float
+    cached: bool = False
+
+    def to_quality_metrics(self) -> QualityMetrics:
+        """Convert to the QualityMetrics container used by MetricsCollector."""
+        return QualityMetrics(
+            relevance_score=self.relevance,
+            coherence_score=self.coherence,
+            factual_accuracy=self.factual_accuracy,
+            grammar_score=self.grammar
+        )
+
+def _digest(*parts: Optional[str]) -> str:
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update((part or "").encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+def verdict_key(judge_model: str, rubric: str, item: JudgeItem) -> str:
+    """Cache key for a verdict: judge model, rubric and the judged prompt/response/reference."""
+    return _digest(judge_model, _digest(rubric), _digest(item.prompt, item.response, item.reference))
+
+class VerdictCache:
+    """Verdicts persisted to an append-only JSONL file."""
+
+    def __init__(self, path: str = "judge_verdicts.jsonl"):
+        """Load existing verdicts from path and open it for appending."""
+        self.path = path
+        self._verdicts: Dict[str, Dict[str, float]] = {}
+        if os.path.exists(path):
+            for record in iter_results(path):
+                self._verdicts[record["key"]] = record["scores"]
+        self._writer = ResultStreamWriter(path, append=True)
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+    def get(self, key: str) -> Optional[JudgeVerdict]:
+        """Return the cached verdict for key, if any."""
+        scores = self._verdicts.get(key)
+        return JudgeVerdict(**scores, cached=True) if scores else None
+
+    def put(self, key: str, verdict: JudgeVerdict):
+        """Store a verdict."""
+        scores = {name: getattr(verdict, name) for name in CRITERIA}
+        self._verdicts[key] = scores
+        self._writer.write({"key": key, "scores": scores})
+
+    def close(self):
+        """Close the underlying file."""
+        self._writer.close()
+
+def build_judge_prompt(items: Sequence[JudgeItem], rubric: str = DEFAULT_RUBRIC) -> str:
+    """Build one judge prompt grading all items."""
+    sections = []
+    for number, item in enumerate(items, 1):
+        section = f"### Item {number}\nPrompt:\n{item.prompt.strip()}\n\nResponse:\n{item.response.strip()}"
+        if item.reference:
+            section += f"\n\nReference answer:\n{item.reference.strip()}"
+        sections.append(section)
+
+    fields = ", ".join(f'"{name}": <1-5>' for name in CRITERIA)
+    return (
+        f"You are grading {len(items)} model response(s).\n\n{rubric}\n\n"
+        + "\n\n".join(sections)
+        + f"\n\nReturn only a JSON array with one object per item, in order: "
+        f'[{{"item": <item number>, {fields}}}, ...]'
+    )
+
+def _normalize(value: Any) -> Optional[float]:
+    """Map a 1-5 grade to 0-1; None if it is not a number."""
+    try:
+        grade = float(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max((grade - 1) / 4, 0.0), 1.0)
+
+def parse_verdicts(text: str, count: int) -> List[Optional[JudgeVerdict]]:
+    """Parse a judge response into one verdict per item (None where missing or invalid)."""
+    parsed = extract_json(text, arrays=True)
+    if isinstance(parsed, dict):
+        parsed = parsed.get("verdicts") or parsed.get("items") or [parsed]
+    verdicts: List[Optional[JudgeVerdict]] = [None] * count
+    if not isinstance(parsed, list):
+        return verdicts
+
+    for position, entry in enumerate(parsed):
+        if not isinstance(entry, dict):
+            continue
+        try:
+            index = int(entry.get("item", position + 1)) - 1
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= index < count:
+            continue
+        scores = {name: _normalize(entry.get(name)) for name in CRITERIA}
+        if None not in scores.values():
+            verdicts[index] = JudgeVerdict(**scores)
+    return verdicts
+
+logger = logging.getLogger(__name__)
+
+class JudgePipeline:
+    """Grade responses in batched, concurrent, cached judge calls."""
+
+    def __init__(
+        self,
+        client,
+        judge_model: Optional[str] = None,
+        rubric: str = DEFAULT_RUBRIC,
+        batch_size: int = 5,
+        concurrency: int = 8,
+        cache: Optional[VerdictCache] = None,
+        max_tokens_per_item: int = 80
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            client: An LLMClient (or compatible) instance
+            judge_model: Model used as judge; the client's model if omitted
+            rubric: Grading instructions included in every judge prompt
+            batch_size: Items graded per judge call
+            concurrency: Maximum number of judge calls in flight
+            cache: Verdict cache; verdicts are not persisted if omitted
+            max_tokens_per_item: Completion budget per item in a judge call
+        """
+        self.client = client
+        self.judge_model = judge_model
+        self.rubric = rubric
+        self.batch_size = max(1, batch_size)
+        self.concurrency = concurrency
+        self.cache = cache
+        self.max_tokens_per_item = max_tokens_per_item
+        self.calls = 0
+
+    def _model_name(self) -> str:
+        return self.judge_model or getattr(self.client, "model_name", "")
+
+    async def _judge_batch(self, batch: Sequence[JudgeItem]) -> List[Optional[JudgeVerdict]]:
+        kwargs = {"model": self.judge_model} if self.judge_model else {}
+        self.calls += 1
+        try:
+            response = await self.client.generate(
+                prompt=build_judge_prompt(batch, self.rubric),
+                max_tokens=self.max_tokens_per_item * len(batch),
+                temperature=0.0,
+                **kwargs
+            )
+        except (httpx.HTTPError, RetryError, DeadlineExceeded) as e:
+            # Transport and timeout failures leave the items unjudged; anything else is a bug
+            logger.warning("Judge call for %d items failed: %s: %s", len(batch), type(e).__name__, e)
+            return [None] * len(batch)
+        return parse_verdicts(response["choices"][0]["text"], len(batch))
+
+    async def judge(self, items: Sequence[JudgeItem]) -> List[Optional[JudgeVerdict]]:
+        """Grade items, returning one verdict per item (None if the judge never produced one)."""
+        model = self._model_name()
+        keys = [verdict_key(model, self.rubric, item) for item in items]
+        verdicts: List[Optional[JudgeVerdict]] = [
+            self.cache.get(key) if self.cache is not None else None for key in keys
+        ]
+
+        # Identical items are judged once
+        pending: Dict[str, List[int]] = {}
+        for index, (key, verdict) in enumerate(zip(keys, verdicts)):
+            if verdict is None:
+                pending.setdefault(key, []).append(index)
+        todo = [items[indexes[0]] for indexes in pending.values()]
+        todo_keys = list(pending)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(batch):
+            async with semaphore:
+                return await self._judge_batch(batch)
+
+        batches = [todo[i:i + self.batch_size] for i in range(0, len(todo), self.batch_size)]
+        results = [v for batch in await asyncio.gather(*(bounded(b) for b in batches)) for v in batch]
+
+        # Items dropped from a multi-item verdict get one more try on their own
+        retry = [i for i, verdict in enumerate(results) if verdict is None]
+        if self.batch_size > 1 and retry:
+            retried = await asyncio.gather(*(bounded([todo[i]]) for i in retry))
+            for i, verdict in zip(retry, retried):
+                results[i] = verdict[0]
+
+        for key, verdict in zip(todo_keys, results):
+            if verdict is None:
+                continue
+            if self.cache is not None:
+                self.cache.put(key, verdict)
+            for index in pending[key]:
+                verdicts[index] = verdict
+        return verdicts
+
+    async def judge_into(self, collector: MetricsCollector, items: Sequence[JudgeItem]) -> List[Optional[JudgeVerdict]]:
+        """Grade items and add every verdict to the collector's quality metrics."""
+        verdicts = await self.judge(items)
+        for verdict in verdicts:
+            if verdict is not None:
+                collector.add_quality_metrics(verdict.to_quality_metrics())
+        return verdicts
@@ -0,0 +1,198 @@
+"""Keyword and phrase scoring with a precompiled Aho-Corasick automaton.
+
+The expected keywords of a case are compiled once into an automaton that
+finds every occurrence of every keyword in a single pass over a response,
+instead of one substring scan per keyword. Keywords and responses are
+normalized the same way before matching:
+
+- Unicode NFKC normalization and case folding
+- punctuation replaced by spaces and runs of whitespace collapsed
+- optionally, matches must start and end on word boundaries
+
+Compiled scorers are cached by their keyword set and options, so a dataset
+that reuses the same expected_output across many cases compiles it once.
+The C-backed ``pyahocorasick`` package is used when installed.
+"""
+
+import re
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Sequence, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on environment
+    ahocorasick = None
+
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize(text: str, strip_punctuation: bool = True) -> str:
+    """Normalize text for matching: NFKC, casefold, punctuation and whitespace."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    if strip_punctuation:
+        text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed list of (already normalized) patterns."""
+
+    def __init__(self, patterns: Sequence[str]):
+        """Build the trie, failure links and output sets."""
+        self.patterns = list(patterns)
+        if ahocorasick is not None:
+            self._native = ahocorasick.Automaton()
+            for index, pattern in enumerate(self.patterns):
+                if pattern:
+                    self._native.add_word(pattern, index)
+            if len(self._native):
+                self._native.make_automaton()
+            return
+        self._native = None
+
+        # Node 0 is the root; each node has transitions, a failure link and outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(index)
+
+        # Breadth-first so every failure target is finished before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end_index, pattern_index) for every match; end_index is inclusive."""
+        if self._native is not None:
+            if len(self._native):
+                yield from self._native.iter(text)
+            return
+
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in out[node]:
+                yield position, index
+
+class KeywordScorer:
+    """Scores responses by which of a fixed set of keywords they contain."""
+
+    def __init__(
+        self,
+        keywords: Sequence[str],
+        mode: str = "any",
+        word_boundary: bool = False,
+        strip_punctuation: bool = True
+    ):
+        """Initialize the scorer.
+
+        Args:
+            keywords: Keywords or phrases to look for
+            mode: "any" (1.0 if any keyword is found), "all" (1.0 only if every
+                keyword is found) or "fraction" (share of keywords found)
+            word_boundary: Only match whole words, so "cat" does not match "concat";
+                off by default, matching the substring checks the scorer replaced
+            strip_punctuation: Treat punctuation as whitespace in keywords and text
+        """
+        if mode not in ("any", "all", "fraction"):
+            raise ValueError(f"Unknown keyword scoring mode: {mode}")
+        self.keywords = list(keywords)
+        self.mode = mode
+        self.word_boundary = word_boundary
+        self.strip_punctuation = strip_punctuation
+        self._normalized = [normalize(keyword, strip_punctuation) for keyword in self.keywords]
+        # Keywords that normalize to the same pattern share one automaton entry
+        self._patterns = list(dict.fromkeys(self._normalized))
+        self._automaton = KeywordAutomaton(self._patterns)
+
+    @classmethod
+    def from_expected_output(cls, expected: Dict[str, Any], **options) -> "KeywordScorer":
+        """Build a scorer from an expected_output with keywords, key_phrase or key_points."""
+        if "keywords" in expected:
+            return compile_keywords(expected["keywords"], mode="any", **options)
+        if "key_phrase" in expected:
+            return compile_keywords([expected["key_phrase"]], mode="any", **options)
+        if "key_points" in expected:
+            return compile_keywords(expected["key_points"], mode="fraction", **options)
+        raise ValueError(f"No keywords in expected output {list(expected)}")
+
+    def _is_boundary(self, text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end + 1] if end + 1 < len(text) else " "
+        return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+    def matched(self, text: str) -> Set[int]:
+        """Indices of the keywords found in text."""
+        text = normalize(text, self.strip_punctuation)
+        patterns: Set[str] = set()
+        for end, index in self._automaton.iter_matches(text):
+            pattern = self._patterns[index]
+            if pattern in patterns:
+                continue
+            start = end - len(pattern) + 1
+            if not self.word_boundary or self._is_boundary(text, start, end):
+                patterns.add(pattern)
+        return {i for i, pattern in enumerate(self._normalized) if pattern in patterns}
+
+    def found(self, text: str) -> List[str]:
+        """Keywords present in text, in their original order."""
+        matched = self.matched(text)
+        return [keyword for i, keyword in enumerate(self.keywords) if i in matched]
+
+    def missing(self, text: str) -> List[str]:
+        """Keywords absent from text, in their original order."""
+        matched = self.matched(text)
+        return [keyword for i, keyword in enumerate(self.keywords) if i not in matched]
+
+    def score(self, text: str) -> float:
+        """Score one response according to the scorer's mode."""
+        if not self.keywords:
+            return 1.0
+        matched = len(self.matched(text))
+        if self.mode == "any":
+            return float(matched > 0)
+        if self.mode == "all":
+            return float(matched == len(self.keywords))
+        return matched / len(self.keywords)
+
+    def score_batch(self, texts: Sequence[str]) -> List[float]:
+        """Score many responses against the same compiled keyword set."""
+        return [self.score(text) for text in texts]
+
+@lru_cache(maxsize=1024)
+def _compile(keywords: Tuple[str, ...], mode: str, word_boundary: bool, strip_punctuation: bool) -> KeywordScorer:
+    return KeywordScorer(keywords, mode, word_boundary, strip_punctuation)
+
+def compile_keywords(
+    keywords: Sequence[str],
+    mode: str = "any",
+    word_boundary: bool = False,
+    strip_punctuation: bool = True
+) -> KeywordScorer:
+    """Return a cached KeywordScorer for this keyword set and options."""
+    return _compile(tuple(keywords), mode, word_boundary, strip_punctuation)
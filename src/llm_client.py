@@ -1,84 +1,497 @@
 """LLM client for making API calls to language models."""
 
+import asyncio
+import contextlib
+import contextvars
 import json
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Union
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential, RetryError
 
 from .config import settings
+from .deadline import Deadline, DeadlineExceeded, current_deadline, deadline
+from .hedging import LatencyWindow, hedged
+from .load_balancer import LoadBalancer
+from .providers import Provider, get_provider
+from .rate_limiter import RateLimiter
+from .tracing import tracer, prompt_hash
+from .tokenizer import get_tokenizer
+
+# Attempt number of the in-flight generate() call, set by the retry policy
+_retry_attempt: contextvars.ContextVar[int] = contextvars.ContextVar("retry_attempt", default=1)
+
+# False while a request whose client errors should fail fast (not be retried) is in flight
+_retry_client_errors: contextvars.ContextVar[bool] = contextvars.ContextVar("retry_client_errors", default=True)
+
+def _should_retry(exception: BaseException) -> bool:
+    """Retry everything, except 4xx responses (other than 408/429) when client errors fail fast."""
+    if isinstance(exception, httpx.HTTPStatusError) and not _retry_client_errors.get():
+        status = exception.response.status_code
+        return not 400 <= status < 500 or status in (408, 429)
+    return True
+
+def _record_attempt(retry_state):
+    """Expose the tenacity attempt number to the traced request."""
+    _retry_attempt.set(retry_state.attempt_number)
+
+async def _traced_sleep(seconds: float):
+    """Retry back-off sleep, recorded as its own span."""
+    with tracer.span("llm.retry_sleep", sleep_seconds=seconds, **{"retry.attempt": _retry_attempt.get()}):
+        await asyncio.sleep(seconds)
+
+class _StopWhenOutOfBudget:
+    """Stop retrying when the next back-off would not leave time for another attempt."""
+
+    def __init__(self, budget: Deadline, wait):
+        self.budget = budget
+        self.wait = wait
+
+    def __call__(self, retry_state) -> bool:
+        return self.budget.remaining() <= self.wait(retry_state)
 
 class LLMClient:
     """Client for interacting with LLM APIs."""
     
-    def __init__(self):
-        """Initialize the LLM client with configuration."""
-        self.base_url = str(settings.api_base_url)
-        self.api_key = settings.api_key.get_secret_value()
-        self.model_name = settings.model_name  # Changed from llm_model_name
-        
-    @retry(
-        stop=stop_after_attempt(settings.max_retries),
-        wait=wait_exponential(multiplier=settings.retry_delay)
-    )
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        model_name: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        base_urls: Optional[List[str]] = None,
+        provider: Optional[Union[str, Provider]] = None
+    ):
+        """
+        Initialize the LLM client with configuration.
+        
+        Endpoint arguments default to the global settings, so several clients
+        for different models can coexist in one process.
+        
+        Args:
+            base_url: API base URL (API_BASE_URL by default)
+            api_key: API key (API_KEY by default)
+            model_name: Model to request (MODEL_NAME by default)
+            max_connections: Connection pool size inside `async with`; unbounded if None
+            rate_limiter: Optional request rate / concurrency limiter for this endpoint
+            base_urls: Several replicas of the model to balance requests over
+                (API_BASE_URLS by default); ignored if base_url is given
+            provider: Server protocol adapter or its name (LLM_PROVIDER by default)
+        """
+        if not ((base_url or base_urls) and api_key and model_name):
+            settings.require_api()
+        urls = [base_url] if base_url else list(base_urls or settings.base_url_list())
+        self.base_url = urls[0] if urls[0].endswith("/") else urls[0] + "/"
+        self.balancer = LoadBalancer(
+            urls,
+            strategy=settings.load_balancing,
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_seconds
+        ) if len(urls) > 1 else None
+        self.api_key = api_key or settings.api_key.get_secret_value()
+        self.model_name = model_name or settings.model_name  # Changed from llm_model_name
+        self.embedding_model = settings.embedding_model or f"{self.model_name}-embedding"
+        if not isinstance(provider, Provider):
+            provider = get_provider(provider or settings.llm_provider, system_prompt=settings.system_prompt or None)
+        self.provider = provider
+        self.max_connections = max_connections
+        self.rate_limiter = rate_limiter
+        self.latencies = LatencyWindow()
+        self.hedged_requests = 0
+        self._http: Optional[httpx.AsyncClient] = None
+        
+    async def __aenter__(self):
+        """Open a pooled HTTP client shared by all requests inside the block."""
+        self._http = httpx.AsyncClient(limits=httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=min(self.max_connections or 100, 100)
+        ))
+        if self.balancer is not None and settings.health_probe_interval > 0:
+            self.balancer.start_probing(
+                self._http, settings.health_probe_interval, {"Authorization": f"Bearer {self.api_key}"}
+            )
+        return self
+        
+    async def __aexit__(self, *exc):
+        """Close the pooled HTTP client."""
+        if self.balancer is not None:
+            self.balancer.stop_probing()
+        await self._http.aclose()
+        self._http = None
+        
+    @contextlib.asynccontextmanager
+    async def _http_client(self):
+        """Yield the pooled client if one is open, otherwise a one-off client.
+        
+        Requests made inside the block are subject to the client's rate limiter.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            if self.rate_limiter is not None:
+                await stack.enter_async_context(self.rate_limiter)
+            if self._http is not None:
+                yield self._http
+            else:
+                yield await stack.enter_async_context(httpx.AsyncClient())
+        
+    def _retrying(self, budget: Deadline) -> AsyncRetrying:
+        """Retry policy, built from the current settings when a request is made.
+        
+        Retries stop early when the back-off would run past the deadline.
+        """
+        wait = wait_exponential(multiplier=settings.retry_delay)
+        return AsyncRetrying(
+            stop=stop_after_attempt(settings.max_retries) | _StopWhenOutOfBudget(budget, wait),
+            wait=wait,
+            retry=retry_if_exception(_should_retry),
+            before=_record_attempt,
+            sleep=_traced_sleep
+        )
+        
+    async def _post(self, client: httpx.AsyncClient, path: str, budget: Deadline, **kwargs) -> httpx.Response:
+        """POST to the API, failing over between replicas when several are configured."""
+        if self.balancer is None:
+            return await self._post_to(client, f"{self.base_url}{path}", budget, **kwargs)
+        return await self.balancer.request(
+            lambda base_url: self._post_to(client, f"{base_url}{path}", budget, **kwargs)
+        )
+        
+    async def _post_to(self, client: httpx.AsyncClient, url: str, budget: Deadline, **kwargs) -> httpx.Response:
+        """POST with connect/read timeouts and a total time limit taken from the deadline."""
+        budget.check()
+        remaining = budget.remaining()
+        timeout = httpx.Timeout(remaining, connect=min(settings.connect_timeout, remaining))
+        try:
+            return await asyncio.wait_for(client.post(url, timeout=timeout, **kwargs), remaining)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded(f"Request to {url} exceeded its {budget.seconds:.2f}s deadline") from e
+        except httpx.TimeoutException as e:
+            if budget.expired:
+                raise DeadlineExceeded(f"Request to {url} exceeded its {budget.seconds:.2f}s deadline") from e
+            raise
+            
+    def _hedge_delay(self, budget: Deadline) -> Optional[float]:
+        """Seconds to wait before hedging, or None if this request should not be hedged."""
+        if not settings.hedge_requests:
+            return None
+        if settings.hedge_delay_ms is not None:
+            delay_ms = settings.hedge_delay_ms
+        elif len(self.latencies) >= settings.hedge_min_samples:
+            delay_ms = self.latencies.percentile(settings.hedge_percentile)
+        else:
+            return None
+        # A hedge that cannot finish before the deadline is wasted load
+        return delay_ms / 1000 if delay_ms / 1000 < budget.remaining() else None
+        
+    def _count_hedge(self):
+        self.hedged_requests += 1
+        
     async def generate(
         self,
         prompt: str,
         max_tokens: Optional[int] = None,
         temperature: float = 1.0,
+        timeout: Optional[float] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
-        Generate text from the LLM using chat completions.
+        Generate text from the LLM through the configured provider.
+        
+        The whole call, retries included, runs under one deadline: `timeout`
+        if given, else the enclosing `deadline()` block (for example a test's
+        timeout_seconds), else settings.test_timeout.
         
         Args:
             prompt: Input text to generate from
             max_tokens: Maximum number of tokens to generate
             temperature: Sampling temperature (0-2)
-            **kwargs: Additional model-specific parameters
+            timeout: Total seconds allowed for this call
+            **kwargs: Additional model-specific parameters; `n` and `logprobs`
+                are translated for the provider, and `model` overrides the
+                client's model for this call
             
         Returns:
             Dict containing the model response and metadata
         """
+        return (await self._complete([prompt], max_tokens, temperature, timeout, **kwargs))[0]
+        
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        max_tokens: Optional[int] = None,
+        temperature: float = 1.0,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate from several prompts, in as few requests as the provider allows.
+        
+        Providers with a multi-prompt endpoint get up to settings.max_batch_prompts
+        prompts per request; for the others the prompts are sent concurrently,
+        one per request, and batched by the server.
+        
+        Args:
+            prompts: Input texts to generate from
+            max_tokens: Maximum number of tokens per completion
+            temperature: Sampling temperature (0-2)
+            timeout: Total seconds allowed for each request
+            **kwargs: Additional model-specific parameters, as for generate()
+            
+        Returns:
+            One response in the generate() format per prompt, in prompt order
+        """
+        if not self.provider.supports_batch:
+            return list(await asyncio.gather(*(
+                self.generate(prompt, max_tokens, temperature, timeout, **kwargs) for prompt in prompts
+            )))
+        size = max(1, settings.max_batch_prompts)
+        chunks = await asyncio.gather(*(
+            self._complete(prompts[i:i + size], max_tokens, temperature, timeout, **kwargs)
+            for i in range(0, len(prompts), size)
+        ))
+        return [response for chunk in chunks for response in chunk]
+        
+    async def _complete(
+        self,
+        prompts: List[str],
+        max_tokens: Optional[int],
+        temperature: float,
+        timeout: Optional[float],
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """One request for `prompts` under a deadline, with retries and (single prompts only) hedging."""
+        if timeout is None and current_deadline() is None:
+            timeout = settings.test_timeout
+        with deadline(timeout) as budget:
+            async for attempt in self._retrying(budget):
+                with attempt:
+                    # Batch latencies are not comparable with the single-request window
+                    delay = self._hedge_delay(budget) if len(prompts) == 1 else None
+                    if delay is None:
+                        return await self._generate_once(prompts, max_tokens, temperature, budget, **kwargs)
+                    return await hedged(
+                        lambda index: self._generate_once(prompts, max_tokens, temperature, budget, hedge_index=index, **kwargs),
+                        delay,
+                        on_hedge=self._count_hedge
+                    )
+                
+    async def _generate_once(
+        self,
+        prompts: List[str],
+        max_tokens: Optional[int],
+        temperature: float,
+        budget: Deadline,
+        hedge_index: int = 0,
+        n: int = 1,
+        logprobs: Optional[int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """Make a single generation request (one retry attempt, or its hedge)."""
+        model = kwargs.pop("model", None) or self.model_name
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        payload = self.provider.build_request(
+            model, prompts, max_tokens, temperature, n=n, logprobs=logprobs, **kwargs
+        )
+        attributes = {"batch_size": len(prompts)} if len(prompts) > 1 else {}
+            
+        with tracer.span(
+            "llm.generate",
+            model=model,
+            prompt_hash=prompt_hash(prompts[0]),
+            temperature=temperature,
+            **attributes,
+            **{"retry.attempt": _retry_attempt.get(), "hedge.index": hedge_index}
+        ) as span:
+            async with self._http_client() as client:
+                start = time.perf_counter()
+                response = await self._post(
+                    client,
+                    self.provider.generate_path,
+                    budget,
+                    headers=headers,
+                    json=payload
+                )
+                span.set_attribute("http.status_code", response.status_code)
+                response.raise_for_status()
+            
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if len(prompts) == 1:
+                self.latencies.record(elapsed_ms)
+            
+            # Convert the provider's format to match test expectations
+            raw_response = response.json()
+            server_ms = raw_response.get("response_ms") if isinstance(raw_response, dict) else None
+            responses = self.provider.parse_response(raw_response, len(prompts), n)
+            if len(responses) != len(prompts):
+                raise ValueError(f"Expected {len(prompts)} responses from {self.provider.name}, got {len(responses)}")
+            for prompt, result in zip(prompts, responses):
+                result["model"] = result.get("model") or model
+                result["usage"] = self._complete_usage(prompt, result)
+                result["response_ms"] = server_ms or elapsed_ms
+            span.set_attributes({
+                "tokens.prompt": sum(r["usage"].get("prompt_tokens", 0) for r in responses),
+                "tokens.completion": sum(r["usage"].get("completion_tokens", 0) for r in responses),
+                "finish_reason": responses[0]["choices"][0]["finish_reason"] if responses[0]["choices"] else None
+            })
+            return responses
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 1.0,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Generate text with a streaming request, measuring time to first token.
         
-        messages = [
-            {"role": "system", "content": "You are a helpful AI assistant for evaluating LLM capabilities."},
-            {"role": "user", "content": prompt}
-        ]
+        Used for load testing, so it is not retried, hedged or failed over: each
+        call is exactly one request and its errors are raised to the caller.
         
-        payload = {
-            "model": self.model_name,
-            "messages": messages,
-            "temperature": temperature,
-            **kwargs
-        }
-        if max_tokens:
-            payload["max_tokens"] = max_tokens
+        Args:
+            prompt: Input text to generate from
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (0-2)
+            timeout: Total seconds allowed for this call
+            **kwargs: Additional model-specific parameters
             
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}v1/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=settings.test_timeout
-            )
-            response.raise_for_status()
+        Returns:
+            Dict in the generate() format, plus "ttft_ms" (None if no token arrived)
+        """
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        model = kwargs.pop("model", None) or self.model_name
+        payload = self.provider.build_request(model, [prompt], max_tokens, temperature, stream=True, **kwargs)
             
-            # Convert chat completion format to match test expectations
-            raw_response = response.json()
+        if timeout is None and current_deadline() is None:
+            timeout = settings.test_timeout
+        endpoint = self.balancer.select() if self.balancer is not None else None
+        base_url = endpoint.url if endpoint is not None else self.base_url
+        pieces: List[str] = []
+        usage: Optional[Dict[str, Any]] = None
+        finish_reason = None
+        ttft_ms = None
+        
+        with deadline(timeout) as budget, tracer.span("llm.generate_stream", model=model, prompt_hash=prompt_hash(prompt)) as span:
+            async with self._http_client() as client:
+                start = time.perf_counter()
+                
+                async def consume():
+                    nonlocal usage, finish_reason, model, ttft_ms
+                    remaining = budget.remaining()
+                    async with client.stream(
+                        "POST",
+                        f"{base_url}{self.provider.stream_path}",
+                        headers=headers,
+                        json=payload,
+                        timeout=httpx.Timeout(remaining, connect=min(settings.connect_timeout, remaining))
+                    ) as response:
+                        span.set_attribute("http.status_code", response.status_code)
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            data = line[5:].strip()
+                            if data == "[DONE]":
+                                # Keep reading to the end so the line iterator closes cleanly
+                                continue
+                            chunk = json.loads(data)
+                            model = chunk.get("model") or model
+                            delta = self.provider.parse_stream_chunk(chunk)
+                            usage = delta.usage or usage
+                            if delta.text:
+                                if ttft_ms is None:
+                                    ttft_ms = (time.perf_counter() - start) * 1000
+                                pieces.append(delta.text)
+                            finish_reason = delta.finish_reason or finish_reason
+                                
+                budget.check()
+                try:
+                    if endpoint is not None:
+                        with endpoint.track():
+                            await asyncio.wait_for(consume(), budget.remaining())
+                    else:
+                        await asyncio.wait_for(consume(), budget.remaining())
+                except asyncio.TimeoutError as e:
+                    raise DeadlineExceeded(f"Streaming request exceeded its {budget.seconds:.2f}s deadline") from e
+                    
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            result = {"choices": [{"text": "".join(pieces), "finish_reason": finish_reason}], "usage": usage}
+            usage = self._complete_usage(prompt, result)
+            span.set_attributes({"ttft_ms": ttft_ms or 0, "tokens.completion": usage.get("completion_tokens", 0)})
             return {
-                "choices": [{
-                    "text": raw_response["choices"][0]["message"]["content"],
-                    "finish_reason": raw_response["choices"][0]["finish_reason"]
-                }],
-                "model": raw_response["model"],
-                "usage": raw_response.get("usage", {}),
-                "response_ms": raw_response.get("response_ms")
+                "choices": result["choices"],
+                "model": model,
+                "usage": usage,
+                "response_ms": elapsed_ms,
+                "ttft_ms": ttft_ms
             }
     
+    async def generate_samples(
+        self,
+        prompt: str,
+        n: int,
+        max_tokens: Optional[int] = None,
+        temperature: float = 1.0,
+        **kwargs
+    ) -> List[str]:
+        """
+        Generate n independent completions for one prompt.
+        
+        Asks for all n in a single request when the provider supports it; if the
+        server rejects it (a 4xx, which is not retried) or returns fewer
+        choices, the rest are requested concurrently as single completions.
+        
+        Args:
+            prompt: Input text to generate from
+            n: Number of completions
+            max_tokens: Maximum number of tokens per completion
+            temperature: Sampling temperature (0-2)
+            **kwargs: Additional model-specific parameters
+            
+        Returns:
+            List of n completion texts
+        """
+        texts: List[str] = []
+        if n > 1 and settings.native_n_sampling and self.provider.supports_n:
+            token = _retry_client_errors.set(False)
+            try:
+                response = await self.generate(prompt, max_tokens, temperature, n=n, **kwargs)
+                texts = [choice["text"] for choice in response["choices"]][:n]
+            except (httpx.HTTPStatusError, RetryError):
+                texts = []
+            finally:
+                _retry_client_errors.reset(token)
+                
+        if len(texts) < n:
+            responses = await asyncio.gather(*(
+                self.generate(prompt, max_tokens, temperature, **kwargs)
+                for _ in range(n - len(texts))
+            ))
+            texts.extend(response["choices"][0]["text"] for response in responses)
+        return texts
+    
+    def _complete_usage(self, prompt: str, response: Dict[str, Any]) -> Dict[str, Any]:
+        """The response's usage, with token counts the server omitted estimated locally."""
+        usage = dict(response.get("usage") or {})
+        if "prompt_tokens" in usage and "completion_tokens" in usage:
+            return usage
+        tokenizer = get_tokenizer()
+        estimated = {
+            "prompt_tokens": sum(tokenizer.count_batch(self.provider.prompt_parts(prompt))),
+            "completion_tokens": sum(tokenizer.count_batch([c["text"] or "" for c in response["choices"]])),
+            "estimated": True
+        }
+        usage = {**estimated, **usage}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return usage
+    
     async def get_embedding(self, text: str) -> Dict[str, Any]:
         """
         Get embeddings for the input text.
@@ -95,19 +508,58 @@ class LLMClient:
         }
         
         payload = {
-            "model": f"{self.model_name}-embedding",  # Assume embedding model variant
+            "model": self.embedding_model,
             "input": text
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/v1/embeddings",
-                headers=headers,
-                json=payload,
-                timeout=settings.test_timeout
-            )
-            response.raise_for_status()
-            return response.json()
+        with tracer.span("llm.embedding", model=payload["model"], prompt_hash=prompt_hash(text)) as span:
+            async with self._http_client() as client:
+                response = await self._post(
+                    client,
+                    "v1/embeddings",
+                    current_deadline() or Deadline(settings.test_timeout),
+                    headers=headers,
+                    json=payload
+                )
+                span.set_attribute("http.status_code", response.status_code)
+                response.raise_for_status()
+                return response.json()
+            
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for several texts in a single request.
+        
+        Args:
+            texts: Input texts to embed
+            
+        Returns:
+            One embedding vector per input text, in input order
+        """
+        if not texts:
+            return []
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": self.embedding_model,
+            "input": list(texts)
+        }
+        
+        with tracer.span("llm.embedding", model=payload["model"], batch_size=len(texts)) as span:
+            async with self._http_client() as client:
+                response = await self._post(
+                    client,
+                    "v1/embeddings",
+                    current_deadline() or Deadline(settings.test_timeout),
+                    headers=headers,
+                    json=payload
+                )
+                span.set_attribute("http.status_code", response.status_code)
+                response.raise_for_status()
+                data = sorted(response.json()["data"], key=lambda item: item["index"])
+                return [item["embedding"] for item in data]
             
     async def analyze_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -119,14 +571,26 @@ class LLMClient:
         Returns:
             Dict containing computed metrics
         """
+        usage = response.get("usage", {})
+        text = response.get("choices", [{}])[0].get("text", "")
+        completion_tokens = usage.get("completion_tokens") or get_tokenizer().count(text)
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        latency_ms = response.get("response_ms") or 0
+        
         metrics = {
-            "tokens_generated": len(response.get("choices", [{}])[0].get("text", "").split()),
+            "tokens_generated": completion_tokens,
             "finish_reason": response.get("choices", [{}])[0].get("finish_reason"),
-            "latency_ms": response.get("response_ms", 0),
+            "latency_ms": latency_ms,
             "model_version": response.get("model", self.model_name),
-            "prompt_tokens": response.get("usage", {}).get("prompt_tokens", 0),
-            "completion_tokens": response.get("usage", {}).get("completion_tokens", 0),
-            "total_tokens": response.get("usage", {}).get("total_tokens", 0)
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": usage.get("total_tokens") or prompt_tokens + completion_tokens,
+            "tokens_estimated": bool(usage.get("estimated")) or not usage.get("completion_tokens"),
+            "tokens_per_second": completion_tokens / (latency_ms / 1000) if latency_ms else None,
+            "cost": (
+                prompt_tokens * settings.prompt_cost_per_1k
+                + completion_tokens * settings.completion_cost_per_1k
+            ) / 1000
         }
         
         return metrics
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Client-side load balancing over several API base URLs.
+
+Requests are spread over the replicas by round-robin or least-outstanding-
+requests selection. Each replica has a circuit breaker: after
+`failure_threshold` consecutive connection errors or 5xx responses it is
+taken out of rotation for `reset_timeout` seconds, after which one trial
+request (or a successful health probe) puts it back. A request that fails on
+one replica is retried on the next healthy one immediately, so a replica
+going down costs one failed attempt rather than a full retry back-off.
+
+Usage:
+    API_BASE_URLS=http://gpu0:8000/,http://gpu1:8000/ pytest tests/
+"""
+
+import asyncio
+import contextlib
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class NoHealthyEndpointError(RuntimeError):
+    """Raised when every endpoint's circuit breaker is open."""
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self) -> bool:
+        """Whether a request may be sent (closed, or half-open for a trial)."""
+        return self.state != OPEN
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        # A failed trial re-opens the circuit for another full reset_timeout
+        if self.failures >= self.failure_threshold or self._opened_at is not None:
+            self.trip()
+
+    def trip(self):
+        """Open the circuit now."""
+        self._opened_at = time.monotonic()
+
+class Endpoint:
+    """One replica and its request statistics."""
+
+    def __init__(self, url: str, breaker: CircuitBreaker):
+        self.url = url if url.endswith("/") else url + "/"
+        self.breaker = breaker
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+
+    @contextlib.contextmanager
+    def track(self) -> Iterator["Endpoint"]:
+        """Count a request as outstanding while the block runs."""
+        self.outstanding += 1
+        self.requests += 1
+        try:
+            yield self
+        finally:
+            self.outstanding -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "state": self.breaker.state,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures
+        }
+
+def _is_failure(response: httpx.Response) -> bool:
+    return response.status_code >= 500
+
+class LoadBalancer:
+    """Select, fail over between and health-check several base URLs."""
+
+    STRATEGIES = ("round_robin", "least_outstanding")
+
+    def __init__(
+        self,
+        urls: Iterable[str],
+        strategy: str = "least_outstanding",
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        health_path: str = "v1/models"
+    ):
+        """Initialize the balancer.
+
+        Args:
+            urls: Base URLs of the replicas
+            strategy: "round_robin" or "least_outstanding"
+            failure_threshold: Consecutive failures that take a replica out of rotation
+            reset_timeout: Seconds before a failed replica is tried again
+            health_path: Path probed (GET) to check a replica's health
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown load balancing strategy '{strategy}', expected one of {self.STRATEGIES}")
+        self.endpoints = [Endpoint(url, CircuitBreaker(failure_threshold, reset_timeout)) for url in urls]
+        if not self.endpoints:
+            raise ValueError("At least one base URL is required")
+        self.strategy = strategy
+        self.health_path = health_path
+        self._counter = itertools.count()
+        self._probe_task: Optional[asyncio.Task] = None
+
+    def select(self, exclude: Iterable[Endpoint] = ()) -> Optional[Endpoint]:
+        """Pick the next endpoint whose breaker allows a request, or None."""
+        excluded = set(map(id, exclude))
+        start = next(self._counter) % len(self.endpoints)
+        rotated = self.endpoints[start:] + self.endpoints[:start]
+        candidates = [e for e in rotated if id(e) not in excluded and e.breaker.allow()]
+        if not candidates:
+            return None
+        if self.strategy == "round_robin":
+            return candidates[0]
+        # min() keeps the first of equal candidates, so ties still rotate
+        return min(candidates, key=lambda e: e.outstanding)
+
+    async def request(self, send: Callable[[str], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a request via send(base_url), failing over to other replicas.
+
+        Connection errors and 5xx responses count against the replica and the
+        request moves on to the next healthy one. The last error (or 5xx
+        response) is returned to the caller when every replica has failed, so
+        the caller's own retry policy still applies.
+        """
+        tried: List[Endpoint] = []
+        while True:
+            endpoint = self.select(exclude=tried)
+            if endpoint is None:
+                if not tried:
+                    raise NoHealthyEndpointError(
+                        f"All {len(self.endpoints)} endpoints are unavailable: {[e.url for e in self.endpoints]}"
+                    )
+                break
+            tried.append(endpoint)
+            with endpoint.track():
+                try:
+                    response = await send(endpoint.url)
+                except asyncio.TimeoutError:
+                    # The caller's deadline is spent, so there is no time to fail over
+                    self._record(endpoint, ok=False)
+                    raise
+                except httpx.TransportError as e:
+                    self._record(endpoint, ok=False)
+                    error, response = e, None
+                else:
+                    self._record(endpoint, ok=not _is_failure(response))
+                    if not _is_failure(response):
+                        return response
+                    error = None
+        if error is not None:
+            raise error
+        return response
+
+    def _record(self, endpoint: Endpoint, ok: bool):
+        if ok:
+            endpoint.breaker.record_success()
+        else:
+            endpoint.failures += 1
+            endpoint.breaker.record_failure()
+
+    async def probe(self, client: httpx.AsyncClient, headers: Optional[Dict[str, str]] = None, timeout: float = 5.0):
+        """Check every replica once; healthy ones are closed, failing ones opened."""
+        async def check(endpoint: Endpoint):
+            try:
+                response = await client.get(f"{endpoint.url}{self.health_path}", headers=headers, timeout=timeout)
+                healthy = not _is_failure(response)
+            except httpx.HTTPError:
+                healthy = False
+            if healthy:
+                endpoint.breaker.record_success()
+            elif endpoint.breaker.state == CLOSED:
+                endpoint.breaker.trip()
+
+        await asyncio.gather(*(check(endpoint) for endpoint in self.endpoints))
+
+    def start_probing(self, client: httpx.AsyncClient, interval: float, headers: Optional[Dict[str, str]] = None):
+        """Probe all replicas every `interval` seconds in the background."""
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                await self.probe(client, headers)
+
+        self.stop_probing()
+        self._probe_task = asyncio.ensure_future(loop())
+
+    def stop_probing(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint state and request counts."""
+        return [endpoint.stats() for endpoint in self.endpoints]
@@ -0,0 +1,324 @@
+"""Load and soak testing against a model endpoint.
+
+Replays the evaluation prompts (``unit_tests`` rows or a JSONL dataset) at a
+target request rate or concurrency for a fixed duration, with the same
+prompt mix the pytest suites evaluate on. The rate mode is open-loop:
+requests are sent on schedule whether or not earlier ones have finished, so
+a saturated server shows up as rising latency and errors instead of the
+generator quietly slowing down. Every request is recorded in a
+PerformanceMonitor (latency, time to first token, tokens/s, errors); running
+several rates gives a saturation curve of latency against offered load.
+
+Latency and TTFT percentiles come from HDR-style histograms. In rate mode
+they are measured from each request's scheduled send time rather than the
+moment it actually went out, so any lag in the generator itself counts
+against the tail instead of hiding it (coordinated omission); the time from
+actual send is reported separately as service time. The encoded histograms
+are included in the report so runs can be merged.
+
+Usage:
+    python -m src.load_test --dataset cases.jsonl --qps 1,2,4,8,16 --duration 60 --report saturation.json
+    python -m src.load_test --category mathematics --concurrency 32 --duration 3600 --interval 60
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .histogram import LatencyHistogram
+from .metrics import PerformanceMonitor
+
+ARRIVALS = ("uniform", "poisson")
+
+class LoadGenerator:
+    """Drive a client with a prompt mix at a fixed rate or concurrency."""
+
+    def __init__(
+        self,
+        client,
+        prompts: Sequence[str],
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        stream: bool = True,
+        max_in_flight: int = 1000,
+        seed: int = 0
+    ):
+        """Initialize the generator.
+
+        Args:
+            client: An LLMClient (or compatible) instance, opened by the caller
+            prompts: Prompts to cycle through
+            max_tokens: Maximum tokens per completion
+            temperature: Sampling temperature
+            stream: Stream responses to measure time to first token
+            max_in_flight: Requests allowed in flight in rate mode; arrivals
+                beyond it are counted as dropped (the client is saturated)
+            seed: Seed for Poisson arrivals and prompt order
+        """
+        if not prompts:
+            raise ValueError("At least one prompt is required")
+        self.client = client
+        self.prompts = list(prompts)
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.stream = stream
+        self.max_in_flight = max_in_flight
+        self._rng = random.Random(seed)
+        self._rng.shuffle(self.prompts)
+        self._next_prompt = itertools.cycle(self.prompts)
+
+    async def _one(self, monitor: PerformanceMonitor, histograms: Dict[str, LatencyHistogram], scheduled: Optional[float] = None):
+        """Send one request; latencies count from `scheduled` (perf_counter) if given."""
+        prompt = next(self._next_prompt)
+        start = time.perf_counter()
+        lag_ms = (start - scheduled) * 1000 if scheduled is not None else 0.0
+        metric: Dict[str, Any] = {}
+        try:
+            if self.stream:
+                response = await self.client.generate_stream(prompt, self.max_tokens, self.temperature)
+            else:
+                response = await self.client.generate(prompt, self.max_tokens, self.temperature)
+            completion_tokens = response.get("usage", {}).get("completion_tokens", 0)
+            service_ms = (time.perf_counter() - start) * 1000
+            metric.update({
+                "latency_ms": service_ms + lag_ms,
+                "service_time_ms": service_ms,
+                "completion_tokens": completion_tokens,
+                "tokens_per_second": completion_tokens / (service_ms / 1000) if service_ms else 0.0,
+                "error": 0
+            })
+            histograms["latency_ms"].record(service_ms + lag_ms)
+            histograms["service_time_ms"].record(service_ms)
+            if response.get("ttft_ms") is not None:
+                metric["ttft_ms"] = response["ttft_ms"] + lag_ms
+                histograms["ttft_ms"].record(response["ttft_ms"] + lag_ms)
+        except Exception as e:
+            metric.update({
+                "latency_ms": (time.perf_counter() - start) * 1000,
+                "error": 1,
+                "error_type": type(e).__name__
+            })
+        monitor.add_metric(metric)
+
+    async def run_rate(
+        self,
+        qps: float,
+        duration: float,
+        arrival: str = "uniform",
+        on_interval: Optional[Callable[[Dict[str, Any]], None]] = None,
+        interval: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Send requests open-loop at `qps` for `duration` seconds."""
+        if arrival not in ARRIVALS:
+            raise ValueError(f"Unknown arrival process '{arrival}', expected one of {ARRIVALS}")
+        monitor = PerformanceMonitor(window_size=timedelta(seconds=duration + 3600))
+        histograms = _new_histograms()
+        tasks = set()
+        sent = dropped = 0
+        start = time.perf_counter()
+        next_send = 0.0
+        arrivals = 0
+        reporter = self._start_reporter(monitor, on_interval, interval)
+        try:
+            while next_send < duration:
+                delay = start + next_send - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if len(tasks) >= self.max_in_flight:
+                    dropped += 1
+                else:
+                    task = asyncio.ensure_future(self._one(monitor, histograms, start + next_send))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    sent += 1
+                arrivals += 1
+                # Uniform arrivals are computed from the count so rounding errors do not accumulate
+                next_send = next_send + self._rng.expovariate(qps) if arrival == "poisson" else arrivals / qps
+            send_window = time.perf_counter() - start
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            self._stop_reporter(reporter)
+        summary = summarize_window(monitor, time.perf_counter() - start, histograms)
+        summary.update({
+            "mode": "rate", "offered_qps": qps, "sent": sent, "dropped": dropped,
+            "send_qps": sent / send_window if send_window else 0.0, "arrival": arrival
+        })
+        return summary
+
+    async def run_concurrency(
+        self,
+        concurrency: int,
+        duration: float,
+        on_interval: Optional[Callable[[Dict[str, Any]], None]] = None,
+        interval: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Keep `concurrency` requests in flight (closed-loop) for `duration` seconds."""
+        monitor = PerformanceMonitor(window_size=timedelta(seconds=duration + 3600))
+        histograms = _new_histograms()
+        start = time.perf_counter()
+
+        async def worker():
+            while time.perf_counter() - start < duration:
+                await self._one(monitor, histograms)
+
+        reporter = self._start_reporter(monitor, on_interval, interval)
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            self._stop_reporter(reporter)
+        summary = summarize_window(monitor, time.perf_counter() - start, histograms)
+        summary.update({"mode": "concurrency", "concurrency": concurrency})
+        return summary
+
+    def _start_reporter(self, monitor, on_interval, interval) -> Optional[asyncio.Task]:
+        """Report the last `interval` seconds periodically (soak runs)."""
+        if on_interval is None or not interval:
+            return None
+
+        async def report():
+            window = PerformanceMonitor(window_size=timedelta(seconds=interval))
+            seen = 0
+            while True:
+                await asyncio.sleep(interval)
+                # Copy new samples into a window of the reporting interval
+                for metric in list(monitor.metrics)[seen:]:
+                    window.add_metric(dict(metric), metric["timestamp"])
+                seen = len(monitor.metrics)
+                on_interval(summarize_window(window, interval))
+
+        return asyncio.ensure_future(report())
+
+    @staticmethod
+    def _stop_reporter(reporter: Optional[asyncio.Task]):
+        if reporter is not None:
+            reporter.cancel()
+
+def _new_histograms() -> Dict[str, LatencyHistogram]:
+    return {name: LatencyHistogram() for name in ("latency_ms", "service_time_ms", "ttft_ms")}
+
+def summarize_window(
+    monitor: PerformanceMonitor,
+    elapsed: float,
+    histograms: Optional[Dict[str, LatencyHistogram]] = None
+) -> Dict[str, Any]:
+    """Throughput, error rate and latency/TTFT percentiles of a monitor's window.
+    
+    Percentiles come from `histograms` when given (whole run), else from the
+    samples in the monitor's window.
+    """
+    stats = monitor.get_current_stats()
+    if not stats:
+        return {"requests": 0, "completed": 0, "achieved_qps": 0.0, "error_rate": 0.0, "errors": {}}
+    metrics = stats["metrics"]
+    errors: Dict[str, int] = {}
+    for metric in monitor.metrics:
+        if metric.get("error"):
+            errors[metric["error_type"]] = errors.get(metric["error_type"], 0) + 1
+    requests = stats["sample_count"]
+    completed = requests - sum(errors.values())
+    summary = {
+        "requests": requests,
+        "completed": completed,
+        "achieved_qps": completed / elapsed if elapsed else 0.0,
+        "error_rate": sum(errors.values()) / requests,
+        "errors": errors,
+        "elapsed_s": elapsed
+    }
+    for key in ("latency_ms", "service_time_ms", "ttft_ms", "tokens_per_second"):
+        if histograms and histograms.get(key):
+            summary[key] = histograms[key].summary()
+        elif key in metrics:
+            summary[key] = {p: metrics[key][p] for p in ("mean", "p50", "p95", "p99", "max")}
+    if histograms:
+        summary["histograms"] = {key: h.encode() for key, h in histograms.items() if h}
+    if "completion_tokens" in metrics:
+        summary["output_tokens_per_second"] = metrics["completion_tokens"]["mean"] * metrics["completion_tokens"]["count"] / elapsed
+    return summary
+
+async def saturation_curve(
+    generator: LoadGenerator,
+    rates: Sequence[float],
+    duration: float,
+    arrival: str = "uniform"
+) -> List[Dict[str, Any]]:
+    """Run each rate in turn; latency against offered load shows where the server saturates."""
+    return [await generator.run_rate(qps, duration, arrival) for qps in rates]
+
+def format_curve(steps: Sequence[Dict[str, Any]]) -> str:
+    """A plain-text table of a saturation curve."""
+    lines = [f"{'offered':>8} {'achieved':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ttft p50':>9} {'errors':>7}"]
+    for step in steps:
+        latency = step.get("latency_ms", {})
+        ttft = step.get("ttft_ms", {})
+        offered = step.get("offered_qps", step.get("concurrency"))
+        lines.append(
+            f"{offered:>8} {step['achieved_qps']:>9.2f} {latency.get('p50', 0):>9.1f} {latency.get('p95', 0):>9.1f} "
+            f"{latency.get('p99', 0):>9.1f} {ttft.get('p50', 0):>9.1f} {step['error_rate']:>7.1%}"
+        )
+    return "\n".join(lines)
+
+async def _run_cli(args) -> List[Dict[str, Any]]:
+    from .evaluation_engine import build_prompt, load_cases_from_db, load_cases_from_jsonl
+    from .llm_client import LLMClient
+
+    if args.dataset:
+        cases = load_cases_from_jsonl(args.dataset)
+    else:
+        from .database import get_session
+
+        session = get_session()
+        try:
+            cases = load_cases_from_db(session, args.suite, args.category, args.limit)
+        finally:
+            session.close()
+    prompts = [build_prompt(case.input_data) for case in cases]
+
+    def print_interval(summary: Dict[str, Any]):
+        print(json.dumps({k: summary[k] for k in ("requests", "achieved_qps", "error_rate", "latency_ms") if k in summary}))
+
+    steps = []
+    async with LLMClient(max_connections=args.max_in_flight) as client:
+        generator = LoadGenerator(
+            client, prompts, max_tokens=args.max_tokens, stream=not args.no_stream, max_in_flight=args.max_in_flight
+        )
+        for qps in args.qps or []:
+            steps.append(await generator.run_rate(qps, args.duration, args.arrival, print_interval, args.interval))
+        for concurrency in args.concurrency or []:
+            steps.append(await generator.run_concurrency(concurrency, args.duration, print_interval, args.interval))
+    return steps
+
+def _numbers(text: str, kind=float) -> List[Any]:
+    return [kind(value) for value in text.split(",") if value.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a model endpoint with the evaluation prompt mix")
+    parser.add_argument("--dataset", help="JSONL dataset to take prompts from instead of the database")
+    parser.add_argument("--suite", action="append", help="Suite name to include (repeatable)")
+    parser.add_argument("--category", action="append", help="Suite category to include (repeatable)")
+    parser.add_argument("--limit", type=int, help="Maximum number of prompts to load")
+    parser.add_argument("--qps", type=_numbers, help="Comma separated request rates to run in turn")
+    parser.add_argument("--concurrency", type=lambda text: _numbers(text, int), help="Comma separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds per rate or concurrency level")
+    parser.add_argument("--arrival", choices=ARRIVALS, default="uniform", help="Request arrival process in rate mode")
+    parser.add_argument("--interval", type=float, help="Print a summary every N seconds (soak runs)")
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Requests in flight before arrivals are dropped")
+    parser.add_argument("--no-stream", action="store_true", help="Use non-streaming requests (no TTFT)")
+    parser.add_argument("--report", default="load_test_report.json", help="Output file for the results")
+    args = parser.parse_args()
+    if not args.qps and not args.concurrency:
+        parser.error("give --qps and/or --concurrency")
+
+    steps = asyncio.run(_run_cli(args))
+    with open(args.report, "w") as f:
+        json.dump({"steps": steps}, f, indent=2)
+    print(format_curve(steps))
+
+if __name__ == "__main__":
+    main()
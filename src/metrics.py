@@ -1,11 +1,15 @@
 """Metrics collection and analysis for LLM evaluation."""
 
 import json
-from typing import Dict, List, Any, Optional
+import math
+from collections import deque
+from typing import Deque, Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import statistics
 from dataclasses import dataclass
 
+from .histogram import LatencyHistogram
+
 @dataclass
 class ResponseMetrics:
     """Container for response-level metrics."""
@@ -14,6 +18,8 @@ class ResponseMetrics:
     token_count: int
     completion_status: str
     error_type: Optional[str] = None
+    tokens_per_second: Optional[float] = None
+    cost: Optional[float] = None
 
 @dataclass
 class QualityMetrics:
@@ -31,10 +37,22 @@ class MetricsCollector:
         """Initialize the metrics collector."""
         self.responses: List[ResponseMetrics] = []
         self.quality_scores: List[QualityMetrics] = []
+        self.response_time_histogram = LatencyHistogram()
+        
+    def add_response_metrics(self, metrics: ResponseMetrics, expected_interval_ms: Optional[float] = None):
+        """Add response metrics to the collection.
         
-    def add_response_metrics(self, metrics: ResponseMetrics):
-        """Add response metrics to the collection."""
+        Args:
+            metrics: Metrics of one response
+            expected_interval_ms: Interval at which requests were meant to be sent,
+                if the driver runs at a fixed rate; corrects the latency histogram
+                for coordinated omission
+        """
         self.responses.append(metrics)
+        if expected_interval_ms:
+            self.response_time_histogram.record_corrected(metrics.response_time, expected_interval_ms)
+        else:
+            self.response_time_histogram.record(metrics.response_time)
         
     def add_quality_metrics(self, metrics: QualityMetrics):
         """Add quality metrics to the collection."""
@@ -43,7 +61,8 @@ class MetricsCollector:
     def get_summary_statistics(self) -> Dict[str, Any]:
         """Calculate summary statistics for collected metrics."""
         if not self.responses:
-            return {}
+            # Quality scores can come from judging stored responses without timing data
+            return {"quality": self._calculate_quality_metrics()} if self.quality_scores else {}
             
         response_times = [r.response_time for r in self.responses]
         token_counts = [r.token_count for r in self.responses]
@@ -62,10 +81,26 @@ class MetricsCollector:
                 "min": min(token_counts),
                 "max": max(token_counts)
             },
+            "response_time_histogram": {
+                **self.response_time_histogram.summary(),
+                "encoded": self.response_time_histogram.encode()
+            },
             "completion_rate": self._calculate_completion_rate(),
             "error_rate": self._calculate_error_rate()
         }
         
+        throughputs = [r.tokens_per_second for r in self.responses if r.tokens_per_second is not None]
+        if throughputs:
+            stats["tokens_per_second"] = {
+                "mean": statistics.mean(throughputs),
+                "median": statistics.median(throughputs),
+                "min": min(throughputs),
+                "max": max(throughputs)
+            }
+        costs = [r.cost for r in self.responses if r.cost is not None]
+        if costs:
+            stats["total_cost"] = sum(costs)
+        
         if self.quality_scores:
             stats["quality"] = self._calculate_quality_metrics()
             
@@ -108,32 +143,56 @@ class PerformanceMonitor:
     def __init__(self, window_size: timedelta = timedelta(hours=1)):
         """Initialize the performance monitor."""
         self.window_size = window_size
-        self.metrics: List[Dict[str, Any]] = []
+        # Metrics arrive in time order, so expired ones are always at the left end
+        self.metrics: Deque[Dict[str, Any]] = deque()
         
-    def add_metric(self, metric: Dict[str, Any]):
+    def add_metric(self, metric: Dict[str, Any], timestamp: Optional[datetime] = None):
         """Add a metric data point with timestamp."""
-        metric["timestamp"] = datetime.utcnow()
+        metric["timestamp"] = timestamp or datetime.utcnow()
         self.metrics.append(metric)
         self._prune_old_metrics()
         
     def _prune_old_metrics(self):
         """Remove metrics outside the window size."""
         cutoff = datetime.utcnow() - self.window_size
-        self.metrics = [m for m in self.metrics if m["timestamp"] > cutoff]
+        while self.metrics and self.metrics[0]["timestamp"] <= cutoff:
+            self.metrics.popleft()
         
     def get_current_stats(self) -> Dict[str, Any]:
         """Get statistics for the current window."""
+        self._prune_old_metrics()
         if not self.metrics:
             return {}
             
         return {
-            "window_start": min(m["timestamp"] for m in self.metrics),
-            "window_end": max(m["timestamp"] for m in self.metrics),
+            "window_start": self.metrics[0]["timestamp"],
+            "window_end": self.metrics[-1]["timestamp"],
             "sample_count": len(self.metrics),
             "metrics": self._calculate_window_stats()
         }
         
     def _calculate_window_stats(self) -> Dict[str, Any]:
-        """Calculate statistics for metrics in the current window."""
-        # Implementation depends on specific metrics being tracked
-        return {}
\ No newline at end of file
+        """Calculate statistics for every numeric field of the metrics in the current window."""
+        values: Dict[str, List[float]] = {}
+        for metric in self.metrics:
+            for key, value in metric.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    values.setdefault(key, []).append(value)
+                    
+        stats = {}
+        for key, series in values.items():
+            series.sort()
+            stats[key] = {
+                "count": len(series),
+                "mean": statistics.mean(series),
+                "p50": _nearest_rank(series, 50),
+                "p95": _nearest_rank(series, 95),
+                "p99": _nearest_rank(series, 99),
+                "min": series[0],
+                "max": series[-1]
+            }
+        return stats
+
+def _nearest_rank(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted, non-empty list."""
+    return ordered[max(0, math.ceil(len(ordered) * pct / 100) - 1)]
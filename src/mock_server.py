@@ -0,0 +1,401 @@
+"""Local stand-in for an OpenAI-compatible model server.
+
+Serves ``/v1/chat/completions`` (plain and streaming), ``/v1/completions``
+(including vLLM-style lists of prompts), ``/v1/embeddings`` and ``/v1/models``
+from the standard library, with configurable latency distributions, token
+rates and error injection, so the framework itself can be benchmarked and
+run in CI without a network.
+Responses are deterministic: the same prompt always gets the same text and
+the same embedding.
+
+Record/replay: with ``--upstream URL --record FILE`` every request is proxied
+to a real server and the request/response pair appended to a JSONL file;
+``--replay FILE`` serves those recorded responses again (optionally with
+their recorded latency), so a real run can be reproduced offline.
+
+Usage:
+    python -m src.mock_server --port 8000 --latency-ms 200 --latency-dist lognormal --error-rate 0.01
+    python -m src.mock_server --upstream http://gpu0:8000/ --record traffic.jsonl
+    python -m src.mock_server --replay traffic.jsonl --replay-latency
+    API_BASE_URL=http://127.0.0.1:8000/ API_KEY=mock MODEL_NAME=mock pytest tests/
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from .result_stream import ResultStreamWriter, iter_results
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+# Words the synthetic completions are drawn from
+_VOCABULARY = (
+    "the model answer is result value step first then because therefore so we find "
+    "function return input output list number total each case test check true false"
+).split()
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server."""
+
+    latency_ms: float = 0.0  # mean time to first token
+    latency_dist: str = "fixed"  # one of LATENCY_DISTRIBUTIONS
+    latency_sigma: float = 0.5  # shape of the lognormal distribution
+    tokens_per_second: Optional[float] = None  # generation speed; instant if None
+    completion_tokens: int = 16  # length of synthetic completions
+    embedding_dim: int = 64
+    error_rate: float = 0.0  # fraction of requests answered with error_status
+    error_status: int = 503
+    seed: int = 0
+    responses: Dict[str, str] = field(default_factory=dict)  # fixed answers by prompt
+
+def request_key(path: str, body: Dict[str, Any]) -> str:
+    """Key identifying a request for record/replay (streaming does not change the key)."""
+    canonical = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+    data = json.dumps({"path": path.strip("/"), "body": canonical}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def _prompt_of(body: Dict[str, Any]) -> str:
+    if "messages" in body:
+        return body["messages"][-1].get("content") or ""
+    prompt = body.get("prompt", "")
+    return prompt if isinstance(prompt, str) else " ".join(prompt)
+
+def _seed_of(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+def synthetic_completion(prompt: str, tokens: int) -> str:
+    """Deterministic pseudo-text for a prompt."""
+    rng = random.Random(_seed_of(prompt))
+    return " ".join(rng.choice(_VOCABULARY) for _ in range(tokens))
+
+def synthetic_embedding(text: str, dim: int) -> List[float]:
+    """Deterministic unit vector for a text."""
+    rng = random.Random(_seed_of(text))
+    vector = [rng.gauss(0, 1) for _ in range(dim)]
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+class MockServer:
+    """Threaded mock model server; use as a context manager or via start()/stop()."""
+
+    def __init__(
+        self,
+        config: Optional[MockConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        upstream: Optional[str] = None,
+        record_path: Optional[str] = None,
+        replay_path: Optional[str] = None,
+        replay_latency: bool = False
+    ):
+        """Initialize the server.
+
+        Args:
+            config: Latency, error and response behaviour
+            host: Interface to bind
+            port: Port to bind; 0 picks a free port
+            upstream: Real server to proxy to (record mode)
+            record_path: JSONL file recorded request/response pairs are appended to
+            replay_path: JSONL file of recorded pairs to serve instead of synthetic responses
+            replay_latency: Sleep for each recorded response's original latency
+        """
+        self.config = config or MockConfig()
+        self.upstream = upstream.rstrip("/") + "/" if upstream else None
+        self.replay_latency = replay_latency
+        self.request_count = 0
+        self.error_count = 0
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._recorder = ResultStreamWriter(record_path, append=True) if record_path else None
+        self._replay: Optional[Dict[str, Dict[str, Any]]] = None
+        if replay_path:
+            self._replay = {entry["key"]: entry for entry in iter_results(replay_path)}
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._serving = False
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "MockServer":
+        """Serve in a background thread."""
+        self._serving = True
+        threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def serve_forever(self):
+        """Serve in the calling thread until stopped or interrupted."""
+        self._serving = True
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """Stop serving and close the recording."""
+        if self._serving:
+            self._httpd.shutdown()
+            self._serving = False
+        self._httpd.server_close()
+        if self._recorder is not None:
+            self._recorder.close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def sample_latency(self) -> float:
+        """Seconds until the first token, drawn from the configured distribution."""
+        mean = self.config.latency_ms / 1000
+        if mean <= 0:
+            return 0.0
+        dist = self.config.latency_dist
+        with self._lock:
+            if dist == "uniform":
+                return self._rng.uniform(0.5 * mean, 1.5 * mean)
+            if dist == "exponential":
+                return self._rng.expovariate(1 / mean)
+            if dist == "lognormal":
+                sigma = self.config.latency_sigma
+                return self._rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        return mean
+
+    def inject_error(self) -> bool:
+        with self._lock:
+            failed = self._rng.random() < self.config.error_rate
+            self.error_count += failed
+            return failed
+
+    def handle(self, path: str, body: Dict[str, Any], headers: Dict[str, str]) -> Tuple[int, Dict[str, Any], float]:
+        """Return (status, response body, seconds to wait before answering)."""
+        with self._lock:
+            self.request_count += 1
+        key = request_key(path, body)
+        if self._replay is not None:
+            entry = self._replay.get(key)
+            if entry is None:
+                return 404, {"error": {"message": "request not found in replay file", "key": key}}, 0.0
+            delay = entry.get("latency_ms", 0) / 1000 if self.replay_latency else 0.0
+            return entry["status"], entry["response"], delay
+        if self.upstream:
+            return self._proxy(path, body, headers, key)
+        if self.inject_error():
+            return self.config.error_status, {"error": {"message": "injected error", "type": "mock_error"}}, 0.0
+        return 200, self._synthetic(path, body), self.sample_latency()
+
+    def _proxy(self, path: str, body: Dict[str, Any], headers: Dict[str, str], key: str) -> Tuple[int, Dict[str, Any], float]:
+        import httpx
+
+        upstream_body = {k: v for k, v in body.items() if k not in ("stream", "stream_options")}
+        start = time.perf_counter()
+        response = httpx.post(
+            f"{self.upstream}{path.lstrip('/')}",
+            json=upstream_body,
+            headers={k: v for k, v in headers.items() if k.lower() == "authorization"},
+            timeout=None
+        )
+        latency_ms = (time.perf_counter() - start) * 1000
+        try:
+            data = response.json()
+        except ValueError:
+            data = {"error": {"message": response.text}}
+        if self._recorder is not None:
+            with self._lock:
+                self._recorder.write({
+                    "key": key, "path": path, "request": upstream_body,
+                    "status": response.status_code, "response": data, "latency_ms": latency_ms
+                })
+        return response.status_code, data, 0.0
+
+    def _synthetic(self, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        model = body.get("model", "mock")
+        if path.endswith("embeddings"):
+            inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+            return {
+                "object": "list",
+                "model": model,
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": synthetic_embedding(text, self.config.embedding_dim)}
+                    for i, text in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": sum(len(t.split()) for t in inputs), "total_tokens": sum(len(t.split()) for t in inputs)}
+            }
+
+        chat = path.endswith("chat/completions")
+        # A list of prompts on /v1/completions is a batch: choice i * n + j is sample j of prompt i
+        prompts = body["prompt"] if not chat and isinstance(body.get("prompt"), list) else [_prompt_of(body)]
+        max_tokens = body.get("max_tokens") or self.config.completion_tokens
+        n = body.get("n") or 1
+        choices = []
+        completion_tokens = 0
+        for position, prompt in enumerate(prompts):
+            for sample in range(n):
+                index = position * n + sample
+                text = self.config.responses.get(prompt)
+                if text is None:
+                    text = synthetic_completion(f"{prompt}\x00{sample}" if sample else prompt, min(self.config.completion_tokens, max_tokens))
+                completion_tokens += len(text.split())
+                if chat:
+                    choices.append({"index": index, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"})
+                else:
+                    choices.append({"index": index, "text": text, "finish_reason": "stop"})
+        prompt_tokens = sum(len((m.get("content") or "").split()) for m in body.get("messages", [])) or sum(
+            len(prompt.split()) for prompt in prompts
+        )
+        return {
+            "id": f"mock-{request_key(path, body)[:12]}",
+            "object": "chat.completion" if chat else "text_completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": choices,
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+
+    def token_delay(self) -> float:
+        """Seconds between streamed tokens."""
+        return 1 / self.config.tokens_per_second if self.config.tokens_per_second else 0.0
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are separate writes; without this, Nagle's algorithm
+        # and delayed ACKs add ~40 ms to every response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, data: Dict[str, Any]):
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def do_POST(self):
+        mock: MockServer = self.server.mock
+        path = self.path.split("?")[0].lstrip("/")
+        if not any(path.endswith(p) for p in ("chat/completions", "completions", "embeddings")):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+
+        status, data, delay = mock.handle(path, body, dict(self.headers))
+        if status == 200 and body.get("stream") and "choices" in data:
+            self._stream(mock, data, delay)
+            return
+        total = delay
+        if status == 200 and "choices" in data and mock.token_delay():
+            total += mock.token_delay() * data.get("usage", {}).get("completion_tokens", 0)
+        time.sleep(total)
+        self._send_json(status, data)
+
+    def _stream(self, mock: MockServer, data: Dict[str, Any], first_token_delay: float):
+        """Send the response as server-sent events, one word per chunk."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        time.sleep(first_token_delay)
+        chat = data.get("object") == "chat.completion"
+        for choice in data["choices"]:
+            text = choice["message"]["content"] if chat else choice["text"]
+            words = text.split(" ")
+            for i, word in enumerate(words):
+                piece = word if i == 0 else " " + word
+                delta = {"delta": {"content": piece}} if chat else {"text": piece}
+                chunk = {"id": data.get("id"), "model": data.get("model"),
+                         "choices": [{"index": choice.get("index", 0), **delta, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if i < len(words) - 1:
+                    time.sleep(mock.token_delay())
+            final = {"id": data.get("id"), "model": data.get("model"),
+                     "choices": [{"index": choice.get("index", 0), **({"delta": {}} if chat else {"text": ""}),
+                                  "finish_reason": choice.get("finish_reason", "stop")}],
+                     "usage": data.get("usage")}
+            self.wfile.write(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local mock of an OpenAI-compatible model API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean time to first token")
+    parser.add_argument("--latency-dist", choices=LATENCY_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape parameter")
+    parser.add_argument("--tokens-per-second", type=float, help="Generation speed (instant if unset)")
+    parser.add_argument("--completion-tokens", type=int, default=16, help="Length of synthetic completions")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--responses", help="JSON file mapping prompts to fixed answers")
+    parser.add_argument("--upstream", help="Real server to proxy to")
+    parser.add_argument("--record", help="Append proxied request/response pairs to this JSONL file")
+    parser.add_argument("--replay", help="Serve recorded responses from this JSONL file")
+    parser.add_argument("--replay-latency", action="store_true", help="Reproduce recorded latencies")
+    args = parser.parse_args()
+
+    responses = {}
+    if args.responses:
+        with open(args.responses) as f:
+            responses = json.load(f)
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+        responses=responses
+    )
+    server = MockServer(
+        config, args.host, args.port,
+        upstream=args.upstream, record_path=args.record,
+        replay_path=args.replay, replay_latency=args.replay_latency
+    )
+    print(f"Mock model server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""Run the test suite across worker processes, longest expected tests first.
+
+Tests are ordered by their historical duration (from a previous
+``test_metrics.json`` and, optionally, the ``test_results`` table) and placed
+on a shared queue. Each worker repeatedly takes the longest remaining test
+and runs it in its own pytest process, so the short tests fill in the tail
+instead of one long test running alone at the end. Each worker process
+streams its results to its own JSONL file, which the controller appends to
+the run's result stream before writing a single ``test_metrics.json``.
+
+With ``--checkpoint``, ``--resume`` or ``--reuse-unchanged`` the controller
+creates (or resumes) one evaluation run and the workers record their results
+under it; only the controller sets the run's final status and metrics.
+
+Usage:
+    python -m src.parallel_runner -n 4 tests/
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .result_stream import ResultStreamWriter, iter_results
+from .test_aggregator import write_metrics_report
+
+DEFAULT_DURATION = 5.0  # seconds assumed for tests with no history
+
+def load_historical_durations(
+    metrics_path: str = "test_metrics.json",
+    db_url: Optional[str] = None
+) -> Dict[str, float]:
+    """Load per-test durations from a previous metrics file and the test_results table."""
+    durations: Dict[str, List[float]] = {}
+
+    if os.path.exists(metrics_path):
+        with open(metrics_path) as f:
+            previous = json.load(f)
+        for result in previous.get("results", []):
+            if result.get("duration") is not None:
+                durations.setdefault(result["test_name"], []).append(result["duration"])
+
+    if db_url:
+        from sqlalchemy import create_engine, text
+
+        engine = create_engine(db_url)
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT test_name, execution_time FROM test_results
+                WHERE execution_time IS NOT NULL
+            """))
+            for test_name, execution_time in rows:
+                durations.setdefault(test_name, []).append(float(execution_time))
+
+    return {name: statistics.median(values) for name, values in durations.items()}
+
+def order_by_expected_duration(
+    node_ids: List[str],
+    durations: Dict[str, float]
+) -> List[Tuple[str, float]]:
+    """Sort tests longest-expected-first; unknown tests are assumed to be slow."""
+    default = max(durations.values(), default=DEFAULT_DURATION)
+    expected = [(node_id, durations.get(node_id, default)) for node_id in node_ids]
+    return sorted(expected, key=lambda item: item[1], reverse=True)
+
+class CollectionError(RuntimeError):
+    """pytest failed to collect the tests (import error, bad -k expression, ...)."""
+
+    def __init__(self, returncode: int, output: str):
+        super().__init__(f"Test collection failed with exit code {returncode}")
+        self.returncode = returncode
+        self.output = output
+
+def collect_tests(pytest_args: List[str]) -> List[str]:
+    """Collect test node ids without running them; raises CollectionError if pytest fails."""
+    proc = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode not in (0, 5):  # 5: no tests collected
+        raise CollectionError(proc.returncode, proc.stdout + proc.stderr)
+    return [line.strip() for line in proc.stdout.splitlines() if "::" in line]
+
+def worker_arguments(pytest_args: List[str], node_ids: List[str]) -> List[str]:
+    """The pytest arguments forwarded to workers: everything except test paths and node ids.
+
+    Options keep their values (``-k "not slow"``, ``-m smoke``); the workers
+    are given their tests as node ids instead of the original paths. Pass
+    path-valued options as ``--option=path`` so they are not taken for test paths.
+    """
+    collected = set(node_ids)
+    return [
+        arg for arg in pytest_args
+        if arg.startswith("-") or not (arg in collected or os.path.exists(arg.split("::")[0]))
+    ]
+
+class ParallelRunner:
+    """Schedule tests onto worker processes and merge their results."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        pytest_args: Optional[List[str]] = None,
+        batch_seconds: float = 0.0,
+        stream_path: str = "test_metrics.jsonl",
+        checkpoint_run_id: Optional[str] = None
+    ):
+        """Initialize the runner.
+
+        Args:
+            workers: Number of concurrent pytest worker processes
+            pytest_args: Extra arguments passed to every worker
+            batch_seconds: Group short tests into one worker process until their
+                expected durations add up to this many seconds
+            stream_path: Result stream that merged worker results are appended to
+            checkpoint_run_id: Evaluation run the workers record their results under
+        """
+        self.workers = workers
+        self.pytest_args = pytest_args or []
+        self.batch_seconds = batch_seconds
+        self.stream_path = stream_path
+        self.checkpoint_run_id = checkpoint_run_id
+        self.exit_codes: List[int] = []
+        self._queue: Deque[Tuple[str, float]] = deque()
+        self._lock = threading.Lock()
+
+    def _next_batch(self) -> List[str]:
+        """Take the longest remaining test, plus more if the batch is still short."""
+        with self._lock:
+            if not self._queue:
+                return []
+            node_id, expected = self._queue.popleft()
+            batch = [node_id]
+            while self._queue and expected + self._queue[0][1] <= self.batch_seconds:
+                node_id, duration = self._queue.popleft()
+                batch.append(node_id)
+                expected += duration
+            return batch
+
+    def _worker(self, worker_id: int, tmp_dir: str, stream: ResultStreamWriter):
+        """Run batches until the queue is empty."""
+        run = 0
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            run += 1
+            prefix = os.path.join(tmp_dir, f"worker-{worker_id}-{run}")
+            env = dict(
+                os.environ,
+                TEST_RESULTS_STREAM=prefix + ".jsonl",
+                TEST_METRICS_PATH=prefix + ".json",
+                TEST_RESULTS_COMPRESS="0"
+            )
+            if self.checkpoint_run_id:
+                env["CHECKPOINT_RUN_ID"] = self.checkpoint_run_id
+            proc = subprocess.run(
+                [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", *self.pytest_args, *batch],
+                env=env
+            )
+
+            with self._lock:
+                self.exit_codes.append(proc.returncode)
+                if os.path.exists(prefix + ".jsonl"):
+                    for result in iter_results(prefix + ".jsonl"):
+                        stream.write(result)
+
+    def run(
+        self,
+        ordered_tests: List[Tuple[str, float]],
+        previous_results: Optional[List[Dict[str, Any]]] = None
+    ) -> int:
+        """Run the ordered tests, streaming merged results; returns the result count.
+
+        `previous_results` (from the earlier part of a resumed run) are written
+        to the stream first, so the report covers the whole run.
+        """
+        self._queue = deque(ordered_tests)
+        with tempfile.TemporaryDirectory() as tmp_dir, ResultStreamWriter(self.stream_path) as stream:
+            for result in previous_results or []:
+                stream.write(result)
+            threads = [
+                threading.Thread(target=self._worker, args=(i, tmp_dir, stream), daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return stream.count
+
+    @property
+    def exit_code(self) -> int:
+        """Combined pytest exit code (0 ok, 1 failures, >1 errors)."""
+        codes = [code for code in self.exit_codes if code != 5]  # 5: no tests collected
+        return max(codes, default=0)
+
+def open_checkpoint(resume: Optional[str], reuse: bool):
+    """Start a new evaluation run, or reopen `resume`, for the workers to record into."""
+    from .checkpoint import RunCheckpoint
+    from .config import settings
+    from .database import get_session
+
+    if resume:
+        return RunCheckpoint.resume(get_session(), resume)
+    return RunCheckpoint.start(
+        get_session(),
+        {"model_name": settings.model_name, "mode": "reuse_unchanged" if reuse else "pytest"}
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the evaluation tests in parallel")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2, help="Number of worker processes")
+    parser.add_argument("--metrics", default="test_metrics.json", help="Metrics file to read durations from and write results to")
+    parser.add_argument("--durations-db", help="Also read durations from the test_results table at this database URL")
+    parser.add_argument("--batch-seconds", type=float, default=0.0, help="Batch short tests up to this expected duration")
+    parser.add_argument("--stream", default="test_metrics.jsonl", help="Merged result stream (.gz for gzip)")
+    parser.add_argument("--checkpoint", action="store_true", help="Record every result in one resumable evaluation run")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Resume a checkpointed run: only tests without a recorded result are run")
+    parser.add_argument("--retry-failed", action="store_true", help="With --resume, run the tests that failed in the earlier part again")
+    args, pytest_args = parser.parse_known_args()
+    reuse = "--reuse-unchanged" in pytest_args
+
+    try:
+        node_ids = collect_tests(pytest_args)
+    except CollectionError as e:
+        print(e.output, file=sys.stderr)
+        print(e, file=sys.stderr)
+        sys.exit(e.returncode)
+    # Workers record into this one run instead of each starting their own
+    checkpoint = open_checkpoint(args.resume, reuse) if args.checkpoint or args.resume or reuse else None
+    previous: List[Dict[str, Any]] = []
+    pending = node_ids
+    if args.resume:
+        done = checkpoint.completed(retry_failed=args.retry_failed)
+        previous = [done[node_id] for node_id in node_ids if node_id in done]
+        pending = [node_id for node_id in node_ids if node_id not in done]
+
+    durations = load_historical_durations(args.metrics, args.durations_db)
+    ordered = order_by_expected_duration(pending, durations)
+
+    runner = ParallelRunner(
+        args.workers, worker_arguments(pytest_args, node_ids), args.batch_seconds, args.stream,
+        checkpoint.run_id if checkpoint is not None else None
+    )
+    runner.run(ordered, previous)
+
+    model_name = os.getenv("MODEL_NAME", "unknown_model")
+    output = write_metrics_report(args.stream, args.metrics, model_name)
+    if checkpoint is not None:
+        checkpoint.finish(output["status"], {"metrics": output["metrics"]})
+        checkpoint.close()
+        print(f"Evaluation run {checkpoint.run_id} (resume with --resume)")
+
+    print(f"Metrics for {model_name}: {json.dumps(output['metrics'], indent=2)}")
+    print(f"Run status: {output['status']}")
+    sys.exit(runner.exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Few-shot prompt templates and prefix-cache-friendly request ordering.
+
+Servers with automatic prefix caching (vLLM, SGLang, llama.cpp's prompt
+cache) reuse the KV cache of a prompt prefix they have already processed, so
+requests that share a long few-shot prefix skip most of their prefill - as
+long as they arrive before the prefix is evicted. This module provides:
+
+- ``FewShotTemplate``: builds the instruction-plus-examples prefix once and
+  renders each query by appending to it, so every prompt carries a
+  byte-identical prefix
+- ``order_by_prefix``: sorts requests so those sharing a prefix are sent back
+  to back instead of interleaved with requests that evict it
+- ``PrefixCacheStats``: the prefix-hit ratio of the prompts in the order they
+  were sent, simulated with an LRU cache of fixed-size blocks (as vLLM hashes
+  16-token blocks) and, when the server reports it, taken from
+  ``usage.prompt_tokens_details.cached_tokens``
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+@dataclass
+class FewShotTemplate:
+    """An instruction and worked examples shared by every query of a task.
+
+    ``example_format`` is filled from each example dict and ``query_format``
+    from the keyword arguments of ``render``; examples are joined with
+    ``separator``. The prefix is built once, when the template is created.
+    """
+
+    instruction: str
+    examples: List[Dict[str, Any]]
+    example_format: str
+    query_format: str
+    separator: str = "\n\n"
+    prefix: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.prefix = self.instruction + "".join(
+            self.example_format.format(**example) + self.separator for example in self.examples
+        )
+
+    def render(self, **fields: Any) -> str:
+        """The full prompt for one query: the shared prefix plus the formatted query."""
+        return self.prefix + self.query_format.format(**fields)
+
+def order_by_prefix(items: Iterable[T], key: Optional[Callable[[T], str]] = None) -> List[T]:
+    """Order items so prompts sharing a prefix are adjacent.
+
+    Sorting by prompt text places every group with a common prefix (and
+    every nested sub-group) contiguously; the sort is stable, so identical
+    prompts keep their original order.
+    """
+    return sorted(items, key=key or (lambda item: item))
+
+class PrefixCacheStats:
+    """Prefix-cache hit accounting for prompts in the order they are sent."""
+
+    def __init__(self, block_size: int = 64, capacity_blocks: int = 4096):
+        """Initialize the statistics.
+
+        Args:
+            block_size: Characters per cache block (about 16 tokens at the default)
+            capacity_blocks: Blocks the simulated cache holds before evicting the least recently used
+        """
+        self.block_size = block_size
+        self.capacity_blocks = capacity_blocks
+        self._blocks: "OrderedDict[int, None]" = OrderedDict()
+        self.prompts = 0
+        self.total_blocks = 0
+        self.hit_blocks = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self._reported = 0
+
+    def observe(self, prompt: str) -> int:
+        """Simulate sending a prompt; return how many of its leading blocks were cached.
+
+        Each full block is keyed by a hash chained over every block before
+        it, so a block only hits when the whole prefix up to it matches.
+        """
+        self.prompts += 1
+        hits, key, matching = 0, 0, True
+        for start in range(0, len(prompt) - self.block_size + 1, self.block_size):
+            key = hash((key, prompt[start:start + self.block_size]))
+            self.total_blocks += 1
+            if matching and key in self._blocks:
+                self._blocks.move_to_end(key)
+                hits += 1
+                continue
+            matching = False
+            self._blocks[key] = None
+            self._blocks.move_to_end(key)
+            if len(self._blocks) > self.capacity_blocks:
+                self._blocks.popitem(last=False)
+        self.hit_blocks += hits
+        return hits
+
+    def record_usage(self, usage: Optional[Dict[str, Any]]):
+        """Add the cached prompt tokens a server reported in a response's usage."""
+        details = (usage or {}).get("prompt_tokens_details") or {}
+        if "cached_tokens" not in details:
+            return
+        self._reported += 1
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.cached_tokens += details["cached_tokens"] or 0
+
+    @property
+    def hit_ratio(self) -> Optional[float]:
+        """Simulated fraction of prompt blocks served from the prefix cache."""
+        return self.hit_blocks / self.total_blocks if self.total_blocks else None
+
+    @property
+    def server_hit_ratio(self) -> Optional[float]:
+        """Fraction of prompt tokens the server reported as cached, if it reports them."""
+        return self.cached_tokens / self.prompt_tokens if self._reported and self.prompt_tokens else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "prompts": self.prompts,
+            "hit_ratio": self.hit_ratio,
+            "server_hit_ratio": self.server_hit_ratio,
+            "cached_tokens": self.cached_tokens if self._reported else None,
+        }
@@ -0,0 +1,344 @@
+"""Provider adapters for model server protocols.
+
+LLMClient speaks to every backend through an adapter that builds the
+request payload and turns the server's reply into the framework's response
+format, one dict per prompt:
+
+    {"choices": [{"text": ..., "finish_reason": ..., "logprobs": ...}], "model": ..., "usage": ...}
+
+``logprobs`` (present only when requested) uses the legacy completions
+layout: ``{"tokens": [...], "token_logprobs": [...], "top_logprobs": [...]}``.
+``usage`` may be None or partial; the client estimates what is missing.
+
+Adapters expose each backend's most efficient path:
+
+- ``openai-chat``: ``/v1/chat/completions``, one prompt per request, ``n`` samples
+- ``openai-completions``: ``/v1/completions`` with a list of prompts per request
+  (vLLM's OpenAI server batches them natively), ``n`` samples and logprobs
+- ``tgi``: Text Generation Inference's native ``/generate``; ``n`` samples via
+  ``best_of`` and token logprobs from ``details``
+- ``llama.cpp``: the llama.cpp server's ``/completion`` with a list of prompts
+  per request and ``cache_prompt`` so shared prefixes reuse the KV cache
+
+Select one with ``LLM_PROVIDER`` or ``LLMClient(provider=...)``.
+"""
+
+import math
+from typing import Any, Dict, List, NamedTuple, Optional, Type
+
+class StreamDelta(NamedTuple):
+    """What one streamed chunk adds to the response."""
+
+    text: Optional[str] = None
+    finish_reason: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None
+
+class Provider:
+    """Request building and response parsing for one server protocol."""
+
+    name = ""
+    generate_path = ""
+    stream_path = ""
+    supports_batch = False  # several prompts in one request
+    supports_n = False  # several samples of one prompt in one request
+
+    def __init__(self, system_prompt: Optional[str] = None):
+        """Initialize the adapter.
+
+        Args:
+            system_prompt: System message for chat protocols; ignored by the others
+        """
+        self.system_prompt = system_prompt
+
+    def prompt_parts(self, prompt: str) -> List[str]:
+        """The texts sent as the prompt, for estimating prompt tokens."""
+        return [prompt]
+
+    def build_request(
+        self,
+        model: str,
+        prompts: List[str],
+        max_tokens: Optional[int],
+        temperature: float,
+        n: int = 1,
+        logprobs: Optional[int] = None,
+        stream: bool = False,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Payload for generating from `prompts` (a single prompt unless supports_batch).
+
+        Args:
+            model: Model name
+            prompts: Prompts to complete
+            max_tokens: Maximum tokens per completion (server default if None)
+            temperature: Sampling temperature
+            n: Completions per prompt
+            logprobs: Also return token logprobs with this many alternatives per token
+            stream: Request a server-sent event stream
+            **kwargs: Extra backend-specific parameters, passed through
+        """
+        raise NotImplementedError
+
+    def parse_response(self, raw: Any, prompt_count: int, n: int = 1) -> List[Dict[str, Any]]:
+        """One response dict per prompt, in prompt order."""
+        raise NotImplementedError
+
+    def parse_stream_chunk(self, chunk: Dict[str, Any]) -> StreamDelta:
+        raise NotImplementedError
+
+def _single(prompts: List[str], name: str) -> str:
+    if len(prompts) != 1:
+        raise ValueError(f"The {name} provider sends one prompt per request")
+    return prompts[0]
+
+class OpenAIChatProvider(Provider):
+    """OpenAI-compatible chat completions."""
+
+    name = "openai-chat"
+    generate_path = stream_path = "v1/chat/completions"
+    supports_n = True
+
+    def prompt_parts(self, prompt: str) -> List[str]:
+        return [self.system_prompt, prompt] if self.system_prompt else [prompt]
+
+    def build_request(self, model, prompts, max_tokens, temperature, n=1, logprobs=None, stream=False, **kwargs):
+        messages = [{"role": "user", "content": _single(prompts, self.name)}]
+        if self.system_prompt:
+            messages.insert(0, {"role": "system", "content": self.system_prompt})
+        payload: Dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+        if stream:
+            payload["stream"] = True
+        if n > 1:
+            payload["n"] = n
+        if logprobs is not None:
+            payload["logprobs"] = True
+            if logprobs:
+                payload["top_logprobs"] = logprobs
+        payload.update(kwargs)
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        return payload
+
+    def parse_response(self, raw, prompt_count, n=1):
+        choices = []
+        for choice in raw["choices"]:
+            parsed = {"text": choice["message"]["content"], "finish_reason": choice["finish_reason"]}
+            content = (choice.get("logprobs") or {}).get("content")
+            if content is not None:
+                parsed["logprobs"] = {
+                    "tokens": [entry["token"] for entry in content],
+                    "token_logprobs": [entry["logprob"] for entry in content],
+                    "top_logprobs": [
+                        {top["token"]: top["logprob"] for top in entry.get("top_logprobs") or []} for entry in content
+                    ]
+                }
+            choices.append(parsed)
+        return [{"choices": choices, "model": raw.get("model"), "usage": raw.get("usage")}]
+
+    def parse_stream_chunk(self, chunk):
+        text = finish_reason = None
+        for choice in chunk.get("choices", []):
+            text = (choice.get("delta") or {}).get("content") or text
+            finish_reason = choice.get("finish_reason") or finish_reason
+        return StreamDelta(text, finish_reason, chunk.get("usage"))
+
+class OpenAICompletionsProvider(Provider):
+    """OpenAI-compatible text completions, several prompts per request."""
+
+    name = "openai-completions"
+    generate_path = stream_path = "v1/completions"
+    supports_batch = True
+    supports_n = True
+
+    def build_request(self, model, prompts, max_tokens, temperature, n=1, logprobs=None, stream=False, **kwargs):
+        payload: Dict[str, Any] = {
+            "model": model,
+            "prompt": prompts[0] if len(prompts) == 1 else list(prompts),
+            "temperature": temperature
+        }
+        if stream:
+            payload["stream"] = True
+        if n > 1:
+            payload["n"] = n
+        if logprobs is not None:
+            payload["logprobs"] = logprobs
+        payload.update(kwargs)
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        return payload
+
+    def parse_response(self, raw, prompt_count, n=1):
+        # Choice i * n + j is sample j of prompt i
+        grouped: List[List[Dict[str, Any]]] = [[] for _ in range(prompt_count)]
+        for position, choice in enumerate(sorted(raw["choices"], key=lambda c: c.get("index", 0))):
+            parsed = {"text": choice["text"], "finish_reason": choice.get("finish_reason")}
+            if choice.get("logprobs"):
+                parsed["logprobs"] = {
+                    key: choice["logprobs"].get(key) for key in ("tokens", "token_logprobs", "top_logprobs")
+                }
+            grouped[choice.get("index", position) // n].append(parsed)
+        # Usage covers the whole request, so it is only exact for a single prompt
+        usage = raw.get("usage") if prompt_count == 1 else None
+        return [{"choices": choices, "model": raw.get("model"), "usage": usage} for choices in grouped]
+
+    def parse_stream_chunk(self, chunk):
+        text = finish_reason = None
+        for choice in chunk.get("choices", []):
+            text = choice.get("text") or text
+            finish_reason = choice.get("finish_reason") or finish_reason
+        return StreamDelta(text, finish_reason, chunk.get("usage"))
+
+_TGI_FINISH_REASONS = {"length": "length", "eos_token": "stop", "stop_sequence": "stop"}
+
+class TGIProvider(Provider):
+    """Hugging Face Text Generation Inference native API."""
+
+    name = "tgi"
+    generate_path = "generate"
+    stream_path = "generate_stream"
+    supports_n = True
+
+    def build_request(self, model, prompts, max_tokens, temperature, n=1, logprobs=None, stream=False, **kwargs):
+        parameters: Dict[str, Any] = {"details": True, "do_sample": temperature > 0}
+        if temperature > 0:
+            parameters["temperature"] = temperature
+        if max_tokens:
+            parameters["max_new_tokens"] = max_tokens
+        if n > 1:
+            # best_of returns the best sequence plus the others in details.best_of_sequences
+            parameters["best_of"] = n
+            parameters["do_sample"] = True
+        if logprobs:
+            parameters["top_n_tokens"] = logprobs
+        parameters.update(kwargs)
+        return {"inputs": _single(prompts, self.name), "parameters": parameters}
+
+    @staticmethod
+    def _choice(text: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        choice: Dict[str, Any] = {
+            "text": text,
+            "finish_reason": _TGI_FINISH_REASONS.get(details.get("finish_reason"), details.get("finish_reason"))
+        }
+        tokens = details.get("tokens")
+        if tokens:
+            choice["logprobs"] = {
+                "tokens": [token["text"] for token in tokens],
+                "token_logprobs": [token.get("logprob") for token in tokens],
+                "top_logprobs": [
+                    {top["text"]: top["logprob"] for top in alternatives}
+                    for alternatives in details.get("top_tokens") or []
+                ] or None
+            }
+        return choice
+
+    def parse_response(self, raw, prompt_count, n=1):
+        if isinstance(raw, list):
+            raw = raw[0]
+        details = raw.get("details") or {}
+        choices = [self._choice(raw["generated_text"], details)]
+        generated = details.get("generated_tokens") or 0
+        for sequence in details.get("best_of_sequences") or []:
+            choices.append(self._choice(sequence["generated_text"], sequence))
+            generated += sequence.get("generated_tokens") or 0
+        usage = {"completion_tokens": generated} if details else None
+        if details.get("prefill"):
+            usage["prompt_tokens"] = len(details["prefill"])
+        return [{"choices": choices[:n], "model": None, "usage": usage}]
+
+    def parse_stream_chunk(self, chunk):
+        token = chunk.get("token") or {}
+        details = chunk.get("details") or {}
+        text = None if token.get("special") else token.get("text")
+        finish_reason = _TGI_FINISH_REASONS.get(details.get("finish_reason"), details.get("finish_reason"))
+        usage = {"completion_tokens": details["generated_tokens"]} if "generated_tokens" in details else None
+        return StreamDelta(text, finish_reason, usage)
+
+class LlamaCppProvider(Provider):
+    """llama.cpp server native completion API."""
+
+    name = "llama.cpp"
+    generate_path = stream_path = "completion"
+    supports_batch = True
+
+    def build_request(self, model, prompts, max_tokens, temperature, n=1, logprobs=None, stream=False, **kwargs):
+        if n > 1:
+            raise ValueError("The llama.cpp provider returns one completion per prompt")
+        payload: Dict[str, Any] = {
+            "prompt": prompts[0] if len(prompts) == 1 else list(prompts),
+            "n_predict": max_tokens or -1,
+            "temperature": temperature,
+            "cache_prompt": True
+        }
+        if stream:
+            payload["stream"] = True
+        if logprobs is not None:
+            payload["n_probs"] = max(1, logprobs)
+        payload.update(kwargs)
+        return payload
+
+    @staticmethod
+    def _usage(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if "tokens_predicted" not in result:
+            return None
+        usage: Dict[str, Any] = {
+            "prompt_tokens": result.get("tokens_evaluated", 0),
+            "completion_tokens": result["tokens_predicted"]
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        cached = (result.get("timings") or {}).get("cache_n")
+        if cached is not None:
+            usage["prompt_tokens_details"] = {"cached_tokens": cached}
+        return usage
+
+    @staticmethod
+    def _finish_reason(result: Dict[str, Any]) -> str:
+        if result.get("stop_type") == "limit" or result.get("stopped_limit"):
+            return "length"
+        return "stop"
+
+    @staticmethod
+    def _logprobs(probabilities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        tokens, token_logprobs, top_logprobs = [], [], []
+        for entry in probabilities:
+            if "logprob" in entry:
+                token = entry["token"]
+                tokens.append(token)
+                token_logprobs.append(entry["logprob"])
+                top_logprobs.append({top["token"]: top["logprob"] for top in entry.get("top_logprobs") or []})
+            else:
+                # Older servers report the probabilities of the top candidates only
+                token = entry["content"]
+                top = {p["tok_str"]: math.log(p["prob"]) if p["prob"] > 0 else -math.inf for p in entry.get("probs") or []}
+                tokens.append(token)
+                token_logprobs.append(top.get(token))
+                top_logprobs.append(top)
+        return {"tokens": tokens, "token_logprobs": token_logprobs, "top_logprobs": top_logprobs}
+
+    def parse_response(self, raw, prompt_count, n=1):
+        results = raw if isinstance(raw, list) else [raw]
+        responses = []
+        for result in results[:prompt_count]:
+            choice: Dict[str, Any] = {"text": result["content"], "finish_reason": self._finish_reason(result)}
+            if result.get("completion_probabilities"):
+                choice["logprobs"] = self._logprobs(result["completion_probabilities"])
+            responses.append({"choices": [choice], "model": result.get("model"), "usage": self._usage(result)})
+        return responses
+
+    def parse_stream_chunk(self, chunk):
+        finished = chunk.get("stop")
+        return StreamDelta(
+            chunk.get("content") or None,
+            self._finish_reason(chunk) if finished else None,
+            self._usage(chunk) if finished else None
+        )
+
+PROVIDERS: Dict[str, Type[Provider]] = {
+    provider.name: provider
+    for provider in (OpenAIChatProvider, OpenAICompletionsProvider, TGIProvider, LlamaCppProvider)
+}
+
+def get_provider(name: str, system_prompt: Optional[str] = None) -> Provider:
+    """Create the adapter registered under `name`."""
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown provider '{name}', expected one of {sorted(PROVIDERS)}")
+    return PROVIDERS[name](system_prompt=system_prompt)
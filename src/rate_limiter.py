@@ -0,0 +1,63 @@
+"""Client-side rate limiting for model endpoints.
+
+A token bucket caps the request rate and an optional semaphore caps the
+number of requests in flight. Each LLMClient can carry its own limiter, so
+several endpoints with different quotas can be driven from one process.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+class RateLimiter:
+    """Async token bucket with an optional concurrency cap."""
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        """Initialize the limiter.
+
+        Args:
+            requests_per_second: Sustained request rate; unlimited if None
+            burst: Requests allowed back to back before throttling (defaults to
+                one second's worth, at least 1)
+            max_concurrency: Maximum requests in flight; unlimited if None
+        """
+        self.rate = requests_per_second
+        self.capacity = float(burst or max(1, int(requests_per_second or 1)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def acquire(self):
+        """Wait until a request may be sent under the rate limit."""
+        if not self.rate:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self):
+        if self._semaphore is not None:
+            await self._semaphore.acquire()
+        try:
+            await self.acquire()
+        except BaseException:
+            if self._semaphore is not None:
+                self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._semaphore is not None:
+            self._semaphore.release()
@@ -0,0 +1,117 @@
+"""Append-only JSONL storage for test results.
+
+Each result is written and flushed as soon as its test finishes, so memory
+stays flat during long runs and a crashed run still leaves every completed
+result on disk. Streams ending in ``.gz`` are gzip-compressed.
+"""
+
+import gzip
+import json
+from typing import Any, Dict, Iterator, Optional
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+class ResultStreamWriter:
+    """Write test results to a JSONL file one line at a time."""
+
+    def __init__(self, path: str = "test_metrics.jsonl", append: bool = False):
+        """Open the stream, truncating it unless append is set."""
+        self.path = path
+        self.count = 0
+        self._file = _open(path, "a" if append else "w")
+
+    def write(self, result: Dict[str, Any]):
+        """Append a single result and flush it to disk."""
+        self._file.write(json.dumps(result, separators=(",", ":"), default=str) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        """Close the underlying file."""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_results(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield results from a stream, skipping a truncated final line."""
+    try:
+        with _open(path, "r") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a partial last line
+                    continue
+    except EOFError:
+        # Truncated gzip member from an interrupted run
+        return
+
+class MetricsAccumulator:
+    """Running outcome counts used to compute run metrics without keeping results."""
+
+    def __init__(self):
+        """Initialize empty counts."""
+        self.total = 0
+        self.successful = 0
+        self.partial = 0
+        self.attempted = 0
+        # suite -> pass@k key -> [sum, count]
+        self._pass_at_k: Dict[str, Dict[str, list]] = {}
+
+    def add(self, result: Dict[str, Any]):
+        """Count one result."""
+        outcome = result.get("outcome")
+        self.total += 1
+        self.successful += outcome == "passed"
+        self.partial += outcome == "partial"
+        self.attempted += outcome != "skipped"
+
+        scores = (result.get("properties") or {}).get("pass_at_k")
+        if scores:
+            suite = result.get("suite_name") or result.get("test_name", "").split("::")[0]
+            for name in ("overall", suite):
+                bucket = self._pass_at_k.setdefault(name, {})
+                for key, value in scores.items():
+                    total = bucket.setdefault(key, [0.0, 0])
+                    total[0] += value
+                    total[1] += 1
+
+    def metrics(self) -> Dict[str, float]:
+        """Return coverage, success and partial success rates as percentages."""
+        if self.total == 0:
+            return {
+                "coverage_rate": 0.0,
+                "success_rate": 0.0,
+                "partial_success_rate": 0.0
+            }
+        return {
+            "coverage_rate": (self.attempted / self.total) * 100,
+            "success_rate": (self.successful / self.total) * 100,
+            "partial_success_rate": (self.partial / self.total) * 100
+        }
+
+    def pass_at_k(self) -> Dict[str, Any]:
+        """Mean pass@k overall and per suite, for results that recorded it."""
+        means = {
+            name: {key: total / count for key, (total, count) in sorted(bucket.items())}
+            for name, bucket in self._pass_at_k.items()
+        }
+        if not means:
+            return {}
+        overall = means.pop("overall")
+        return {"overall": overall, "suites": means}
+
+def summarize_stream(path: str, accumulator: Optional[MetricsAccumulator] = None) -> Dict[str, float]:
+    """Compute run metrics by reading a result stream once."""
+    accumulator = accumulator or MetricsAccumulator()
+    for result in iter_results(path):
+        accumulator.add(result)
+    return accumulator.metrics()
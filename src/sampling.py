@@ -0,0 +1,62 @@
+"""pass@k estimation for sampled completions.
+
+Uses the unbiased estimator from Chen et al. (2021): with ``n`` samples of
+which ``c`` pass, pass@k = 1 - C(n - c, k) / C(n, k), computed as a running
+product to stay numerically stable for large n.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+def pass_at_k(n: int, c: int, k: int) -> float:
+    """Unbiased estimate of the probability that at least one of k samples passes."""
+    if k > n:
+        raise ValueError(f"k ({k}) cannot exceed the number of samples ({n})")
+    if n - c < k:
+        return 1.0
+    estimate = 1.0
+    for i in range(n - c + 1, n + 1):
+        estimate *= 1.0 - k / i
+    return 1.0 - estimate
+
+def parse_k_values(spec: str) -> List[int]:
+    """Parse a comma separated list of k values such as "1,5,10"."""
+    return sorted({int(part) for part in spec.split(",") if part.strip()})
+
+def pass_at_k_scores(passed: Sequence[bool], ks: Iterable[int]) -> Dict[str, float]:
+    """pass@k for every k not larger than the number of samples."""
+    n, c = len(passed), sum(bool(p) for p in passed)
+    return {f"pass@{k}": pass_at_k(n, c, k) for k in ks if k <= n}
+
+def mean_pass_at_k(per_test: Iterable[Dict[str, float]]) -> Dict[str, float]:
+    """Average per-test pass@k values into suite-level values."""
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for scores in per_test:
+        for key, value in scores.items():
+            totals[key] = totals.get(key, 0.0) + value
+            counts[key] = counts.get(key, 0) + 1
+    return {key: totals[key] / counts[key] for key in sorted(totals)}
+
+async def sample_texts(
+    client,
+    prompt: str,
+    max_tokens: int,
+    n: Optional[int] = None,
+    temperature: Optional[float] = None
+) -> List[str]:
+    """Return one greedy completion, or n sampled ones when sampling is enabled.
+
+    n and temperature default to SAMPLES_PER_PROMPT and SAMPLING_TEMPERATURE.
+    """
+    from .config import settings
+
+    n = settings.samples_per_prompt if n is None else n
+    if n <= 1:
+        response = await client.generate(prompt=prompt, max_tokens=max_tokens, temperature=0.0)
+        return [response["choices"][0]["text"]]
+    return await client.generate_samples(
+        prompt=prompt,
+        n=n,
+        max_tokens=max_tokens,
+        temperature=settings.sampling_temperature if temperature is None else temperature
+    )
@@ -0,0 +1,296 @@
+"""Resource-limited worker pool for executing generated code.
+
+Each worker is a long-lived "zygote" process that never runs generated code
+itself: for every job it forks a fresh child, which runs the sample and
+exits. Samples are isolated from each other (monkey-patched builtins or
+mutated modules die with the child), while running one still costs a fork
+and a pipe round-trip instead of an interpreter start. Zygotes are started
+through a ``forkserver`` context where available, so starting or replacing
+one from a pool thread never forks this multithreaded process. The zygote
+lowers its limits once and its children inherit them:
+
+- CPU time (RLIMIT_CPU, per child) and address space (RLIMIT_AS)
+- no file writes beyond a small size (RLIMIT_FSIZE) and few descriptors
+- socket creation disabled by replacing the socket constructors
+
+Every call into generated code also has a wall-clock alarm, and the zygote
+kills any child that stops responding. This is an isolation layer for
+well-meaning but buggy model output, not a security boundary against
+hostile code.
+"""
+
+import builtins
+import multiprocessing
+import os
+import pickle
+import queue
+import resource
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence
+
+@dataclass
+class ExecutionResult:
+    """Outputs of running one code sample against a list of inputs."""
+
+    outputs: List[Any] = field(default_factory=list)
+    passed: List[bool] = field(default_factory=list)
+    error: Optional[str] = None
+    timed_out: bool = False
+    duration_ms: float = 0.0
+
+    @property
+    def all_passed(self) -> bool:
+        """Whether the sample produced every expected output."""
+        return bool(self.passed) and all(self.passed) and self.error is None
+
+class _CallTimeout(Exception):
+    """Raised inside a worker when one call exceeds its time budget."""
+
+def _on_alarm(signum, frame):
+    raise _CallTimeout()
+
+def _disable_network():
+    """Make any attempt to open a socket fail."""
+    def blocked(*args, **kwargs):
+        raise PermissionError("network access is disabled in the sandbox")
+
+    socket.socket = blocked
+    socket.create_connection = blocked
+    socket.socketpair = blocked
+
+def _apply_limits(memory_mb: int):
+    resource.setrlimit(resource.RLIMIT_AS, (memory_mb * 1024 * 1024, memory_mb * 1024 * 1024))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (1024 * 1024, 1024 * 1024))
+    resource.setrlimit(resource.RLIMIT_NOFILE, (64, 64))
+
+def _limit_cpu(cpu_seconds: int):
+    """Limit the CPU time of a freshly forked job process."""
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = cpu_seconds if hard == resource.RLIM_INFINITY else min(cpu_seconds, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _safe_value(value: Any) -> Any:
+    """Return value if it can be sent back to the parent, else its repr."""
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        return repr(value)
+
+def _run_job(code: str, function_name: str, inputs: Sequence[Any], expected: Sequence[Any], call_timeout: float):
+    namespace = {"__name__": "__sandbox__"}
+    outputs: List[Any] = []
+    passed: List[bool] = []
+    try:
+        signal.setitimer(signal.ITIMER_REAL, call_timeout)
+        try:
+            exec(compile(code, "<generated>", "exec"), namespace)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        func = namespace[function_name]
+    except _CallTimeout:
+        return outputs, passed, "timeout while loading code", True
+    except BaseException as e:
+        return outputs, passed, f"{type(e).__name__}: {e}", False
+
+    for args, want in zip(inputs, expected):
+        call_args = args if isinstance(args, tuple) else (args,)
+        signal.setitimer(signal.ITIMER_REAL, call_timeout)
+        try:
+            output = func(*call_args)
+        except _CallTimeout:
+            return outputs, passed, f"timeout on input {args!r}", True
+        except BaseException as e:
+            output = f"{type(e).__name__}: {e}"
+            outputs.append(output)
+            passed.append(False)
+            continue
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        outputs.append(_safe_value(output))
+        passed.append(output == want)
+    return outputs, passed, None, False
+
+def _job_budget(inputs: Sequence[Any], call_timeout: float) -> float:
+    """Wall-clock seconds a whole job may take: loading the code plus every call."""
+    return call_timeout * (len(inputs) + 1) + 1
+
+def _fork_job(job: tuple, cpu_seconds: int) -> tuple:
+    """Run one job in a child forked from the zygote; returns (status, payload)."""
+    reader, writer = multiprocessing.Pipe(duplex=False)
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            reader.close()
+            _limit_cpu(cpu_seconds)
+            saved_builtins = dict(builtins.__dict__)
+            result = _run_job(*job)
+            # Sending the result must not depend on builtins the sample replaced
+            builtins.__dict__.update(saved_builtins)
+            writer.send(result)
+            status = 0
+        finally:
+            os._exit(status)
+
+    writer.close()
+    try:
+        if reader.poll(_job_budget(job[2], job[4])):
+            result = ("done", reader.recv())
+        else:
+            os.kill(pid, signal.SIGKILL)
+            result = ("timeout", None)
+    except (EOFError, OSError):
+        # Child died before reporting, e.g. CPU or memory limit exceeded
+        result = None
+    finally:
+        reader.close()
+        _, wait_status = os.waitpid(pid, 0)
+    if result is None:
+        return "crashed", os.waitstatus_to_exitcode(wait_status)
+    return result
+
+def _zygote_main(conn, cpu_seconds: int, memory_mb: int):
+    """Zygote loop: apply limits once, then fork a child per job until told to stop."""
+    signal.signal(signal.SIGALRM, _on_alarm)
+    _disable_network()
+    _apply_limits(memory_mb)
+    sys.setrecursionlimit(2000)
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        conn.send(_fork_job(job, cpu_seconds))
+
+class _Worker:
+    """Handle for one zygote process."""
+
+    def __init__(self, context, cpu_seconds: int, memory_mb: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_zygote_main, args=(child_conn, cpu_seconds, memory_mb), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+class SandboxPool:
+    """Pool of resource-limited workers that run each generated sample in a fresh process."""
+
+    def __init__(
+        self,
+        workers: int = 4,
+        cpu_seconds: int = 2,
+        memory_mb: int = 512,
+        call_timeout: float = 2.0
+    ):
+        """Initialize the pool.
+
+        Args:
+            workers: Number of worker processes
+            cpu_seconds: CPU time allowed per job
+            memory_mb: Address space limit per job
+            call_timeout: Wall-clock limit for loading the code and for each call
+        """
+        self.size = workers
+        self.cpu_seconds = cpu_seconds
+        self.memory_mb = memory_mb
+        self.call_timeout = call_timeout
+        # Never fork this (threaded) process directly; the zygotes do the per-job forks
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(method)
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> "SandboxPool":
+        """Start the zygote processes."""
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        self._executor = ThreadPoolExecutor(max_workers=self.size)
+        return self
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.cpu_seconds, self.memory_mb)
+
+    def run(
+        self,
+        code: str,
+        function_name: str,
+        inputs: Sequence[Any],
+        expected: Sequence[Any]
+    ) -> ExecutionResult:
+        """Execute code and call function_name on each input; blocks until done."""
+        worker = self._idle.get()
+        start = time.perf_counter()
+        try:
+            worker.conn.send((code, function_name, list(inputs), list(expected), self.call_timeout))
+            # The zygote enforces the job budget; this only catches a zygote that stopped responding
+            if not worker.conn.poll(_job_budget(inputs, self.call_timeout) + 5):
+                raise TimeoutError
+            status, payload = worker.conn.recv()
+        except (TimeoutError, EOFError, OSError):
+            exit_code = worker.process.exitcode
+            worker.kill()
+            worker = self._spawn()
+            return ExecutionResult(error=f"worker crashed (exit code {exit_code})",
+                                   duration_ms=(time.perf_counter() - start) * 1000)
+        finally:
+            self._idle.put(worker)
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        if status == "timeout":
+            return ExecutionResult(error="worker timed out", timed_out=True, duration_ms=duration_ms)
+        if status == "crashed":
+            return ExecutionResult(error=f"worker crashed (exit code {payload})", duration_ms=duration_ms)
+        outputs, passed, error, timed_out = payload
+        return ExecutionResult(
+            outputs=outputs,
+            passed=passed,
+            error=error,
+            timed_out=timed_out,
+            duration_ms=duration_ms
+        )
+
+    def run_many(self, jobs: Sequence[tuple]) -> List[ExecutionResult]:
+        """Run (code, function_name, inputs, expected) jobs concurrently across workers."""
+        return list(self._executor.map(lambda job: self.run(*job), jobs))
+
+    async def run_async(self, code: str, function_name: str, inputs: Sequence[Any], expected: Sequence[Any]) -> ExecutionResult:
+        """Awaitable version of run() for use from async tests."""
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.run, code, function_name, inputs, expected)
+
+    def close(self):
+        """Stop all workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+        while not self._idle.empty():
+            worker = self._idle.get()
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.kill()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
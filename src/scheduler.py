@@ -0,0 +1,221 @@
+"""Priority and fair-share scheduling of evaluation work.
+
+One scheduler queues every work item of a run - across suites and, in a
+comparison run, across models - and decides what to start whenever a slot
+frees up:
+
+1. Priority: the lowest ``priority`` value goes first (suite priority 1 before
+   priority 2), so under a time budget the most important suites finish first.
+2. Fair share: within a priority level, the group (suite, or model and suite)
+   that has used the least weighted run time goes next, so one large suite
+   cannot starve the others.
+3. Budget: with a ``time_budget``, queued work whose expected duration no
+   longer fits in the time left is aborted instead of started, and once less
+   than ``abort_margin`` seconds remain only the best priority level still
+   queued or running starts. Running work is bounded by the budget through
+   ``src.deadline``.
+
+Global concurrency is capped by the scheduler itself and request rates by an
+optional RateLimiter shared by all items.
+
+Usage:
+    scheduler = EvaluationScheduler(concurrency=16, time_budget=600)
+    future = scheduler.submit(lambda: evaluate(case), priority=case.priority, group=case.suite_name)
+    result = await future
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional
+
+from .deadline import Deadline, DeadlineExceeded, deadline
+from .rate_limiter import RateLimiter
+
+class WorkAborted(DeadlineExceeded):
+    """Raised for queued work that was not started because the time budget could not cover it."""
+
+@dataclass
+class _WorkItem:
+    factory: Callable[[], Awaitable[Any]]
+    priority: int
+    group: Hashable
+    estimate: Optional[float]
+    future: asyncio.Future
+    sequence: int
+    charged: float = field(default=0.0)
+
+class EvaluationScheduler:
+    """Dispatch queued coroutines by priority, fair share and time budget."""
+
+    def __init__(
+        self,
+        concurrency: int = 16,
+        rate_limiter: Optional[RateLimiter] = None,
+        time_budget: Optional[float] = None,
+        abort_margin: float = 0.0,
+        weights: Optional[Dict[Hashable, float]] = None,
+        default_estimate: float = 1.0
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            concurrency: Maximum number of items running at once
+            rate_limiter: Optional limiter every item passes through before it starts
+            time_budget: Seconds from now by which all work must finish; unlimited if None
+            abort_margin: When less than this many seconds remain, only the best priority level
+                still queued or running starts
+            weights: Fair-share weight per group (default 1); a group of weight 2 gets twice the run time
+            default_estimate: Expected seconds per item for groups with no completed items yet
+        """
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.budget = Deadline(time_budget) if time_budget is not None else None
+        self.abort_margin = abort_margin
+        self.weights = dict(weights or {})
+        self.default_estimate = default_estimate
+        self._queues: Dict[int, Dict[Hashable, Deque[_WorkItem]]] = {}
+        self._usage: Dict[Hashable, float] = {}
+        self._durations: Dict[Hashable, float] = {}
+        self._sequence = itertools.count()
+        self._running_priorities: Dict[int, int] = {}
+        self._dispatch_pending = False
+        self.running = 0
+        self.started = 0
+        self.completed = 0
+        self.aborted = 0
+
+    def submit(
+        self,
+        factory: Callable[[], Awaitable[Any]],
+        priority: int = 1,
+        group: Hashable = None,
+        estimate: Optional[float] = None
+    ) -> asyncio.Future:
+        """Queue a coroutine factory; the returned future resolves to its result.
+
+        Items submitted in the same event-loop step are all queued before any
+        of them starts, so submission order never outranks priority.
+
+        Args:
+            factory: Called with no arguments to create the coroutine when the item starts
+            priority: Lower values start first
+            group: Fair-share key, such as the suite name or a (model, suite) tuple
+            estimate: Expected run time in seconds; defaults to the group's recent average
+        """
+        loop = asyncio.get_running_loop()
+        item = _WorkItem(factory, priority, group, estimate, loop.create_future(), next(self._sequence))
+        self._queues.setdefault(priority, {}).setdefault(group, deque()).append(item)
+        if group not in self._usage:
+            # New groups start level with the least-served one rather than at zero
+            self._usage[group] = min(self._usage.values(), default=0.0)
+        if not self._dispatch_pending:
+            self._dispatch_pending = True
+            loop.call_soon(self._dispatch)
+        return item.future
+
+    @property
+    def queued(self) -> int:
+        return sum(len(items) for groups in self._queues.values() for items in groups.values())
+
+    def _estimate(self, item: _WorkItem) -> float:
+        if item.estimate is not None:
+            return item.estimate
+        return self._durations.get(item.group, self.default_estimate)
+
+    def _next_item(self) -> Optional[_WorkItem]:
+        """Pop the item to start next: best priority, then least-served group, then FIFO."""
+        if not self._queues:
+            return None
+        priority = min(self._queues)
+        groups = self._queues[priority]
+        group = min(groups, key=lambda g: (self._usage[g], groups[g][0].sequence))
+        item = groups[group].popleft()
+        if not groups[group]:
+            del groups[group]
+        if not groups:
+            del self._queues[priority]
+        return item
+
+    def _top_priority(self, item: _WorkItem) -> int:
+        """Best priority among `item` and the queued and running items."""
+        return min(itertools.chain([item.priority], self._queues, self._running_priorities))
+
+    def _should_abort(self, item: _WorkItem) -> Optional[str]:
+        if self.budget is None:
+            return None
+        remaining = self.budget.remaining()
+        if remaining <= 0:
+            return f"time budget of {self.budget.seconds:.0f}s exhausted"
+        if remaining < self.abort_margin and item.priority > self._top_priority(item):
+            return f"priority {item.priority} work skipped with {remaining:.1f}s of the budget left"
+        expected = self._estimate(item)
+        if expected > remaining:
+            return f"expected {expected:.1f}s but only {remaining:.1f}s of the budget left"
+        return None
+
+    def _dispatch(self):
+        """Start items until the concurrency cap is reached or the queue is empty."""
+        self._dispatch_pending = False
+        while self.running < self.concurrency:
+            item = self._next_item()
+            if item is None:
+                return
+            if item.future.cancelled():
+                continue
+            reason = self._should_abort(item)
+            if reason is not None:
+                self.aborted += 1
+                item.future.set_exception(WorkAborted(reason))
+                continue
+            # Charge the expected run time now so concurrent picks rotate across groups
+            item.charged = self._estimate(item) / self.weights.get(item.group, 1.0)
+            self._usage[item.group] += item.charged
+            self.running += 1
+            self._running_priorities[item.priority] = self._running_priorities.get(item.priority, 0) + 1
+            self.started += 1
+            asyncio.ensure_future(self._run(item))
+
+    async def _run(self, item: _WorkItem):
+        start = time.monotonic()
+        try:
+            with deadline(self.budget.remaining() if self.budget is not None else None):
+                if self.rate_limiter is not None:
+                    async with self.rate_limiter:
+                        result = await item.factory()
+                else:
+                    result = await item.factory()
+        except asyncio.CancelledError:
+            item.future.cancel()
+            raise
+        except Exception as e:
+            if not item.future.done():
+                item.future.set_exception(e)
+        else:
+            if not item.future.done():
+                item.future.set_result(result)
+        finally:
+            elapsed = time.monotonic() - start
+            # Replace the charged estimate with the actual run time
+            self._usage[item.group] += elapsed / self.weights.get(item.group, 1.0) - item.charged
+            previous = self._durations.get(item.group)
+            self._durations[item.group] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+            self.running -= 1
+            self._running_priorities[item.priority] -= 1
+            if not self._running_priorities[item.priority]:
+                del self._running_priorities[item.priority]
+            self.completed += 1
+            self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts of started, completed, aborted, running and queued items, and the budget left."""
+        return {
+            "started": self.started,
+            "completed": self.completed,
+            "aborted": self.aborted,
+            "running": self.running,
+            "queued": self.queued,
+            "remaining_budget": self.budget.remaining() if self.budget is not None else None,
+        }
@@ -0,0 +1,311 @@
+"""Embedding-based semantic similarity scoring.
+
+Responses are compared with reference answers by cosine similarity of their
+embeddings instead of exact substring matches. Texts are embedded in batches
+through ``LLMClient.get_embeddings`` (one ``/v1/embeddings`` request per
+batch) and the vectors are cached on disk, keyed by a hash of the embedding
+model and the text, so references and repeated responses are embedded once
+across runs.
+
+The cache directory holds one shard per embedding model and dimension, so
+switching to a model with a different vector size starts a new shard
+instead of clashing with the old one:
+
+- ``<model>-<dim>.f32``: float32 rows appended as they are computed, read
+  back through a memory map
+- ``<model>-<dim>.jsonl``: one ``{"key": ..., "row": ...}`` line per cached vector
+
+When the engine scores cases, scoring calls that arrive close together (cases
+finishing concurrently) are collected and scored with one ``score_batch``
+call, so their responses and references share embeddings requests.
+
+Appends hold an exclusive lock on the vectors file while they read the next
+free row and write the new rows, so parallel test workers can share one cache
+directory. Platforms without ``fcntl`` fall back to a single writer.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import re
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import settings
+
+def text_key(model: str, text: str) -> str:
+    """Cache key for one text embedded by one model."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarity between the rows of a and the rows of b."""
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    a_norm = np.linalg.norm(a, axis=1, keepdims=True)
+    b_norm = np.linalg.norm(b, axis=1, keepdims=True)
+    a = a / np.where(a_norm == 0, 1, a_norm)
+    b = b / np.where(b_norm == 0, 1, b_norm)
+    return a @ b.T
+
+_SHARD_NAME = re.compile(r"[^A-Za-z0-9._]+")
+
+class _Shard:
+    """Vectors of one model and dimension: a float32 matrix file and its row index."""
+
+    def __init__(self, directory: str, name: str, dim: int):
+        self.vectors_path = os.path.join(directory, f"{name}.f32")
+        self.index_path = os.path.join(directory, f"{name}.jsonl")
+        self.dim = dim
+        self._matrix: Optional[np.memmap] = None
+
+    def stored_rows(self) -> int:
+        if not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (4 * self.dim)
+
+    def load_index(self) -> Dict[str, int]:
+        stored = self.stored_rows()
+        rows: Dict[str, int] = {}
+        if not os.path.exists(self.index_path):
+            return rows
+        with open(self.index_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a partial last line
+                    continue
+                if entry["row"] < stored:
+                    rows[entry["key"]] = entry["row"]
+        return rows
+
+    def map(self) -> np.ndarray:
+        rows = self.stored_rows()
+        if self._matrix is None or self._matrix.shape[0] != rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return self._matrix
+
+    def append(self, keys: Sequence[str], vectors: np.ndarray) -> int:
+        """Write vectors before their index entries; returns the first new row."""
+        with open(self.vectors_path, "ab") as f:
+            if fcntl is not None:
+                # Another process may be appending to the same shard
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                start = os.fstat(f.fileno()).st_size // (4 * self.dim)
+                vectors.tofile(f)
+                f.flush()
+                with open(self.index_path, "a") as index:
+                    for offset, key in enumerate(keys):
+                        index.write(json.dumps({"key": key, "row": start + offset}) + "\n")
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        return start
+
+class VectorCache:
+    """Append-only on-disk embedding cache backed by memory-mapped float32 matrices."""
+
+    def __init__(self, directory: str):
+        """Open (or create) the cache in directory."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._shards: Dict[str, _Shard] = {}
+        self._rows: Dict[str, Tuple[_Shard, int]] = {}
+
+        for filename in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(filename)
+            prefix, _, dim = name.rpartition("-")
+            if extension == ".f32" and prefix and dim.isdigit():
+                self._open(name, int(dim))
+
+    def _open(self, name: str, dim: int) -> _Shard:
+        if name not in self._shards:
+            shard = self._shards[name] = _Shard(self.directory, name, dim)
+            for key, row in shard.load_index().items():
+                self._rows[key] = (shard, row)
+        return self._shards[name]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for whichever keys are present."""
+        found: Dict[str, np.ndarray] = {}
+        by_shard: Dict[str, List[str]] = {}
+        for key in keys:
+            if key in self._rows:
+                by_shard.setdefault(self._rows[key][0].vectors_path, []).append(key)
+        for present in by_shard.values():
+            shard = self._rows[present[0]][0]
+            rows = shard.map()[[self._rows[key][1] for key in present]]
+            found.update(zip(present, np.array(rows)))
+        return found
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray, model: Optional[str] = None):
+        """Append vectors for keys to the shard of their model and dimension."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+        dim = int(vectors.shape[1])
+        shard = self._open(f"{_SHARD_NAME.sub('_', model or 'default')}-{dim}", dim)
+        start = shard.append(keys, vectors)
+        for offset, key in enumerate(keys):
+            self._rows[key] = (shard, start + offset)
+
+class SemanticScorer:
+    """Score responses by embedding similarity to reference answers."""
+
+    def __init__(
+        self,
+        client,
+        cache: Optional[VectorCache] = None,
+        batch_size: Optional[int] = None,
+        threshold: Optional[float] = None,
+        concurrency: int = 4
+    ):
+        """Initialize the scorer.
+
+        Args:
+            client: An LLMClient (or compatible) with get_embeddings()
+            cache: On-disk vector cache; vectors are only cached in memory if omitted
+            batch_size: Texts per embeddings request (EMBEDDING_BATCH_SIZE by default)
+            threshold: Similarity that counts as a match (SEMANTIC_THRESHOLD by default)
+            concurrency: Maximum number of embeddings requests in flight
+        """
+        self.client = client
+        self.cache = cache
+        self.batch_size = batch_size or settings.embedding_batch_size
+        self.threshold = settings.semantic_threshold if threshold is None else threshold
+        self.concurrency = concurrency
+        self.requests = 0
+        self._memory: Dict[str, np.ndarray] = {}
+
+    def _model(self) -> str:
+        return getattr(self.client, "embedding_model", None) or getattr(self.client, "model_name", "")
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts, requesting only those not already cached."""
+        model = self._model()
+        keys = [text_key(model, text) for text in texts]
+        vectors = {key: self._memory[key] for key in keys if key in self._memory}
+        if self.cache is not None:
+            vectors.update(self.cache.get_many([key for key in keys if key not in vectors]))
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            items = list(missing.items())
+            batches = [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+            async def embed_batch(batch):
+                async with semaphore:
+                    self.requests += 1
+                    return await self.client.get_embeddings([text for _, text in batch])
+
+            results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+            new_keys = [key for batch in batches for key, _ in batch]
+            new_vectors = np.asarray([vector for result in results for vector in result], dtype=np.float32)
+            if self.cache is not None:
+                self.cache.put_many(new_keys, new_vectors, model=model)
+            for key, vector in zip(new_keys, new_vectors):
+                vectors[key] = vector
+                self._memory[key] = vector
+
+        return np.stack([vectors[key] for key in keys]) if keys else np.zeros((0, 0), dtype=np.float32)
+
+    async def similarity(self, candidates: Sequence[str], references: Sequence[str]) -> np.ndarray:
+        """Cosine similarity matrix of shape (len(candidates), len(references))."""
+        matrix = await self.embed(list(candidates) + list(references))
+        return cosine_similarity(matrix[:len(candidates)], matrix[len(candidates):])
+
+    async def score(self, text: str, references: Sequence[str]) -> float:
+        """Highest similarity between text and any reference."""
+        return float((await self.similarity([text], references)).max())
+
+    async def best_matches(self, candidates: Sequence[str], references: Sequence[str]) -> np.ndarray:
+        """For each reference, its highest similarity to any candidate."""
+        return (await self.similarity(candidates, references)).max(axis=0)
+
+    async def score_batch(self, texts: Sequence[str], references: Sequence[Sequence[str]]) -> List[float]:
+        """Best similarity of each text to its own references, embedding everything at once."""
+        flat = [ref for refs in references for ref in refs]
+        matrix = await self.embed(list(texts) + flat)
+        text_vectors, ref_vectors = matrix[:len(texts)], matrix[len(texts):]
+        scores = []
+        offset = 0
+        for i, refs in enumerate(references):
+            sims = cosine_similarity(text_vectors[i:i + 1], ref_vectors[offset:offset + len(refs)])
+            scores.append(float(sims.max()) if len(refs) else 0.0)
+            offset += len(refs)
+        return scores
+
+    def as_scorer(self, max_wait: float = 0.01) -> Callable[[str, Dict[str, Any]], Awaitable[float]]:
+        """Evaluation engine scorer for expected outputs with "references" (or "reference").
+
+        Returns 1.0 when the best similarity reaches the threshold, otherwise
+        the similarity itself as partial credit. Calls made within `max_wait`
+        seconds of each other (up to batch_size of them) are scored together
+        by one score_batch() call.
+        """
+        return _BatchedScorer(self, max_wait)
+
+class _BatchedScorer:
+    """Engine scorer that collects concurrent scoring calls into score_batch() calls."""
+
+    def __init__(self, scorer: SemanticScorer, max_wait: float):
+        self.scorer = scorer
+        self.max_wait = max_wait
+        self._pending: List[Tuple[str, List[str], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()  # running batches; the loop only keeps weak references
+
+    async def __call__(self, text: str, expected: Dict[str, Any]) -> float:
+        references = list(expected.get("references") or [expected["reference"]])
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, references, future))
+        if len(self._pending) >= self.scorer.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        similarity = await future
+        return 1.0 if similarity >= self.scorer.threshold else max(similarity, 0.0)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Run outside any one case's context, so its deadline does not bound the whole batch
+            task = contextvars.Context().run(asyncio.ensure_future, self._score(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, batch: List[Tuple[str, List[str], asyncio.Future]]):
+        try:
+            scores = await self.scorer.score_batch([text for text, _, _ in batch], [refs for _, refs, _ in batch])
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), score in zip(batch, scores):
+            if not future.done():
+                future.set_result(score)
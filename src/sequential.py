@@ -0,0 +1,148 @@
+"""Sequential testing of suite pass rates.
+
+Instead of executing every case, a suite's cases are evaluated in random
+order and evaluation stops as soon as the pass rate is known to be above or
+below the suite threshold with the requested confidence. For a regression
+check on an unchanged model that passes 95% of a 2000-case suite against an
+80% threshold, a few dozen cases settle the question.
+
+Two stopping rules are available:
+
+- ``wilson``: stop when the Wilson score interval on the pass rate lies
+  entirely above or below the threshold. The interval is only checked every
+  ``check_every`` samples after ``min_samples``, which limits (but does not
+  remove) the error inflation of repeatedly looking at the data.
+- ``sprt``: Wald's sequential probability ratio test of
+  ``p = threshold - delta`` against ``p = threshold + delta``, designed to be
+  checked after every sample, with error rates of ``1 - confidence``.
+
+When every case of a suite has been evaluated the pass rate is exact and the
+decision is made with confidence 1.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Tuple
+
+METHODS = ("wilson", "sprt")
+
+def wilson_interval(passed: int, n: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score interval for a pass rate of `passed` out of `n`."""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = passed / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+def score_test_confidence(passed: int, n: int, threshold: float) -> float:
+    """Largest confidence at which the Wilson interval excludes `threshold`."""
+    if n == 0 or not 0 < threshold < 1:
+        return 0.0
+    z = abs(passed / n - threshold) / math.sqrt(threshold * (1 - threshold) / n)
+    return 2 * NormalDist().cdf(z) - 1
+
+class SequentialTest:
+    """Decides whether a pass rate is above a threshold from as few samples as possible."""
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        method: str = "wilson",
+        confidence: float = 0.95,
+        min_samples: int = 20,
+        check_every: int = 10,
+        delta: float = 0.05,
+        population: Optional[int] = None
+    ):
+        """Initialize the test.
+
+        Args:
+            threshold: Pass rate the suite must reach
+            method: "wilson" (confidence interval) or "sprt" (probability ratio test)
+            confidence: Required confidence of the decision
+            min_samples: Samples before the Wilson interval is first checked
+            check_every: Samples between Wilson interval checks
+            delta: Half-width of the SPRT indifference region around the threshold
+            population: Number of cases available; the decision is exact once all are sampled
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown sequential method '{method}', expected one of {METHODS}")
+        if not 0 < threshold < 1:
+            raise ValueError("threshold must be between 0 and 1")
+        self.threshold = threshold
+        self.method = method
+        self.confidence = confidence
+        self.min_samples = min_samples
+        self.check_every = max(1, check_every)
+        self.population = population
+        self.samples = 0
+        self.passed = 0
+        self.decision: Optional[str] = None
+        self.achieved_confidence = 0.0
+
+        alpha = beta = 1 - confidence
+        self._p0 = max(1e-6, threshold - delta)
+        self._p1 = min(1 - 1e-6, threshold + delta)
+        self._accept_pass = math.log((1 - beta) / alpha)
+        self._accept_fail = math.log(beta / (1 - alpha))
+        self._log_ratio = 0.0
+
+    def add(self, passed: bool) -> Optional[str]:
+        """Record one case outcome; return "pass" or "fail" once decided, else None.
+
+        Outcomes added after the decision (cases already in flight when it was
+        made) still count towards the pass rate but do not change the decision.
+        """
+        self.samples += 1
+        self.passed += bool(passed)
+        if passed:
+            self._log_ratio += math.log(self._p1 / self._p0)
+        else:
+            self._log_ratio += math.log((1 - self._p1) / (1 - self._p0))
+
+        if self.decision is None:
+            self._check()
+        return self.decision
+
+    def _check(self):
+        if self.population is not None and self.samples >= self.population:
+            self._decide("pass" if self.pass_rate >= self.threshold else "fail", 1.0)
+        elif self.method == "sprt":
+            if self._log_ratio >= self._accept_pass:
+                self._decide("pass", self.confidence)
+            elif self._log_ratio <= self._accept_fail:
+                self._decide("fail", self.confidence)
+        elif self.samples >= self.min_samples and (self.samples - self.min_samples) % self.check_every == 0:
+            low, high = self.interval
+            if low >= self.threshold or high < self.threshold:
+                confidence = score_test_confidence(self.passed, self.samples, self.threshold)
+                self._decide("pass" if low >= self.threshold else "fail", confidence)
+
+    def _decide(self, decision: str, confidence: float):
+        self.decision = decision
+        self.achieved_confidence = confidence
+
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.samples if self.samples else 0.0
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        return wilson_interval(self.passed, self.samples, self.confidence)
+
+    def summary(self) -> Dict[str, Any]:
+        low, high = self.interval
+        return {
+            "method": self.method,
+            "decision": self.decision or "undecided",
+            "threshold": self.threshold,
+            "samples": self.samples,
+            "population": self.population,
+            "passed": self.passed,
+            "pass_rate": self.pass_rate,
+            "interval": [low, high],
+            "confidence": self.achieved_confidence,
+        }
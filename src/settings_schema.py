@@ -0,0 +1,82 @@
+"""Settings schema for the LLM evaluation framework.
+
+Imported lazily by ``src.config`` the first time a setting is read, so that
+pydantic is only loaded by code that actually needs configuration.
+"""
+
+from typing import List, Optional
+from pydantic import SecretStr, AnyHttpUrl
+from pydantic_settings import BaseSettings
+
+class Settings(BaseSettings):
+    """Application settings loaded from environment variables."""
+    
+    # API Configuration (only required by code that talks to a model)
+    api_base_url: Optional[AnyHttpUrl] = None
+    api_key: Optional[SecretStr] = None
+    model_name: Optional[str] = None  # Changed from llm_model_name to match env var
+    
+    # Provider Protocol
+    llm_provider: str = "openai-chat"  # or "openai-completions", "tgi", "llama.cpp"
+    system_prompt: str = "You are a helpful AI assistant for evaluating LLM capabilities."  # empty to send none
+    max_batch_prompts: int = 32  # prompts per request for providers with a multi-prompt endpoint
+    
+    # Load Balancing (several replicas of the same model)
+    api_base_urls: Optional[str] = None  # comma separated; overrides api_base_url when set
+    load_balancing: str = "least_outstanding"  # or "round_robin"
+    circuit_failure_threshold: int = 5  # consecutive failures that take a replica out of rotation
+    circuit_reset_seconds: float = 30.0  # seconds before a failed replica is tried again
+    health_probe_interval: float = 10.0  # seconds between health probes; 0 disables probing
+    
+    # Database Configuration
+    database_url: str = "sqlite:///database/llm_evaluation.db"
+    
+    # Test Configuration
+    test_timeout: int = 30  # seconds; default total deadline per request, including retries
+    connect_timeout: float = 5.0  # seconds to establish a connection
+    max_retries: int = 3
+    retry_delay: int = 1  # seconds
+
+    # Hedged Requests
+    hedge_requests: bool = False  # send a duplicate request when the first is slow
+    hedge_percentile: float = 95.0  # hedge after this percentile of recent latencies
+    hedge_min_samples: int = 20  # latencies observed before hedging starts
+    hedge_delay_ms: Optional[float] = None  # fixed hedge delay instead of the percentile
+    
+    # Sampling (pass@k)
+    samples_per_prompt: int = 1  # completions per prompt; >1 enables pass@k scoring
+    sampling_temperature: float = 0.8  # temperature used when samples_per_prompt > 1
+    pass_at_k: str = "1"  # comma separated k values, e.g. "1,5,10"
+    native_n_sampling: bool = True  # request all samples in one call via the `n` parameter
+    
+    # Semantic Scoring
+    embedding_model: Optional[str] = None  # defaults to "<model_name>-embedding"
+    embedding_batch_size: int = 64  # texts per /v1/embeddings request
+    embedding_cache_dir: str = ".embedding_cache"  # on-disk vector cache
+    semantic_threshold: float = 0.8  # cosine similarity counted as a match
+    
+    # Token Accounting
+    tokenizer_path: Optional[str] = None  # .tiktoken rank file; whitespace fallback if unset
+    prompt_cost_per_1k: float = 0.0  # cost per 1000 prompt tokens
+    completion_cost_per_1k: float = 0.0  # cost per 1000 completion tokens
+
+    model_config = {
+        'env_file': '.env',
+        'env_file_encoding': 'utf-8',
+        'protected_namespaces': ('settings_',)
+    }
+
+    def require_api(self):
+        """Raise if the settings needed to call a model API are missing."""
+        missing = [
+            name.upper() for name in ("api_base_url", "api_key", "model_name")
+            if getattr(self, name) is None and not (name == "api_base_url" and self.api_base_urls)
+        ]
+        if missing:
+            raise ValueError(f"Missing required settings: {', '.join(missing)} (set them in the environment or .env)")
+
+    def base_url_list(self) -> List[str]:
+        """All configured API base URLs: API_BASE_URLS if set, else API_BASE_URL."""
+        if self.api_base_urls:
+            return [url.strip() for url in self.api_base_urls.split(",") if url.strip()]
+        return [str(self.api_base_url)] if self.api_base_url else []
@@ -1,30 +1,16 @@
 from typing import Dict, List, Any
 import json
 from datetime import datetime
-import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 import os
 
+from .result_stream import MetricsAccumulator, ResultStreamWriter, iter_results, summarize_stream
+
 def calculate_model_metrics(test_results: List[Dict[str, Any]]) -> Dict[str, float]:
     """Calculate overall metrics from test results"""
-    total_tests = len(test_results)
-    if total_tests == 0:
-        return {
-            "coverage_rate": 0.0,
-            "success_rate": 0.0,
-            "partial_success_rate": 0.0
-        }
-
-    successful = sum(1 for r in test_results if r.get("outcome") == "passed")
-    partial = sum(1 for r in test_results if r.get("outcome") == "partial")
-    attempted = sum(1 for r in test_results if r.get("outcome") != "skipped")
-
-    return {
-        "coverage_rate": (attempted / total_tests) * 100,
-        "success_rate": (successful / total_tests) * 100,
-        "partial_success_rate": (partial / total_tests) * 100
-    }
+    accumulator = MetricsAccumulator()
+    for result in test_results:
+        accumulator.add(result)
+    return accumulator.metrics()
 
 def determine_run_status(metrics: Dict[str, float]) -> str:
     """Determine overall run status based on metrics"""
@@ -35,15 +21,48 @@ def determine_run_status(metrics: Dict[str, float]) -> str:
     else:
         return "insufficient_coverage"
 
+def write_metrics_report(stream_path: str, output_path: str, model_name: str, include_results: bool = True) -> Dict[str, Any]:
+    """Write test_metrics.json from a result stream without loading it into memory.
+
+    The stream is read twice: once for the summary, once to copy the results.
+    Returns the report header (everything except the results list).
+    """
+    accumulator = MetricsAccumulator()
+    metrics = summarize_stream(stream_path, accumulator)
+    header = {
+        "metrics": metrics,
+        "status": determine_run_status(metrics),
+        "model_name": model_name,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    pass_at_k = accumulator.pass_at_k()
+    if pass_at_k:
+        header["pass_at_k"] = pass_at_k
+
+    with open(output_path, "w") as f:
+        body = json.dumps(header, indent=2)
+        if not include_results:
+            f.write(body)
+            return header
+
+        f.write(body[:-2] + ',\n  "results": [')
+        for i, result in enumerate(iter_results(stream_path)):
+            f.write(("," if i else "") + "\n    " + json.dumps(result, default=str))
+        f.write("\n  ]\n}")
+    return header
+
 class TestResultAggregator:
-    def __init__(self, db_url: str):
+    def __init__(self, db_url: str, stream_path: str = "test_metrics.jsonl"):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        
         self.engine = create_engine(db_url)
         self.Session = sessionmaker(bind=self.engine)
-        self.current_results = []
+        self.stream = ResultStreamWriter(stream_path)
 
     def add_result(self, test_name: str, outcome: str, error_message: str = None, metrics: Dict[str, Any] = None):
         """Record a test result"""
-        self.current_results.append({
+        self.stream.write({
             "test_name": test_name,
             "outcome": outcome,
             "error_message": error_message,
@@ -53,7 +72,8 @@ class TestResultAggregator:
 
     def save_to_database(self, model_name: str, model_version: str = "latest"):
         """Save results to database and return metrics"""
-        metrics = calculate_model_metrics(self.current_results)
+        self.stream.close()
+        metrics = summarize_stream(self.stream.path)
         run_status = determine_run_status(metrics)
         
         session = self.Session()
@@ -66,7 +86,7 @@ class TestResultAggregator:
                 "run_timestamp": datetime.utcnow(),
                 "metrics": metrics,
                 "status": run_status,
-                "results": self.current_results
+                "results_path": self.stream.path
             }
             
             # Here you would use your actual database models and schema
@@ -82,7 +102,6 @@ class TestResultAggregator:
         
         finally:
             session.close()
-            self.current_results = []  # Clear results after saving
 
 def pytest_configure(config):
     """Initialize test aggregator at start of test run"""
@@ -93,6 +112,8 @@ def pytest_configure(config):
 def pytest_runtest_logreport(report):
     """Record test results as they complete"""
     if report.when == "call":  # Only process the test result after it's done
+        import pytest
+        
         aggregator = pytest.config.pluginmanager.get_plugin("result_aggregator")
         
         outcome = "passed" if report.passed else "failed"
@@ -113,13 +134,7 @@ def pytest_sessionfinish(session):
     """Process final results at end of test run"""
     aggregator = session.config.pluginmanager.get_plugin("result_aggregator")
     model_name = os.getenv("MODEL_NAME", "unknown_model")
-    metrics, status = aggregator.save_to_database(model_name)
+    aggregator.save_to_database(model_name)
     
     # Write metrics to a file that GitHub Actions can read
-    with open("test_metrics.json", "w") as f:
-        json.dump({
-            "metrics": metrics,
-            "status": status,
-            "model_name": model_name,
-            "timestamp": datetime.utcnow().isoformat()
-        }, f, indent=2)
\ No newline at end of file
+    write_metrics_report(aggregator.stream.path, "test_metrics.json", model_name, include_results=False)
\ No newline at end of file
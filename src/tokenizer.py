@@ -0,0 +1,165 @@
+"""Token counting for throughput and cost metrics.
+
+Provides a BPE tokenizer compatible with tiktoken's ``.tiktoken`` rank files
+(one ``<base64 token> <rank>`` pair per line) and a whitespace fallback used
+when no tokenizer file is configured. Counts are memoized in an LRU cache
+because the same prompts are counted repeatedly across runs.
+"""
+
+import base64
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+try:  # the third-party regex module understands \p{L}/\p{N} classes
+    import regex as _regex
+except ImportError:  # pragma: no cover - depends on environment
+    _regex = None
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on environment
+    tiktoken = None
+
+# Pre-tokenization pattern used by cl100k_base
+CL100K_PATTERN = (
+    r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|[^\r\n\p{L}\p{N}]?\p{L}+|\p{N}{1,3}|"""
+    r""" ?[^\s\p{L}\p{N}]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+)
+
+# Equivalent of CL100K_PATTERN for the stdlib re module (letters are [^\W\d_])
+_CL100K_PATTERN_STDLIB = (
+    r"""(?i:'s|'t|'re|'ve|'m|'ll|'d)|(?:[^\r\n\w]|_)?[^\W\d_]+|\d{1,3}|"""
+    r""" ?(?:[^\s\w]|_)+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"""
+)
+
+def _compile_pattern(pattern: str):
+    """Compile a pre-tokenization pattern, falling back to stdlib re without `regex`."""
+    if _regex is not None:
+        return _regex.compile(pattern)
+    if pattern == CL100K_PATTERN:
+        pattern = _CL100K_PATTERN_STDLIB
+    return re.compile(pattern)
+
+class Tokenizer:
+    """Base class for tokenizers with cached, batched counting."""
+
+    name = "base"
+
+    def __init__(self, cache_size: int = 4096):
+        """Initialize the tokenizer with an LRU cache for token counts."""
+        self._cached_count = lru_cache(maxsize=cache_size)(self._count)
+
+    def _count(self, text: str) -> int:
+        raise NotImplementedError
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in text."""
+        if not text:
+            return 0
+        return self._cached_count(text)
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        """Count tokens for many texts, counting each distinct text once."""
+        counts = {text: self.count(text) for text in set(texts)}
+        return [counts[text] for text in texts]
+
+    def cache_info(self):
+        """Return hit/miss statistics for the count cache."""
+        return self._cached_count.cache_info()
+
+class WhitespaceTokenizer(Tokenizer):
+    """Approximate tokenizer that counts whitespace-separated words."""
+
+    name = "whitespace"
+
+    def _count(self, text: str) -> int:
+        return len(text.split())
+
+class BPETokenizer(Tokenizer):
+    """Byte-level BPE tokenizer using tiktoken-style mergeable ranks."""
+
+    name = "bpe"
+
+    def __init__(self, mergeable_ranks: Dict[bytes, int], pattern: str = CL100K_PATTERN, cache_size: int = 4096):
+        """Initialize the tokenizer from a mapping of token bytes to merge rank."""
+        super().__init__(cache_size)
+        self.ranks = mergeable_ranks
+        self.pattern = pattern
+        self._split = _compile_pattern(pattern)
+        self._piece_cache: Dict[bytes, int] = {}
+        self._encoding = None
+        if tiktoken is not None:
+            self._encoding = tiktoken.Encoding(
+                name="local-bpe",
+                pat_str=pattern,
+                mergeable_ranks=mergeable_ranks,
+                special_tokens={}
+            )
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "BPETokenizer":
+        """Load ranks from a ``.tiktoken`` file on disk."""
+        ranks: Dict[bytes, int] = {}
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                token, rank = line.split()
+                ranks[base64.b64decode(token)] = int(rank)
+        return cls(ranks, **kwargs)
+
+    def _merge_piece(self, piece: bytes) -> int:
+        """Apply BPE merges to one pre-tokenized piece and return its token count."""
+        if piece in self.ranks:
+            return 1
+        cached = self._piece_cache.get(piece)
+        if cached is not None:
+            return cached
+
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best_rank = None
+            best_index = -1
+            for i in range(len(parts) - 1):
+                rank = self.ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = i
+            if best_rank is None:
+                break
+            parts[best_index:best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+
+        self._piece_cache[piece] = len(parts)
+        return len(parts)
+
+    def _count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode_ordinary(text))
+        return sum(
+            self._merge_piece(piece.encode("utf-8"))
+            for piece in self._split.findall(text)
+        )
+
+    def count_batch(self, texts: Sequence[str]) -> List[int]:
+        """Count tokens for many texts, using tiktoken's threaded batch encoder when available."""
+        if self._encoding is None:
+            return super().count_batch(texts)
+        unique = list(set(texts))
+        encoded = self._encoding.encode_ordinary_batch(unique)
+        counts = {text: len(tokens) for text, tokens in zip(unique, encoded)}
+        return [counts[text] for text in texts]
+
+_default_tokenizer: Optional[Tokenizer] = None
+
+def get_tokenizer() -> Tokenizer:
+    """Return the configured tokenizer (BPE if TOKENIZER_PATH is set, else whitespace)."""
+    global _default_tokenizer
+    if _default_tokenizer is None:
+        from .config import settings
+
+        if settings.tokenizer_path:
+            _default_tokenizer = BPETokenizer.from_file(settings.tokenizer_path)
+        else:
+            _default_tokenizer = WhitespaceTokenizer()
+    return _default_tokenizer
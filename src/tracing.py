@@ -0,0 +1,276 @@
+"""Lightweight tracing spans for the LLM evaluation framework.
+
+Spans follow the OpenTelemetry data model closely enough that they can be
+shipped to an OTLP/HTTP collector, but no OpenTelemetry SDK is required.
+Tracing is disabled until an exporter is configured, in which case creating
+a span costs little more than a context manager.
+"""
+
+import atexit
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+@dataclass
+class Span:
+    """A single timed operation."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time_ns: int = 0
+    end_time_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "ok"
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration of the span in milliseconds (0 while still open)."""
+        if self.end_time_ns is None:
+            return 0.0
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any):
+        """Set a single span attribute."""
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        """Set several span attributes at once."""
+        self.attributes.update(attributes)
+
+    def record_error(self, exc: BaseException):
+        """Mark the span as failed with the given exception."""
+        self.status = "error"
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the span to a flat dictionary."""
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "status": self.status,
+            "error": self.error,
+        }
+
+class SpanExporter:
+    """Base class for span exporters."""
+
+    def export(self, spans: List[Span]):
+        """Export a batch of finished spans."""
+        raise NotImplementedError
+
+    def shutdown(self):
+        """Release any resources held by the exporter."""
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a local JSONL file."""
+
+    def __init__(self, path: str = "traces.jsonl"):
+        """Initialize the exporter with the output file path."""
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        """Write each span as one JSON line."""
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+
+class OTLPSpanExporter(SpanExporter):
+    """Send spans to an OTLP/HTTP collector using the JSON encoding."""
+
+    def __init__(self, endpoint: str = "http://localhost:4318", service_name: str = "llm-evaluation"):
+        """Initialize the exporter with the collector base URL."""
+        self.endpoint = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+
+    @staticmethod
+    def _attribute_value(value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"boolValue": value}
+        if isinstance(value, int):
+            return {"intValue": str(value)}
+        if isinstance(value, float):
+            return {"doubleValue": value}
+        return {"stringValue": str(value)}
+
+    def _encode(self, spans: List[Span]) -> Dict[str, Any]:
+        otlp_spans = []
+        for span in spans:
+            otlp_span = {
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(span.start_time_ns),
+                "endTimeUnixNano": str(span.end_time_ns or span.start_time_ns),
+                "attributes": [
+                    {"key": k, "value": self._attribute_value(v)}
+                    for k, v in span.attributes.items()
+                ],
+                "status": {"code": 2, "message": span.error or ""} if span.status == "error" else {"code": 1},
+            }
+            if span.parent_id:
+                otlp_span["parentSpanId"] = span.parent_id
+            otlp_spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]
+                },
+                "scopeSpans": [{"scope": {"name": "src.tracing"}, "spans": otlp_spans}]
+            }]
+        }
+
+    def export(self, spans: List[Span]):
+        """POST the batch to the collector; failures are swallowed."""
+        import httpx
+
+        try:
+            httpx.post(self.endpoint, json=self._encode(spans), timeout=5)
+        except httpx.HTTPError:
+            pass
+
+class Tracer:
+    """Create spans and hand finished ones to the configured exporters."""
+
+    def __init__(self, exporters: Optional[List[SpanExporter]] = None, batch_size: int = 64):
+        """Initialize the tracer with an optional list of exporters."""
+        self.exporters: List[SpanExporter] = list(exporters or [])
+        self.batch_size = batch_size
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any exporter is configured."""
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: SpanExporter):
+        """Register an additional exporter."""
+        self.exporters.append(exporter)
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Start a span as a child of the current span, without activating it."""
+        parent = _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_time_ns=time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+
+    def end_span(self, span: Span):
+        """Finish a span and queue it for export."""
+        span.end_time_ns = time.time_ns()
+        if not self.enabled:
+            return
+        with self._lock:
+            self._buffer.append(span)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self._export(batch)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Context manager that activates a span for the duration of the block."""
+        span = self.start_span(name, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    def flush(self):
+        """Export all buffered spans immediately."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._export(batch)
+
+    def shutdown(self):
+        """Flush buffered spans and shut down the exporters."""
+        self.flush()
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+    def _export(self, batch: List[Span]):
+        for exporter in self.exporters:
+            exporter.export(batch)
+
+def current_span() -> Optional[Span]:
+    """Return the active span, if any."""
+    return _current_span.get()
+
+def prompt_hash(prompt: str) -> str:
+    """Short stable hash used to identify prompts in span attributes."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """Decorator that wraps a sync or async function in a span."""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(span_name, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+logger = logging.getLogger(__name__)
+
+def _exporters_from_env() -> List[SpanExporter]:
+    """Build exporters from TRACE_EXPORTER (comma separated: file, otlp)."""
+    exporters: List[SpanExporter] = []
+    for kind in filter(None, (k.strip() for k in os.environ.get("TRACE_EXPORTER", "").split(","))):
+        if kind == "file":
+            exporters.append(FileSpanExporter(os.environ.get("TRACE_FILE", "traces.jsonl")))
+        elif kind == "otlp":
+            exporters.append(OTLPSpanExporter(os.environ.get("OTLP_ENDPOINT", "http://localhost:4318")))
+        else:
+            # A typo in the environment must not break every entry point at import time
+            logger.warning("Ignoring unsupported trace exporter %r in TRACE_EXPORTER", kind)
+    return exporters
+
+# Global tracer instance
+tracer = Tracer(_exporters_from_env())
+atexit.register(tracer.shutdown)
@@ -1,6 +1,7 @@
 """Shared pytest fixtures for the test suite."""
 
 import pytest
+import sys
 import uuid
 import os
 from datetime import datetime
@@ -8,19 +9,148 @@ import json
 
 from src.llm_client import LLMClient
 from src.database import get_session, ModelRegistry, UnitTestSuite
+from src.checkpoint import RunCheckpoint
 from src.config import settings
+from src.tracing import tracer
+from src.test_aggregator import write_metrics_report
+from src.result_stream import ResultStreamWriter
+from src.sandbox import SandboxPool
+from src.mock_server import MockServer
+from src.semantic_scorer import SemanticScorer, VectorCache
+from src.fingerprint import compute_fingerprint, find_reusable_result, model_identity, module_sources
 
 # Global variable to store test results
 class TestResults:
     def __init__(self):
-        self.results = []
+        self.stream = None
         self.current_test = None
+        self.reuse_session = None  # database session when --reuse-unchanged is active
+        self.checkpoint = None  # RunCheckpoint recording every result (--checkpoint, --resume, --reuse-unchanged)
+        self.owns_run = True  # False in parallel workers: the parent process finishes the run
+        self.run = None
 
 test_results = TestResults()
 
+def _stream_path():
+    """Result stream location; TEST_RESULTS_COMPRESS=1 switches to gzip."""
+    path = os.getenv("TEST_RESULTS_STREAM", "test_metrics.jsonl")
+    if os.getenv("TEST_RESULTS_COMPRESS") == "1" and not path.endswith(".gz"):
+        path += ".gz"
+    return path
+
+def pytest_addoption(parser):
+    """Register framework command line options."""
+    parser.addoption(
+        "--reuse-unchanged",
+        action="store_true",
+        default=False,
+        help="Reuse the last recorded result of tests whose prompts, scoring code and model are unchanged"
+    )
+    parser.addoption(
+        "--checkpoint",
+        action="store_true",
+        default=False,
+        help="Record every result in the database as it completes, so an interrupted run can be resumed"
+    )
+    parser.addoption(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume a checkpointed run: only tests without a recorded result are run"
+    )
+    parser.addoption(
+        "--retry-failed",
+        action="store_true",
+        default=False,
+        help="With --resume, run the tests that failed in the earlier part again"
+    )
+
 def pytest_configure(config):
     """Initial test session configuration."""
-    test_results.results = []
+    test_results.stream = ResultStreamWriter(_stream_path())
+
+    if config.option.collectonly:
+        # Nothing will run, so there is no run to record
+        return
+
+    reuse = config.getoption("--reuse-unchanged", default=False)
+    resume = config.getoption("--resume", default=None)
+    worker_run = os.getenv("CHECKPOINT_RUN_ID")  # set by the parallel runner for its workers
+    if worker_run:
+        test_results.checkpoint = RunCheckpoint.attach(get_session(), worker_run)
+        test_results.owns_run = False
+    elif resume:
+        test_results.checkpoint = RunCheckpoint.resume(get_session(), resume)
+    elif reuse or config.getoption("--checkpoint", default=False):
+        test_results.checkpoint = RunCheckpoint.start(
+            get_session(),
+            {"model_name": settings.model_name, "mode": "reuse_unchanged" if reuse else "pytest"}
+        )
+    if test_results.checkpoint is not None:
+        test_results.run = test_results.checkpoint.run
+        if reuse:
+            test_results.reuse_session = test_results.checkpoint.session
+
+def pytest_collection_modifyitems(session, config, items):
+    """On --resume, deselect tests the run already finished and carry their results over."""
+    if not config.getoption("--resume", default=None) or test_results.checkpoint is None:
+        return
+    done = test_results.checkpoint.completed(retry_failed=config.getoption("--retry-failed", default=False))
+    finished = [item for item in items if item.nodeid in done]
+    if not finished:
+        return
+    # The earlier results go into this run's stream so the final report covers both parts
+    for item in finished:
+        test_results.stream.write(done[item.nodeid])
+    items[:] = [item for item in items if item.nodeid not in done]
+    config.hook.pytest_deselected(items=finished)
+
+def _test_fingerprint(item):
+    """Fingerprint a test from its source and fixtures, the scoring code it uses and the model."""
+    module = sys.modules[item.function.__module__]
+    return compute_fingerprint(
+        {"test": item.nodeid, "params": getattr(item, "callspec", None) and item.callspec.id},
+        module_sources(module, sys.modules[__name__]),
+        model_identity(
+            settings.model_name,
+            settings.api_base_url or settings.api_base_urls,
+            os.getenv("MODEL_VERSION"),
+            {
+                "llm_provider": settings.llm_provider,
+                "system_prompt": settings.system_prompt,
+                "samples_per_prompt": settings.samples_per_prompt,
+                "sampling_temperature": settings.sampling_temperature,
+                "pass_at_k": settings.pass_at_k,
+                "embedding_model": settings.embedding_model,
+                "semantic_threshold": settings.semantic_threshold
+            }
+        )
+    )
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Replay the previous outcome of an unchanged test instead of calling the model."""
+    if test_results.reuse_session is None:
+        return None
+
+    fingerprint = _test_fingerprint(pyfuncitem)
+    pyfuncitem.user_properties.append(("fingerprint", fingerprint))
+    previous = find_reusable_result(test_results.reuse_session, pyfuncitem.nodeid, fingerprint)
+    if previous is None:
+        return None
+
+    pyfuncitem.user_properties.append(("reused_from", str(previous.run_id)))
+    if not previous.pass_fail:
+        pytest.fail(f"Reused failure from run {previous.run_id}: {previous.result_value.get('error_message')}")
+    return True
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Wrap each test body in a root tracing span."""
+    with tracer.span("test", test_name=item.nodeid) as span:
+        outcome = yield
+        if outcome.excinfo is not None:
+            span.record_error(outcome.excinfo[1])
 
 def pytest_runtest_logreport(report):
     """Process individual test results."""
@@ -31,6 +161,7 @@ def pytest_runtest_logreport(report):
             outcome = "partial"
             
         # Create result entry
+        properties = dict(report.user_properties)
         result = {
             "test_name": report.nodeid,
             "outcome": outcome,
@@ -38,49 +169,51 @@ def pytest_runtest_logreport(report):
             "duration": report.duration,
             "timestamp": datetime.utcnow().isoformat()
         }
+        if properties:
+            result["properties"] = properties
+        
+        test_results.stream.write(result)
         
-        test_results.results.append(result)
+        if test_results.checkpoint is not None:
+            _record_result(result, properties)
+
+def _record_result(result, properties):
+    """Checkpoint a result; its fingerprint lets later --reuse-unchanged runs reuse it."""
+    test_results.checkpoint.record({
+        **result,
+        **{key: properties[key] for key in ("fingerprint", "reused_from") if key in properties}
+    })
 
 def pytest_sessionfinish(session, exitstatus):
     """Process final results at end of test session."""
-    # Calculate metrics
-    total_tests = len(test_results.results)
-    if total_tests > 0:
-        successful = sum(1 for r in test_results.results if r["outcome"] == "passed")
-        partial = sum(1 for r in test_results.results if r["outcome"] == "partial")
-        attempted = sum(1 for r in test_results.results if r["outcome"] != "skipped")
-        
-        metrics = {
-            "coverage_rate": (attempted / total_tests) * 100,
-            "success_rate": (successful / total_tests) * 100,
-            "partial_success_rate": (partial / total_tests) * 100
-        }
-        
-        # Determine overall status
-        if metrics["coverage_rate"] >= 80:
-            status = "success"
-        elif metrics["coverage_rate"] >= 50:
-            status = "partial"
-        else:
-            status = "insufficient_coverage"
-
-        # Save metrics to file
+    tracer.flush()
+
+    test_results.stream.close()
+    if test_results.stream.count:
+        # Summarize the streamed results (TEST_METRICS_PATH lets parallel workers write separately)
         model_name = os.getenv("MODEL_NAME", "unknown_model")
-        output = {
-            "metrics": metrics,
-            "status": status,
-            "model_name": model_name,
-            "timestamp": datetime.utcnow().isoformat(),
-            "results": test_results.results
-        }
+        output = write_metrics_report(
+            test_results.stream.path,
+            os.getenv("TEST_METRICS_PATH", "test_metrics.json"),
+            model_name
+        )
+        metrics, status = output["metrics"], output["status"]
 
-        with open("test_metrics.json", "w") as f:
-            json.dump(output, f, indent=2)
+        if test_results.checkpoint is not None and test_results.owns_run:
+            test_results.checkpoint.finish(status, {"metrics": metrics})
 
         # Log metrics for visibility
         print(f"Metrics for {model_name}: {json.dumps(metrics, indent=2)}")
         print(f"Run status: {status}")
 
+    if test_results.checkpoint is not None:
+        test_results.checkpoint.close()
+
+def pytest_terminal_summary(terminalreporter):
+    """Show the run ID of a checkpointed run, for --resume."""
+    if test_results.checkpoint is not None and test_results.owns_run:
+        terminalreporter.write_line(f"Evaluation run {test_results.checkpoint.run_id} (resume with --resume)")
+
 # Database Fixtures
 @pytest.fixture(scope="session")
 def db_session():
@@ -91,11 +224,33 @@ def db_session():
     finally:
         session.close()
 
+@pytest.fixture(scope="session")
+def sandbox_pool():
+    """Pre-forked workers for executing generated code."""
+    with SandboxPool(workers=min(4, os.cpu_count() or 1)) as pool:
+        yield pool
+
+@pytest.fixture
+def mock_server():
+    """A local mock model server; configure it through mock_server.config."""
+    with MockServer() as server:
+        yield server
+
 @pytest.fixture
 def llm_client():
     """Create an LLM client instance."""
     return LLMClient()
 
+@pytest.fixture(scope="session")
+def vector_cache():
+    """On-disk embedding cache shared by all tests."""
+    return VectorCache(settings.embedding_cache_dir)
+
+@pytest.fixture
+def semantic_scorer(llm_client, vector_cache):
+    """Embedding similarity scorer using the shared vector cache."""
+    return SemanticScorer(llm_client, vector_cache)
+
 @pytest.fixture
 def test_model(db_session):
     """Create a test model in the registry."""
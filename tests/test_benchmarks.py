@@ -0,0 +1,51 @@
+"""Tests for the framework benchmark suite and its regression check."""
+
+import builtins
+
+from benchmarks.bench_framework import compare, run_benchmarks
+
+def test_compare_flags_regressions_in_either_direction():
+    """Slower timings and lower throughput beyond the tolerance are regressions."""
+    baseline = {
+        "latency": {"value": 100.0, "unit": "ms", "higher_is_better": False},
+        "throughput": {"value": 100.0, "unit": "prompts/s", "higher_is_better": True},
+    }
+    ok = {
+        "latency": {"value": 110.0, "unit": "ms", "higher_is_better": False},
+        "throughput": {"value": 130.0, "unit": "prompts/s", "higher_is_better": True},
+        "new": {"value": 1.0, "unit": "ms", "higher_is_better": False},
+    }
+    assert compare(ok, baseline, tolerance=0.25) == []
+
+    slow = {
+        "latency": {"value": 150.0, "unit": "ms", "higher_is_better": False},
+        "throughput": {"value": 60.0, "unit": "prompts/s", "higher_is_better": True},
+    }
+    regressions = compare(slow, baseline, tolerance=0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("latency")
+
+def test_quick_run_produces_every_benchmark():
+    """A quick run covers the client, metrics, monitor, database and report paths."""
+    results = run_benchmarks(quick=True)
+    assert set(results) == {
+        "client.generate.quick", "metrics.summary_10k.quick", "metrics.summary_1m.quick",
+        "monitor.add_metric.quick", "database.persist_results.quick", "report.write.quick",
+    }
+    assert all(result["value"] > 0 for result in results.values())
+    assert results["client.generate.quick"]["p99_ms"] >= results["client.generate.quick"]["p50_ms"]
+
+def test_repeated_runs_report_the_median(monkeypatch):
+    """Every benchmark is run --repeat times; benchmarks of missing modules are skipped."""
+    real_import = builtins.__import__
+
+    def without_mock_server(name, *args, **kwargs):
+        if name == "src.mock_server":
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", without_mock_server)
+    results = run_benchmarks(quick=True, repeat=3)
+    assert "client.generate.quick" not in results
+    for result in results.values():
+        assert len(result["runs"]) == 3 and result["value"] == sorted(result["runs"])[1]
@@ -0,0 +1,94 @@
+"""Tests for checkpointed, resumable evaluation runs."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.checkpoint import RunCheckpoint
+from src.database import Base, EvaluationRun
+from src.evaluation_engine import CaseResult, EvaluationCase
+from src.result_stream import iter_results
+
+CRASHING_TESTS = '''
+import os
+
+def test_a():
+    pass
+
+def test_b():
+    if os.environ.get("CRASH_IN_B"):
+        os._exit(1)
+
+def test_c():
+    assert False
+'''
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'eval.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+def _record(name, outcome):
+    return {"test_name": name, "outcome": outcome, "duration": 0.5, "error_message": None}
+
+def test_resume_returns_latest_finished_results(session_factory):
+    """Resuming sees every recorded case except skipped (and, optionally, failed) ones."""
+    checkpoint = RunCheckpoint.start(session_factory(), {"mode": "test"})
+    for record in (_record("a", "failed"), _record("a", "passed"), _record("b", "failed"), _record("c", "skipped")):
+        checkpoint.record(record)
+    checkpoint.close()
+
+    resumed = RunCheckpoint.resume(session_factory(), checkpoint.run_id)
+    assert {name: r["outcome"] for name, r in resumed.completed().items()} == {"a": "passed", "b": "failed"}
+    assert list(resumed.completed(retry_failed=True)) == ["a"]
+    resumed.finish("success", {"metrics": {"coverage_rate": 100.0}})
+    resumed.close()
+
+    run = session_factory().query(EvaluationRun).one()
+    assert (run.run_status, run.run_metadata["resumed"], run.run_metadata["mode"]) == ("success", 1, "test")
+
+    with pytest.raises(ValueError):
+        RunCheckpoint.resume(session_factory(), "00000000-0000-0000-0000-000000000000")
+
+def test_case_result_round_trips_through_record():
+    """A checkpointed record rebuilds the same result for the merged report."""
+    case = EvaluationCase("1", "s::1", "t", {"prompt": "2+2?"}, {"result": 4}, suite_name="s")
+    result = CaseResult(case, passed=True, score=1.0, response_text="4", latency_ms=250.0)
+    restored = CaseResult.from_record(case, json.loads(json.dumps(result.to_record())))
+    assert (restored.passed, restored.score, restored.response_text, restored.latency_ms) == (True, 1.0, "4", 250.0)
+
+def test_pytest_run_resumes_after_crash(tmp_path, session_factory):
+    """A run killed mid-way is resumed by ID; only unfinished tests run and the report covers all."""
+    test_file = tmp_path / "test_crashing.py"
+    test_file.write_text(CRASHING_TESTS)
+    stream_path = tmp_path / "results.jsonl"
+    report_path = tmp_path / "test_metrics.json"
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tmp_path / 'eval.db'}",
+        TEST_RESULTS_STREAM=str(stream_path),
+        TEST_METRICS_PATH=str(report_path)
+    )
+    command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "-p", "tests.conftest",
+               "--rootdir", str(tmp_path), str(test_file)]
+
+    crashed = subprocess.run(command + ["--checkpoint"], env={**env, "CRASH_IN_B": "1"}, capture_output=True)
+    assert crashed.returncode != 0 and not report_path.exists()
+    run_id = str(session_factory().query(EvaluationRun).one().run_id)
+
+    resumed = subprocess.run(command + ["--resume", run_id], env=env, capture_output=True, text=True)
+    assert "1 deselected" in resumed.stdout
+    assert run_id in resumed.stdout
+
+    outcomes = {r["test_name"].split("::")[-1]: r["outcome"] for r in iter_results(str(stream_path))}
+    assert outcomes == {"test_a": "passed", "test_b": "passed", "test_c": "failed"}
+    with open(report_path) as f:
+        assert len(json.load(f)["results"]) == 3
+    run = session_factory().query(EvaluationRun).one()
+    assert run.run_status != "running" and run.run_metadata["resumed"] == 1
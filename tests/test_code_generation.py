@@ -2,39 +2,45 @@
 
 import pytest
 import ast
-import json
+import asyncio
 from typing import List, Dict
-import re
 
 from src.llm_client import LLMClient
 from src.database import get_session, UnitTestSuite
+from src import extraction
+from src.config import settings
+from src.keyword_scorer import compile_keywords
+from src.sampling import mean_pass_at_k, parse_k_values, pass_at_k_scores, sample_texts
+from src.tracing import traced
 
-def extract_code_block(text: str) -> str:
-    """Extract code from markdown-style code blocks or plain text."""
-    # Try to find Python code blocks
-    code_block_match = re.search(r'```(?:python)?\s*(.*?)\s*```', text, re.DOTALL)
-    if code_block_match:
-        return code_block_match.group(1).strip()
-    
-    # If no code blocks found, try to extract based on indentation
-    lines = text.split('\n')
-    code_lines = []
-    in_code = False
-    
-    for line in lines:
-        if line.strip().startswith('def ') or line.strip().startswith('class '):
-            in_code = True
-        if in_code:
-            code_lines.append(line)
-            
-    if code_lines:
-        return '\n'.join(code_lines)
-        
-    # If no clear code blocks found, return the stripped text
-    return text.strip()
+# Traced here so scoring shows up in test spans; bulk scoring calls the untraced version
+extract_code_block = traced("scoring.extract_code_block")(extraction.extract_code_block)
+
+async def _check_function_sample(raw_text, case, sandbox_pool):
+    """Run all checks on one sample; returns the failure message, or None if it passes."""
+    code = extract_code_block(raw_text.strip())
+    
+    # Check for required code elements
+    for element in case["required_elements"]:
+        if element not in code:
+            return f"Missing required code element: {element}"
+    
+    # Validate code is syntactically correct
+    try:
+        ast.parse(code)
+    except SyntaxError as e:
+        return f"Generated code has syntax error: {e}\nCode:\n{code}"
+    
+    # Execute the generated function against the test inputs
+    result = await sandbox_pool.run_async(
+        code, case["function_name"], case["test_inputs"], case["expected_outputs"]
+    )
+    if not result.all_passed:
+        return f"{case['function_name']} failed: {result.error or result.outputs}\nCode:\n{code}"
+    return None
 
 @pytest.mark.asyncio
-async def test_function_implementation(llm_client, db_session):
+async def test_function_implementation(llm_client, db_session, sandbox_pool, record_property):
     """Test implementation of basic functions."""
     client = llm_client  # Removed await
     
@@ -45,6 +51,7 @@ async def test_function_implementation(llm_client, db_session):
             in the Fibonacci sequence. The function should handle inputs n ≥ 1.
             Return the code in a Python code block.
             """,
+            "function_name": "fibonacci",
             "test_inputs": [1, 2, 3, 4, 5, 6],
             "expected_outputs": [1, 1, 2, 3, 5, 8],
             "required_elements": ["def fibonacci", "return"]
@@ -56,31 +63,28 @@ async def test_function_implementation(llm_client, db_session):
             should ignore spaces and be case-insensitive.
             Return the code in a Python code block.
             """,
+            "function_name": "is_palindrome",
             "test_inputs": ["radar", "A man a plan a canal Panama", "hello"],
             "expected_outputs": [True, True, False],
             "required_elements": ["def is_palindrome", "return", "lower()"]
         }
     ]
     
+    ks = parse_k_values(settings.pass_at_k)
+    per_case_scores = []
+    
     for case in test_cases:
-        response = await client.generate(
-            prompt=case["prompt"],
-            max_tokens=300,
-            temperature=0.0
-        )
-        
-        raw_code = response["choices"][0]["text"].strip()
-        code = extract_code_block(raw_code)
+        texts = await sample_texts(client, case["prompt"], max_tokens=300)
+        failures = await asyncio.gather(*(
+            _check_function_sample(text, case, sandbox_pool) for text in texts
+        ))
+        per_case_scores.append(pass_at_k_scores([f is None for f in failures], ks))
         
-        # Check for required code elements
-        for element in case["required_elements"]:
-            assert element in code, f"Missing required code element: {element}"
-        
-        # Validate code is syntactically correct
-        try:
-            ast.parse(code)
-        except SyntaxError as e:
-            pytest.fail(f"Generated code has syntax error: {e}\nCode:\n{code}")
+        # With sampling enabled, one passing sample is enough for the test to pass
+        if all(failures):
+            pytest.fail(failures[0])
+    
+    record_property("pass_at_k", mean_pass_at_k(per_case_scores))
 
 @pytest.mark.asyncio
 async def test_algorithm_solutions(llm_client, db_session):
@@ -133,10 +137,11 @@ async def test_algorithm_solutions(llm_client, db_session):
         except SyntaxError as e:
             pytest.fail(f"Generated {algo['name']} code has syntax error: {e}\nCode:\n{code}")
         
-        # Check for algorithm-specific requirements
+        # Check for algorithm-specific requirements; identifiers like merge_sort
+        # should still count as mentioning "merge", so match substrings
         for req in algo["requirements"]:
-            assert any(keyword in code.lower() for keyword in req.lower().split()), \
-                f"Missing requirement: {req}"
+            scorer = compile_keywords(req.split(), mode="any")
+            assert scorer.score(code) == 1.0, f"Missing requirement: {req}"
 
 @pytest.mark.asyncio
 async def test_code_refactoring(llm_client, db_session):
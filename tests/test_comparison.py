@@ -0,0 +1,132 @@
+"""Tests for multi-model comparison runs and per-endpoint clients."""
+
+import asyncio
+import json
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.comparison import ComparisonRunner, ModelEndpoint, load_endpoints
+from src.database import Base, EvaluationRun, ModelRegistry, TestResult
+from src.evaluation_engine import EvaluationCase
+from src.llm_client import LLMClient
+from src.rate_limiter import RateLimiter
+
+class FakeModel:
+    """Answers every prompt with a fixed text, tracking how many calls overlap."""
+
+    active = 0
+    max_active = 0
+
+    def __init__(self, answer, delay=0.05):
+        self.answer = answer
+        self.delay = delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+        FakeModel.active += 1
+        FakeModel.max_active = max(FakeModel.max_active, FakeModel.active)
+        await asyncio.sleep(self.delay)
+        FakeModel.active -= 1
+        return {"choices": [{"text": self.answer, "finish_reason": "stop"}]}
+
+    async def analyze_response(self, response):
+        return {}
+
+class FakeEndpoint(ModelEndpoint):
+    answer: str = ""
+
+    def create_client(self):
+        return FakeModel(self.answer)
+
+def _endpoint(name, answer):
+    endpoint = FakeEndpoint(name=name, model_name=f"{name}-model", model_version="1")
+    endpoint.answer = answer
+    return endpoint
+
+def test_client_endpoint_overrides():
+    """Clients can target an endpoint other than the global settings."""
+    client = LLMClient(base_url="http://other:8000", api_key="k", model_name="other-model")
+    assert client.base_url == "http://other:8000/"
+    assert client.api_key == "k"
+    assert client.model_name == "other-model"
+    # The overrides belong to that client only
+    assert LLMClient(base_url="http://h", api_key="k", model_name="m").model_name == "m"
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests():
+    """Requests beyond the burst wait for the bucket to refill."""
+    limiter = RateLimiter(requests_per_second=20, burst=2)
+    start = time.monotonic()
+    for _ in range(4):
+        async with limiter:
+            pass
+    assert time.monotonic() - start >= 0.09
+
+@pytest.mark.asyncio
+async def test_rate_limiter_caps_concurrency():
+    """No more than max_concurrency holders at once."""
+    limiter = RateLimiter(max_concurrency=2)
+    active = peak = 0
+
+    async def task():
+        nonlocal active, peak
+        async with limiter:
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(task() for _ in range(6)))
+    assert peak == 2
+
+def test_load_endpoints(tmp_path, monkeypatch):
+    """Endpoints load from JSON, with keys taken from the environment."""
+    path = tmp_path / "models.json"
+    path.write_text(json.dumps({"models": [
+        {"name": "a", "model_name": "m1", "api_key_env": "KEY_A"},
+        {"name": "b", "model_name": "m2", "requests_per_second": 2},
+    ]}))
+    monkeypatch.setenv("KEY_A", "secret")
+    endpoints = load_endpoints(str(path))
+    assert [e.name for e in endpoints] == ["a", "b"]
+    assert endpoints[0].resolved_api_key() == "secret"
+
+    path.write_text(json.dumps([{"name": "a", "model_name": "m"}, {"name": "a", "model_name": "n"}]))
+    with pytest.raises(ValueError):
+        load_endpoints(str(path))
+
+@pytest.mark.asyncio
+async def test_models_run_concurrently_and_are_recorded(tmp_path):
+    """All models are evaluated at once, compared to the baseline and stored per model."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    cases = [
+        EvaluationCase("1", "math::1", "arithmetic", {"prompt": "2+2"}, {"result": 4}),
+        EvaluationCase("2", "math::2", "arithmetic", {"prompt": "2+3"}, {"result": 5}),
+    ]
+    endpoints = [_endpoint("baseline", "5"), _endpoint("candidate", "4"), _endpoint("third", "4")]
+    FakeModel.max_active = 0
+    report = await ComparisonRunner(endpoints, str(tmp_path), Session).run(cases)
+
+    # Six calls overlap instead of running model by model
+    assert FakeModel.max_active == 6
+    assert report["baseline"] == "baseline"
+    assert report["models"]["candidate"]["vs_baseline"] == {"wins": 1, "losses": 1}
+    assert report["models"]["baseline"]["metrics"]["success_rate"] == 50.0
+    assert (tmp_path / "candidate.jsonl").exists()
+
+    session = Session()
+    assert session.query(ModelRegistry).count() == 3
+    assert session.query(EvaluationRun).count() == 3
+    assert session.query(TestResult).count() == 6
+    session.close()
@@ -0,0 +1,76 @@
+"""Tests for lazy settings and the import cost of the src package."""
+
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from tenacity import RetryError
+
+from src import config
+from src.llm_client import LLMClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def fresh_settings(monkeypatch, tmp_path):
+    """Settings rebuilt from a clean environment with no .env file."""
+    for name in ("API_BASE_URL", "API_KEY", "MODEL_NAME"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.chdir(tmp_path)
+    config.reset_settings()
+    yield config.settings
+    config.reset_settings()
+
+def test_settings_are_cached_until_reset(fresh_settings, monkeypatch):
+    """Settings are built once and re-read from the environment after a reset."""
+    assert config.get_settings() is config.get_settings()
+    assert fresh_settings.model_name is None
+
+    monkeypatch.setenv("MODEL_NAME", "m2")
+    assert fresh_settings.model_name is None
+    config.reset_settings()
+    assert fresh_settings.model_name == "m2"
+
+def test_proxy_assignment_updates_settings(fresh_settings):
+    """Assigning through the proxy changes the cached settings object."""
+    fresh_settings.max_retries = 7
+    assert config.get_settings().max_retries == 7
+
+def test_client_requires_api_settings(fresh_settings):
+    """Only creating a client needs the API settings, and the error names them."""
+    with pytest.raises(ValueError, match="API_BASE_URL, API_KEY, MODEL_NAME"):
+        LLMClient()
+    assert LLMClient(base_url="http://h", api_key="k", model_name="m").model_name == "m"
+
+def test_database_imports_without_api_settings():
+    """src.database imports in a clean interpreter without API settings or pydantic."""
+    env = {k: v for k, v in os.environ.items() if k not in ("API_BASE_URL", "API_KEY", "MODEL_NAME")}
+    code = (
+        "import sys, src.database, src.test_aggregator; "
+        "print(sorted(m for m in ('pydantic', 'httpx', 'tenacity') if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "[]"
+
+@pytest.mark.asyncio
+async def test_retry_policy_reads_settings_at_call_time(monkeypatch):
+    """Changing max_retries after the client module is imported takes effect."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    monkeypatch.setattr(config.settings, "max_retries", 2)
+    monkeypatch.setattr(config.settings, "retry_delay", 0)
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        with pytest.raises(RetryError):
+            await client.generate("hi")
+    finally:
+        await client._http.aclose()
+    assert len(calls) == 2
@@ -0,0 +1,151 @@
+"""Tests for request deadlines and hedged requests."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from tenacity import RetryError
+
+from src import config
+from src.deadline import DeadlineExceeded, current_deadline, deadline
+from src.evaluation_engine import EvaluationCase, EvaluationEngine
+from src.hedging import LatencyWindow, hedged
+from src.llm_client import LLMClient
+
+def _completion(text):
+    return {
+        "model": "m",
+        "choices": [{"message": {"content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    }
+
+def _client(handler):
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def test_nested_deadlines_only_shorten():
+    """An inner deadline never outlives the enclosing one."""
+    assert current_deadline() is None
+    with deadline(1.0) as outer:
+        with deadline(10.0) as inner:
+            assert inner is outer
+        with deadline(0.5) as inner:
+            assert inner.remaining() <= 0.5
+        with deadline(None) as inner:
+            assert inner is outer
+    assert current_deadline() is None
+
+def test_latency_window_percentile():
+    """Percentiles use the nearest rank of the recent samples."""
+    window = LatencyWindow(size=100)
+    assert window.percentile(95) is None
+    for ms in range(1, 101):
+        window.record(ms)
+    assert window.percentile(95) == 95
+    assert window.percentile(50) == 50
+
+@pytest.mark.asyncio
+async def test_slow_request_stops_at_deadline():
+    """A stuck request is abandoned at the call's deadline."""
+    async def handler(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json=_completion("late"))
+
+    client = _client(handler)
+    start = time.monotonic()
+    with pytest.raises(RetryError) as info:
+        await client.generate("hi", timeout=0.2)
+    await client._http.aclose()
+    assert time.monotonic() - start < 1
+    assert isinstance(info.value.last_attempt.exception(), DeadlineExceeded)
+
+@pytest.mark.asyncio
+async def test_retries_stay_within_budget(monkeypatch):
+    """No retry is attempted when its back-off would pass the deadline."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    monkeypatch.setattr(config.settings, "max_retries", 10)
+    monkeypatch.setattr(config.settings, "retry_delay", 1)
+    client = _client(handler)
+    start = time.monotonic()
+    with pytest.raises(RetryError):
+        await client.generate("hi", timeout=1.5)
+    await client._http.aclose()
+    # Attempt, wait 1s, attempt; the next 2s back-off would pass the deadline
+    assert len(calls) == 2
+    assert time.monotonic() - start < 1.5
+
+@pytest.mark.asyncio
+async def test_hedge_takes_first_response(monkeypatch):
+    """A slow request is hedged and the faster duplicate wins."""
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            await asyncio.sleep(5)
+        return httpx.Response(200, json=_completion(f"answer {len(calls)}"))
+
+    monkeypatch.setattr(config.settings, "hedge_requests", True)
+    monkeypatch.setattr(config.settings, "hedge_delay_ms", 50)
+    client = _client(handler)
+    start = time.monotonic()
+    response = await client.generate("hi", timeout=10)
+    await client._http.aclose()
+    assert response["choices"][0]["text"] == "answer 2"
+    assert client.hedged_requests == 1
+    assert time.monotonic() - start < 1
+
+@pytest.mark.asyncio
+async def test_hedge_not_sent_for_fast_requests():
+    """The primary result is used directly when it arrives before the hedge delay."""
+    started = []
+
+    async def call(index):
+        started.append(index)
+        return index
+
+    assert await hedged(call, 1.0) == 0
+    assert started == [0]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cancel_after", [0.01, 0.1])
+async def test_cancelled_hedge_cancels_its_attempts(cancel_after):
+    """Cancelling the caller before or after the hedge is sent cancels every attempt."""
+    attempts = []
+
+    async def call(index):
+        attempts.append(asyncio.current_task())
+        await asyncio.sleep(10)
+
+    caller = asyncio.ensure_future(hedged(call, 0.05))
+    await asyncio.sleep(cancel_after)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert len(attempts) == (1 if cancel_after < 0.05 else 2)
+    assert all(task.cancelled() for task in attempts)
+
+@pytest.mark.asyncio
+async def test_engine_applies_case_timeout():
+    """Each case's timeout_seconds becomes the deadline of its generate call."""
+    seen = []
+
+    class Client:
+        async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+            seen.append(current_deadline().seconds)
+            return {"choices": [{"text": "4", "finish_reason": "stop"}]}
+
+        async def analyze_response(self, response):
+            return {}
+
+    case = EvaluationCase("1", "math::1", "arithmetic", {"prompt": "2+2"}, {"result": 4}, timeout_seconds=7)
+    results = await EvaluationEngine(Client()).run([case])
+    assert results[0].passed
+    assert seen == [7]
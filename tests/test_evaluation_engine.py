@@ -0,0 +1,105 @@
+"""Tests for the data-driven evaluation engine."""
+
+import asyncio
+import json
+import uuid
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base, UnitTestSuite, UnitTest
+from src.evaluation_engine import (
+    EvaluationCase, EvaluationEngine, build_prompt, load_cases_from_db,
+    load_cases_from_jsonl, summarize_results
+)
+
+class FakeClient:
+    """Answers from a prompt -> text mapping and tracks concurrency."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if prompt not in self.answers:
+            raise RuntimeError("no answer")
+        return {"choices": [{"text": self.answers[prompt], "finish_reason": "stop"}]}
+
+    async def analyze_response(self, response):
+        return {"finish_reason": response["choices"][0]["finish_reason"]}
+
+def _case(case_id, input_data, expected_output, suite="s"):
+    return EvaluationCase(case_id, f"{suite}::{case_id}", "t", input_data, expected_output, suite_name=suite)
+
+@pytest.mark.asyncio
+async def test_engine_scores_by_expected_output_shape():
+    """Scorers are picked from the expected_output keys."""
+    client = FakeClient({
+        "2+2?": "The answer is 4",
+        "Teacher is to Student as Doctor is to:": "Patient.",
+        "capital?": "I think it's Lyon",
+    })
+    cases = [
+        _case("num", {"prompt": "2+2?"}, {"result": 4}),
+        _case("ans", {"prompt": "Teacher is to Student as Doctor is to:"}, {"answer": "patient"}),
+        _case("kw", {"prompt": "capital?"}, {"keywords": ["paris"]}),
+        _case("err", {"prompt": "unanswered"}, {"result": 1}),
+    ]
+
+    results = {r.case.case_id: r for r in await EvaluationEngine(client).run(cases)}
+
+    assert results["num"].passed and results["ans"].passed
+    assert not results["kw"].passed
+    assert "no answer" in results["err"].error
+
+@pytest.mark.asyncio
+async def test_engine_bounds_concurrency():
+    """No more than `concurrency` requests are in flight at once."""
+    client = FakeClient({"p": "1"})
+    cases = [_case(str(i), {"prompt": "p"}, {"result": 1}) for i in range(20)]
+
+    results = await EvaluationEngine(client, concurrency=4).run(cases)
+
+    assert len(results) == 20
+    assert client.max_in_flight == 4
+    assert summarize_results(results)["suites"]["s"]["pass_rate"] == 1.0
+
+def test_load_cases_from_jsonl(tmp_path):
+    """Both full rows and the prompt/expected shorthand are accepted."""
+    path = tmp_path / "cases.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"id": "a", "prompt": "1+1?", "expected": 2}),
+        json.dumps({"input_data": {"article": "text"}, "expected_output": {"key_points": ["x"]}, "suite": "sum"}),
+    ]))
+
+    cases = load_cases_from_jsonl(str(path))
+
+    assert cases[0].case_id == "a" and cases[0].expected_output == {"result": 2}
+    assert cases[1].suite_name == "sum"
+    assert build_prompt(cases[1].input_data).startswith("Please summarize this article")
+
+def test_load_cases_from_db():
+    """unit_tests rows are loaded with their suite's name and priority."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    suite = UnitTestSuite(suite_id=uuid.uuid4(), suite_name="math", category="mathematics", priority=2)
+    session.add(suite)
+    session.add(UnitTest(
+        test_id=uuid.uuid4(), suite_id=suite.suite_id, test_name="Arithmetic Test 1",
+        test_type="arithmetic", input_data={"prompt": "2+2"}, expected_output={"result": 4}
+    ))
+    session.commit()
+
+    cases = load_cases_from_db(session, categories=["mathematics"])
+
+    assert len(cases) == 1
+    assert cases[0].test_name == "math::Arithmetic Test 1"
+    assert cases[0].priority == 2
+    assert cases[0].timeout_seconds == 30
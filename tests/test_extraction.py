@@ -0,0 +1,46 @@
+"""Tests for response extraction utilities."""
+
+import pytest
+
+from src.extraction import extract_code_block, extract_json, extract_number, extract_numbers
+
+def test_extract_code_block():
+    """Fenced code wins, then code starting at the first def/class, then the text."""
+    fenced = "Here you go:\n```python\ndef f():\n    return 1\n```\nDone."
+    assert extract_code_block(fenced) == "def f():\n    return 1"
+    assert extract_code_block("```\nx = 1\n```") == "x = 1"
+    assert extract_code_block("Sure.\ndef g(x):\n    return x\n") == "def g(x):\n    return x\n"
+    assert extract_code_block("  x = 1  ") == "x = 1"
+
+@pytest.mark.parametrize("text, expected", [
+    ("205.625", 205.625),
+    ("The total is $43.20.", 43.20),
+    ("-$1,234.50 dollars", -1234.5),
+    ("x = 5", 5.0),
+    ("about 1.5e3 meters", 1500.0),
+    (".5 of the pie", 0.5),
+    ("no digits here", None),
+])
+def test_extract_number(text, expected):
+    """Numbers are found inside prose, with signs, currency, separators and units."""
+    assert extract_number(text) == expected
+
+def test_extract_numbers():
+    """Every number is returned in order."""
+    assert extract_numbers("x = 1.5 or x = -4") == [1.5, -4.0]
+
+def test_extract_json_from_prose():
+    """The first balanced object is returned even with prose and braces in strings."""
+    text = 'The entities are {"person": "Jeff }{ Bezos", "tags": ["a"]} and {"second": 1}'
+    assert extract_json(text) == {"person": "Jeff }{ Bezos", "tags": ["a"]}
+
+def test_extract_json_skips_invalid_candidates():
+    """Brace groups that are not JSON are skipped."""
+    text = 'Format: {name} ->\n```json\n{"name": "Amazon"}\n```'
+    assert extract_json(text) == {"name": "Amazon"}
+    assert extract_json("no json {here") is None
+
+def test_extract_json_arrays():
+    """Arrays are only accepted when requested."""
+    assert extract_json("[1, 2]") is None
+    assert extract_json("Result: [1, 2]", arrays=True) == [1, 2]
@@ -6,6 +6,8 @@ from typing import List, Dict, Any
 
 from src.llm_client import LLMClient
 from src.database import get_session, UnitTestSuite
+from src.extraction import extract_json
+from src.prompt_templates import FewShotTemplate, order_by_prefix
 
 @pytest.mark.asyncio
 async def test_sentiment_analysis(llm_client, db_session):
@@ -33,13 +35,16 @@ async def test_sentiment_analysis(llm_client, db_session):
         }
     ]
     
-    # Create few-shot prompt
-    few_shot_prompt = "Classify the sentiment of the following text as positive, negative, or neutral:\n\n"
-    for example in examples:
-        few_shot_prompt += f"Text: {example['text']}\nSentiment: {example['sentiment']}\n\n"
+    # Build the few-shot prefix once; every prompt shares it byte for byte
+    template = FewShotTemplate(
+        instruction="Classify the sentiment of the following text as positive, negative, or neutral:\n\n",
+        examples=examples,
+        example_format="Text: {text}\nSentiment: {sentiment}",
+        query_format="Text: {text}\nSentiment:"
+    )
     
-    for case in test_cases:
-        prompt = few_shot_prompt + f"Text: {case['text']}\nSentiment:"
+    for case in order_by_prefix(test_cases, key=lambda c: template.render(text=c["text"])):
+        prompt = template.render(text=case["text"])
         
         response = await client.generate(
             prompt=prompt,
@@ -85,13 +90,16 @@ async def test_topic_classification(llm_client, db_session):
         }
     ]
     
-    # Create few-shot prompt
-    few_shot_prompt = "Classify the topic of the following text as science, sports, or technology:\n\n"
-    for example in examples:
-        few_shot_prompt += f"Text: {example['text']}\nTopic: {example['topic']}\n\n"
+    # Build the few-shot prefix once; every prompt shares it byte for byte
+    template = FewShotTemplate(
+        instruction="Classify the topic of the following text as science, sports, or technology:\n\n",
+        examples=examples,
+        example_format="Text: {text}\nTopic: {topic}",
+        query_format="Text: {text}\nTopic:"
+    )
     
-    for article in test_articles:
-        prompt = few_shot_prompt + f"Text: {article['text']}\nTopic:"
+    for article in order_by_prefix(test_articles, key=lambda a: template.render(text=a["text"])):
+        prompt = template.render(text=article["text"])
         
         response = await client.generate(
             prompt=prompt,
@@ -138,13 +146,16 @@ async def test_intent_classification(llm_client, db_session):
         }
     ]
     
-    # Create few-shot prompt
-    few_shot_prompt = "Classify the user intent as check_status, return_request, or shipping_inquiry:\n\n"
-    for example in examples:
-        few_shot_prompt += f"Query: {example['text']}\nIntent: {example['intent']}\n\n"
+    # Build the few-shot prefix once; every prompt shares it byte for byte
+    template = FewShotTemplate(
+        instruction="Classify the user intent as check_status, return_request, or shipping_inquiry:\n\n",
+        examples=examples,
+        example_format="Query: {text}\nIntent: {intent}",
+        query_format="Query: {text}\nIntent:"
+    )
     
-    for query in test_queries:
-        prompt = few_shot_prompt + f"Query: {query['text']}\nIntent:"
+    for query in order_by_prefix(test_queries, key=lambda q: template.render(text=q["text"])):
+        prompt = template.render(text=query["text"])
         
         response = await client.generate(
             prompt=prompt,
@@ -191,14 +202,19 @@ async def test_entity_extraction(llm_client, db_session):
         }
     ]
     
-    # Create few-shot prompt
-    few_shot_prompt = "Extract the person, organization, and location from the text:\n\n"
-    for example in examples:
-        few_shot_prompt += f"Text: {example['text']}\n"
-        few_shot_prompt += f"Entities: {json.dumps(example['entities'], indent=2)}\n\n"
-    
-    for case in test_cases:
-        prompt = few_shot_prompt + f"Text: {case['text']}\nEntities:"
+    # Build the few-shot prefix once; every prompt shares it byte for byte
+    template = FewShotTemplate(
+        instruction="Extract the person, organization, and location from the text:\n\n",
+        examples=[
+            {"text": example["text"], "entities": json.dumps(example["entities"], indent=2)}
+            for example in examples
+        ],
+        example_format="Text: {text}\nEntities: {entities}",
+        query_format="Text: {text}\nEntities:"
+    )
+    
+    for case in order_by_prefix(test_cases, key=lambda c: template.render(text=c["text"])):
+        prompt = template.render(text=case["text"])
         
         response = await client.generate(
             prompt=prompt,
@@ -206,11 +222,10 @@ async def test_entity_extraction(llm_client, db_session):
             temperature=0.3
         )
         
-        # Extract JSON from response
-        try:
-            prediction = json.loads(response["choices"][0]["text"].strip())
-            for entity_type, expected_value in case["expected"].items():
-                assert expected_value.lower() in prediction[entity_type].lower(), \
-                    f"Expected {expected_value} in {entity_type}"
-        except json.JSONDecodeError:
-            pytest.fail("Response is not valid JSON")
\ No newline at end of file
+        # Extract JSON from response, tolerating surrounding prose or code fences
+        prediction = extract_json(response["choices"][0]["text"])
+        if prediction is None:
+            pytest.fail("Response does not contain a JSON object")
+        for entity_type, expected_value in case["expected"].items():
+            assert expected_value.lower() in str(prediction.get(entity_type, "")).lower(), \
+                f"Expected {expected_value} in {entity_type}"
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Tests for fingerprint-based reuse of unchanged test results."""
+
+import inspect
+import os
+import subprocess
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base, EvaluationRun, TestResult
+from src.fingerprint import compute_fingerprint, find_reusable_result, model_identity, module_sources
+from src.result_stream import iter_results
+
+def test_fingerprint_changes_with_inputs():
+    """Prompt, scorer source and model identity all affect the fingerprint."""
+    identity = model_identity("model-a", "http://localhost/")
+    base = compute_fingerprint({"prompt": "2+2"}, ["def score(): pass"], identity)
+
+    assert base == compute_fingerprint({"prompt": "2+2"}, ["def score(): pass"], identity)
+    assert base != compute_fingerprint({"prompt": "2+3"}, ["def score(): pass"], identity)
+    assert base != compute_fingerprint({"prompt": "2+2"}, ["def score(): return 1"], identity)
+    assert base != compute_fingerprint(
+        {"prompt": "2+2"}, ["def score(): pass"], model_identity("model-b", "http://localhost/")
+    )
+
+def test_settings_and_indirect_sources_affect_fingerprint():
+    """Request and scoring settings are part of the identity; src imports are followed transitively."""
+    assert model_identity("m", "http://h/", options={"system_prompt": "a"}) != \
+        model_identity("m", "http://h/", options={"system_prompt": "b"})
+    assert model_identity("m", "http://h/", options={"embedding_model": None})["embedding_model"] == ""
+
+    # This module does not import src.config, but src.database (which it does import) uses it
+    sources = module_sources(sys.modules[__name__])
+    assert inspect.getsource(sys.modules["src.config"]) in sources
+    assert inspect.getsource(sys.modules[__name__]) in sources
+
+def test_find_reusable_result_matches_fingerprint():
+    """Only results recorded with the same fingerprint are reused."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    run = EvaluationRun(run_status="success")
+    session.add(run)
+    session.add(TestResult(run=run, test_name="t::a", result_value={"fingerprint": "abc"}, pass_fail=True))
+    session.commit()
+
+    assert find_reusable_result(session, "t::a", "abc").pass_fail is True
+    assert find_reusable_result(session, "t::a", "other") is None
+    assert find_reusable_result(session, "t::b", "abc") is None
+
+def test_second_run_reuses_unchanged_result(tmp_path):
+    """With --reuse-unchanged the second run replays the first run's result."""
+    db_path = tmp_path / "eval.db"
+    Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+    stream_path = tmp_path / "results.jsonl"
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{db_path}",
+        TEST_RESULTS_STREAM=str(stream_path),
+        TEST_METRICS_PATH=str(tmp_path / "test_metrics.json")
+    )
+    command = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+               "--reuse-unchanged", "tests/test_simple.py"]
+
+    subprocess.run(command, env=env, check=True, capture_output=True)
+    first = list(iter_results(str(stream_path)))
+    subprocess.run(command, env=env, check=True, capture_output=True)
+    second = list(iter_results(str(stream_path)))
+
+    assert "reused_from" not in first[0]["properties"]
+    assert second[0]["outcome"] == "passed"
+    assert "reused_from" in second[0]["properties"]
+    assert second[0]["properties"]["fingerprint"] == first[0]["properties"]["fingerprint"]
@@ -0,0 +1,67 @@
+"""Tests for HDR-style latency histograms."""
+
+import math
+import random
+
+import pytest
+
+from src.histogram import LatencyHistogram
+from src.metrics import MetricsCollector, ResponseMetrics
+
+def test_percentiles_keep_relative_precision():
+    """Every percentile is within the configured number of significant digits."""
+    rng = random.Random(0)
+    values = [rng.lognormvariate(5, 1) for _ in range(20000)]
+    histogram = LatencyHistogram(significant_digits=3)
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for pct in (50, 90, 99, 99.9):
+        exact = ordered[math.ceil(len(ordered) * pct / 100) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=2e-3)
+    assert histogram.max == pytest.approx(max(values), abs=1e-3)
+    assert histogram.mean == pytest.approx(sum(values) / len(values), rel=1e-6)
+
+def test_merge_and_encode_round_trip():
+    """Merged histograms equal one histogram of all samples, and survive encoding."""
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for i in range(1, 1001):
+        (a if i % 2 else b).record(i * 1.5)
+        both.record(i * 1.5)
+
+    merged = a + b
+    assert merged.summary() == both.summary()
+    assert list(merged.buckets()) == list(both.buckets())
+
+    decoded = LatencyHistogram.decode(merged.encode())
+    assert decoded.summary() == merged.summary()
+    assert len(merged.encode()) < 4000
+
+    with pytest.raises(ValueError):
+        a.merge(LatencyHistogram(significant_digits=2))
+
+def test_coordinated_omission_correction():
+    """A stall at a fixed send rate back-fills the requests that were never sent."""
+    plain, corrected = LatencyHistogram(), LatencyHistogram()
+    for _ in range(99):
+        plain.record(10)
+        corrected.record_corrected(10, expected_interval_ms=100)
+    plain.record(1000)
+    corrected.record_corrected(1000, expected_interval_ms=100)
+
+    # One stuck request hides behind p99 uncorrected, but not once corrected
+    assert plain.percentile(99) == pytest.approx(10, rel=1e-3)
+    assert corrected.total_count == 109
+    assert corrected.percentile(95) >= 500
+
+def test_collector_exports_histogram_with_summary():
+    """The summary statistics include the histogram percentiles and its encoding."""
+    collector = MetricsCollector()
+    for ms in (100, 200, 300, 400):
+        collector.add_response_metrics(ResponseMetrics(response_time=ms, token_count=10, completion_status="stop"))
+    stats = collector.get_summary_statistics()
+    histogram = stats["response_time_histogram"]
+    assert histogram["count"] == 4
+    assert histogram["p50"] == pytest.approx(200, rel=1e-3)
+    assert LatencyHistogram.decode(histogram["encoded"]).max == 400
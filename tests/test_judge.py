@@ -0,0 +1,139 @@
+"""Tests for the LLM-as-judge pipeline."""
+
+import json
+import re
+
+import httpx
+import pytest
+
+from src.judge import (
+    JudgeItem, JudgePipeline, VerdictCache, build_judge_prompt, parse_verdicts, verdict_key
+)
+from src.llm_client import LLMClient
+from src.metrics import MetricsCollector
+
+class FakeJudge:
+    """Grades every item in a judge prompt 5/4/3/2, optionally dropping the last one."""
+
+    model_name = "judge"
+
+    def __init__(self, drop_last=False):
+        self.drop_last = drop_last
+        self.prompts = []
+
+    async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+        self.prompts.append(prompt)
+        count = len(re.findall(r"^### Item \d+", prompt, re.MULTILINE))
+        numbers = range(1, count + (0 if self.drop_last and count > 1 else 1))
+        verdicts = [
+            {"item": n, "relevance": 5, "coherence": 4, "factual_accuracy": 3, "grammar": 2}
+            for n in numbers
+        ]
+        return {"choices": [{"text": f"Here are the grades:\n{json.dumps(verdicts)}", "finish_reason": "stop"}]}
+
+def _items(count):
+    return [JudgeItem(str(i), f"prompt {i}", f"response {i}") for i in range(count)]
+
+def test_parse_verdicts():
+    """Grades are normalized to 0-1 and invalid entries are left empty."""
+    text = '[{"item": 2, "relevance": 5, "coherence": 1, "factual_accuracy": 3, "grammar": 9},' \
+           ' {"item": 1, "relevance": "n/a", "coherence": 1, "factual_accuracy": 1, "grammar": 1}]'
+    verdicts = parse_verdicts(text, 3)
+    assert verdicts[0] is None and verdicts[2] is None
+    assert (verdicts[1].relevance, verdicts[1].coherence, verdicts[1].factual_accuracy, verdicts[1].grammar) == (1.0, 0.0, 0.5, 1.0)
+    assert parse_verdicts("I cannot grade this.", 2) == [None, None]
+
+def test_judge_prompt_numbers_items():
+    """Every item and its reference appear in one prompt."""
+    items = _items(2)
+    items[1].reference = "gold answer"
+    prompt = build_judge_prompt(items)
+    assert "### Item 1" in prompt and "### Item 2" in prompt
+    assert "gold answer" in prompt
+
+@pytest.mark.asyncio
+async def test_pipeline_batches_and_feeds_collector():
+    """Items share judge calls, and verdicts become QualityMetrics."""
+    judge = FakeJudge()
+    collector = MetricsCollector()
+    pipeline = JudgePipeline(judge, batch_size=4)
+    verdicts = await pipeline.judge_into(collector, _items(10))
+
+    assert len(judge.prompts) == 3
+    assert all(v is not None for v in verdicts)
+    assert collector.get_summary_statistics()["quality"] == {
+        "relevance": 1.0, "coherence": 0.75, "factual_accuracy": 0.5, "grammar": 0.25
+    }
+
+@pytest.mark.asyncio
+async def test_dropped_items_are_retried_alone():
+    """Items missing from a batched verdict are judged again individually."""
+    judge = FakeJudge(drop_last=True)
+    pipeline = JudgePipeline(judge, batch_size=3)
+    verdicts = await pipeline.judge(_items(3))
+    assert all(v is not None for v in verdicts)
+    assert len(judge.prompts) == 2
+
+@pytest.mark.asyncio
+async def test_verdicts_are_cached(tmp_path):
+    """Repeated and previously judged items do not cost judge calls."""
+    path = str(tmp_path / "verdicts.jsonl")
+    items = _items(2) + _items(1)
+
+    judge = FakeJudge()
+    cache = VerdictCache(path)
+    verdicts = await JudgePipeline(judge, cache=cache).judge(items)
+    cache.close()
+    assert len(judge.prompts) == 1
+    assert judge.prompts[0].count("### Item") == 2
+    assert verdicts[2] == verdicts[0]
+
+    judge = FakeJudge()
+    cache = VerdictCache(path)
+    verdicts = await JudgePipeline(judge, cache=cache).judge(_items(2))
+    cache.close()
+    assert judge.prompts == []
+    assert all(v.cached for v in verdicts)
+
+    # A different rubric or judge model is a different cache entry
+    item = _items(1)[0]
+    assert verdict_key("judge", "rubric a", item) != verdict_key("judge", "rubric b", item)
+    assert verdict_key("judge", "rubric a", item) != verdict_key("other", "rubric a", item)
+
+@pytest.mark.asyncio
+async def test_judge_model_reaches_the_request():
+    """judge_model is sent as the request's model, not the client's."""
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        verdicts = [{"item": 1, "relevance": 5, "coherence": 5, "factual_accuracy": 5, "grammar": 5}]
+        return httpx.Response(200, json={
+            "model": "grader", "choices": [{"message": {"content": json.dumps(verdicts)}, "finish_reason": "stop"}]
+        })
+
+    client = LLMClient(base_url="http://h", api_key="k", model_name="candidate")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        verdicts = await JudgePipeline(client, judge_model="grader").judge(_items(1))
+    finally:
+        await client._http.aclose()
+    assert [body["model"] for body in bodies] == ["grader"]
+    assert verdicts[0] is not None and verdicts[0].relevance == 1.0
+
+@pytest.mark.asyncio
+async def test_only_transport_failures_become_missing_verdicts():
+    """HTTP errors leave items unjudged; programming errors propagate."""
+
+    class Failing:
+        model_name = "judge"
+
+        def __init__(self, error):
+            self.error = error
+
+        async def generate(self, prompt, **kwargs):
+            raise self.error
+
+    assert await JudgePipeline(Failing(httpx.ConnectError("down"))).judge(_items(2)) == [None, None]
+    with pytest.raises(TypeError):
+        await JudgePipeline(Failing(TypeError("bug"))).judge(_items(2))
@@ -0,0 +1,57 @@
+"""Tests for the Aho-Corasick keyword scorer."""
+
+import random
+
+import pytest
+
+from src.keyword_scorer import KeywordAutomaton, KeywordScorer, compile_keywords, normalize
+
+def test_automaton_finds_overlapping_patterns():
+    """Every occurrence is reported, including patterns inside other patterns."""
+    automaton = KeywordAutomaton(["he", "she", "his", "hers"])
+    matches = sorted((end, automaton.patterns[i]) for end, i in automaton.iter_matches("ushers"))
+    assert matches == [(3, "he"), (3, "she"), (5, "hers")]
+
+def test_automaton_agrees_with_substring_search():
+    """On random inputs the automaton finds exactly the patterns `in` finds."""
+    rng = random.Random(0)
+    for _ in range(200):
+        patterns = ["".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(5)]
+        text = "".join(rng.choice("ab") for _ in range(rng.randint(0, 20)))
+        automaton = KeywordAutomaton(patterns)
+        found = {automaton.patterns[i] for _, i in automaton.iter_matches(text)}
+        assert found == {p for p in patterns if p in text}
+
+def test_normalization():
+    """Case, compatibility characters, punctuation and whitespace are normalized."""
+    assert normalize("  The ﬁnal   ANSWER: Yes!") == "the final answer yes"
+    assert normalize("Straße") == normalize("STRASSE")
+    assert normalize("a-b", strip_punctuation=False) == "a-b"
+
+def test_word_boundaries():
+    """Whole-word matching rejects keywords embedded in longer words."""
+    scorer = KeywordScorer(["cat", "new york"], word_boundary=True)
+    assert scorer.found("The Cat sat in NEW-YORK.") == ["cat", "new york"]
+    assert scorer.found("concatenate newyorker") == []
+    assert KeywordScorer(["cat"]).found("concatenate") == ["cat"]
+    assert KeywordScorer.from_expected_output({"key_phrase": "employer"}).score("employers agree") == 1.0
+
+def test_scoring_modes():
+    """any, all and fraction modes score the same matches differently."""
+    text = "Paris is the capital of France"
+    keywords = ["paris", "france", "berlin", "paris"]
+    assert KeywordScorer(keywords, mode="any").score(text) == 1.0
+    assert KeywordScorer(keywords, mode="all").score(text) == 0.0
+    assert KeywordScorer(keywords, mode="fraction").score(text) == 0.75
+    assert KeywordScorer(keywords).missing(text) == ["berlin"]
+    with pytest.raises(ValueError):
+        KeywordScorer(keywords, mode="most")
+
+def test_from_expected_output_and_batch():
+    """expected_output shapes map to modes, and batches share one compiled scorer."""
+    scorer = KeywordScorer.from_expected_output({"key_points": ["James Webb", "infrared"]})
+    assert scorer.mode == "fraction"
+    assert scorer.score_batch(["James Webb sees in infrared.", "James Webb", "nothing"]) == [1.0, 0.5, 0.0]
+    assert KeywordScorer.from_expected_output({"keywords": ["yes"]}) is compile_keywords(["yes"], mode="any")
+    with pytest.raises(ValueError):
+        KeywordScorer.from_expected_output({"result": 4})
@@ -0,0 +1,117 @@
+"""Tests for load balancing, circuit breakers and failover across replicas."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src import config
+from src.llm_client import LLMClient
+from src.load_balancer import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LoadBalancer, NoHealthyEndpointError
+
+def _completion(text):
+    return {
+        "model": "m",
+        "choices": [{"message": {"content": text}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+    }
+
+def _client(handler, urls):
+    client = LLMClient(api_key="k", model_name="m", base_urls=urls)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def test_circuit_breaker_opens_and_resets():
+    """Consecutive failures open the circuit until the reset timeout allows a trial."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == HALF_OPEN and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    time.sleep(0.06)
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+def test_round_robin_and_least_outstanding():
+    """Round-robin rotates; least-outstanding avoids busy replicas."""
+    balancer = LoadBalancer(["http://a", "http://b", "http://c"], strategy="round_robin")
+    assert [balancer.select().url for _ in range(4)] == ["http://a/", "http://b/", "http://c/", "http://a/"]
+
+    balancer = LoadBalancer(["http://a", "http://b"], strategy="least_outstanding")
+    balancer.endpoints[0].outstanding = 3
+    assert {balancer.select().url for _ in range(4)} == {"http://b/"}
+
+    with pytest.raises(ValueError):
+        LoadBalancer(["http://a"], strategy="random")
+
+@pytest.mark.asyncio
+async def test_requests_spread_over_replicas():
+    """Every replica serves part of the load."""
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        return httpx.Response(200, json=_completion("ok"))
+
+    client = _client(handler, ["http://a", "http://b", "http://c"])
+    await asyncio.gather(*(client.generate("hi") for _ in range(9)))
+    await client._http.aclose()
+    assert sorted(set(hosts)) == ["a", "b", "c"]
+
+@pytest.mark.asyncio
+async def test_failover_skips_dead_replica(monkeypatch):
+    """A down replica fails over without retry back-off and is then taken out of rotation."""
+    hosts = []
+
+    def handler(request):
+        hosts.append(request.url.host)
+        if request.url.host == "down":
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json=_completion("ok"))
+
+    monkeypatch.setattr(config.settings, "retry_delay", 10)
+    client = _client(handler, ["http://down", "http://up"])
+    client.balancer.endpoints[0].breaker.failure_threshold = 2
+    start = time.monotonic()
+    for _ in range(6):
+        response = await client.generate("hi")
+        assert response["choices"][0]["text"] == "ok"
+    await client._http.aclose()
+
+    assert time.monotonic() - start < 1
+    assert hosts.count("down") == 2
+    assert client.balancer.stats()[0]["state"] == OPEN
+
+@pytest.mark.asyncio
+async def test_all_replicas_down_raises():
+    """With every circuit open the balancer refuses immediately."""
+    balancer = LoadBalancer(["http://a", "http://b"], failure_threshold=1)
+    for endpoint in balancer.endpoints:
+        endpoint.breaker.record_failure()
+
+    async def send(url):
+        raise AssertionError("no request expected")
+
+    with pytest.raises(NoHealthyEndpointError):
+        await balancer.request(send)
+
+@pytest.mark.asyncio
+async def test_health_probe_restores_replica():
+    """A successful probe closes an open circuit; a failing one opens it."""
+    healthy = {"a": True, "b": False}
+
+    def handler(request):
+        return httpx.Response(200 if healthy[request.url.host] else 503)
+
+    balancer = LoadBalancer(["http://a", "http://b"], failure_threshold=1, reset_timeout=60)
+    balancer.endpoints[0].breaker.trip()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as http:
+        await balancer.probe(http)
+    assert [e["state"] for e in balancer.stats()] == [CLOSED, OPEN]
@@ -0,0 +1,79 @@
+"""Tests for the load generator, streaming TTFT and PerformanceMonitor windows."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.histogram import LatencyHistogram
+from src.llm_client import LLMClient
+from src.load_test import LoadGenerator, format_curve, saturation_curve
+from src.metrics import PerformanceMonitor
+from src.mock_server import MockConfig, MockServer
+
+PROMPTS = ["What is 2+2?", "Name a prime number.", "Summarize: the cat sat."]
+
+def _client(server, **kwargs):
+    return LLMClient(base_url=server.url, api_key="mock", model_name="mock", **kwargs)
+
+def test_monitor_prunes_and_summarizes_window():
+    """Old samples leave the window and numeric fields get percentiles."""
+    monitor = PerformanceMonitor(window_size=timedelta(seconds=10))
+    monitor.add_metric({"latency_ms": 1000.0}, datetime.utcnow() - timedelta(seconds=20))
+    for ms in range(1, 101):
+        monitor.add_metric({"latency_ms": float(ms), "error_type": "none"})
+    stats = monitor.get_current_stats()
+    assert stats["sample_count"] == 100
+    latency = stats["metrics"]["latency_ms"]
+    assert (latency["p50"], latency["p99"], latency["max"]) == (50.0, 99.0, 100.0)
+    assert "error_type" not in stats["metrics"]
+
+@pytest.mark.asyncio
+async def test_stream_reports_time_to_first_token():
+    """Streaming returns the same text as a plain request, plus TTFT."""
+    with MockServer(MockConfig(latency_ms=50, tokens_per_second=200)) as server:
+        async with _client(server) as client:
+            plain = await client.generate(PROMPTS[0])
+            streamed = await client.generate_stream(PROMPTS[0])
+    assert streamed["choices"][0]["text"] == plain["choices"][0]["text"]
+    assert 50 <= streamed["ttft_ms"] < streamed["response_ms"]
+    assert streamed["usage"]["completion_tokens"] == 16
+
+@pytest.mark.asyncio
+async def test_rate_mode_is_open_loop():
+    """Requests go out on schedule even when responses are slower than the arrival gap."""
+    with MockServer(MockConfig(latency_ms=200)) as server:
+        async with _client(server) as client:
+            result = await LoadGenerator(client, PROMPTS).run_rate(qps=50, duration=0.2)
+    assert result["sent"] == 10 and result["dropped"] == 0
+    assert result["send_qps"] > 35
+    assert result["completed"] == 10
+    assert result["ttft_ms"]["p50"] >= 200
+    assert LatencyHistogram.decode(result["histograms"]["latency_ms"]).total_count == 10
+
+@pytest.mark.asyncio
+async def test_saturated_client_drops_arrivals():
+    """Arrivals beyond max_in_flight are dropped and reported."""
+    with MockServer(MockConfig(latency_ms=200)) as server:
+        async with _client(server) as client:
+            result = await LoadGenerator(client, PROMPTS, max_in_flight=2).run_rate(qps=100, duration=0.1)
+    assert result["sent"] == 2
+    assert result["dropped"] == 8
+
+@pytest.mark.asyncio
+async def test_errors_and_concurrency_mode():
+    """Failed requests count as errors by type; concurrency mode keeps N in flight."""
+    with MockServer(MockConfig(error_rate=1.0)) as server:
+        async with _client(server) as client:
+            result = await LoadGenerator(client, PROMPTS).run_concurrency(concurrency=2, duration=0.1)
+    assert result["error_rate"] == 1.0
+    assert list(result["errors"]) == ["HTTPStatusError"]
+    assert result["completed"] == 0
+
+@pytest.mark.asyncio
+async def test_saturation_curve_has_a_step_per_rate():
+    """Each offered rate becomes one row of the curve."""
+    with MockServer() as server:
+        async with _client(server) as client:
+            steps = await saturation_curve(LoadGenerator(client, PROMPTS, stream=False), [10, 20], 0.1)
+    assert [step["offered_qps"] for step in steps] == [10, 20]
+    assert len(format_curve(steps).splitlines()) == 3
@@ -6,6 +6,7 @@ import uuid
 
 from src.llm_client import LLMClient
 from src.database import get_session, UnitTestSuite, UnitTest
+from src.extraction import extract_number
 
 @pytest.mark.asyncio
 async def test_arithmetic_operations(llm_client, db_session, make_test_suite):
@@ -48,7 +49,8 @@ async def test_arithmetic_operations(llm_client, db_session, make_test_suite):
             temperature=0.0
         )
         
-        result = float(response["choices"][0]["text"].strip().split()[0])
+        result = extract_number(response["choices"][0]["text"])
+        assert result is not None, "No number in response"
         assert abs(result - case["expected"]) < 0.01, \
             f"Expected {case['expected']} but got {result}"
 
@@ -91,7 +93,8 @@ async def test_word_problems(llm_client, db_session, make_test_suite):
             temperature=0.0
         )
         
-        result = float(response["choices"][0]["text"].strip().split()[0])
+        result = extract_number(response["choices"][0]["text"])
+        assert result is not None, "No number in response"
         assert abs(result - problem["expected"]) < 0.01, \
             f"Expected ${problem['expected']} but got ${result}"
 
@@ -135,7 +138,8 @@ async def test_basic_algebra(llm_client, db_session, make_test_suite):
         temperature=0.0
     )
     
-    result = float(response["choices"][0]["text"].strip().split()[0])
+    result = extract_number(response["choices"][0]["text"])
+    assert result is not None, "No number in response"
     assert abs(result - equations[0]["expected"]) < 0.01, \
         f"Expected {equations[0]['expected']} but got {result}"
 
@@ -178,6 +182,7 @@ async def test_mathematical_reasoning(llm_client, db_session, make_test_suite):
             temperature=0.0
         )
         
-        result = int(response["choices"][0]["text"].strip().split()[0])
+        result = extract_number(response["choices"][0]["text"])
+        assert result is not None, "No number in response"
         assert result == problem["expected"], \
             f"Expected {problem['expected']} but got {result}"
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""Tests for the local mock model server and its record/replay mode."""
+
+import json
+import time
+
+import httpx
+import pytest
+from tenacity import RetryError
+
+from src import config
+from src.llm_client import LLMClient
+from src.mock_server import MockConfig, MockServer
+
+def _client(server):
+    return LLMClient(base_url=server.url, api_key="mock", model_name="mock")
+
+@pytest.mark.asyncio
+async def test_chat_completions_are_deterministic(mock_server):
+    """The same prompt always gets the same text, with usage counts."""
+    client = _client(mock_server)
+    first = await client.generate("What is 2+2?")
+    second = await client.generate("What is 2+2?")
+    other = await client.generate("Name a prime.")
+    assert first["choices"][0]["text"] == second["choices"][0]["text"] != other["choices"][0]["text"]
+    assert first["usage"]["completion_tokens"] == 16
+    assert mock_server.request_count == 3
+
+@pytest.mark.asyncio
+async def test_fixed_responses_and_embeddings(mock_server):
+    """Configured answers are returned verbatim; embeddings are unit vectors."""
+    mock_server.config.responses["2+2?"] = "4"
+    client = _client(mock_server)
+    assert (await client.generate("2+2?"))["choices"][0]["text"] == "4"
+
+    vectors = await client.get_embeddings(["a", "b", "a"])
+    assert len(vectors) == 3 and len(vectors[0]) == 64
+    assert vectors[0] == vectors[2] != vectors[1]
+    assert abs(sum(x * x for x in vectors[0]) - 1) < 1e-9
+
+@pytest.mark.asyncio
+async def test_latency_and_error_injection(monkeypatch):
+    """Latency is applied before answering and injected errors surface as HTTP errors."""
+    monkeypatch.setattr(config.settings, "max_retries", 1)
+    with MockServer(MockConfig(latency_ms=100)) as server:
+        start = time.monotonic()
+        await _client(server).generate("hi")
+        assert time.monotonic() - start >= 0.1
+
+    with MockServer(MockConfig(error_rate=1.0, error_status=503)) as server:
+        with pytest.raises(RetryError):
+            await _client(server).generate("hi")
+        assert server.error_count == 1
+
+def test_streaming_matches_plain_response(mock_server):
+    """Streamed chunks join up to the non-streamed text."""
+    body = {"model": "mock", "messages": [{"role": "user", "content": "stream me"}]}
+    url = f"{mock_server.url}v1/chat/completions"
+    text = httpx.post(url, json=body).json()["choices"][0]["message"]["content"]
+
+    pieces = []
+    with httpx.stream("POST", url, json={**body, "stream": True}) as response:
+        for line in response.iter_lines():
+            if line.startswith("data: ") and line != "data: [DONE]":
+                pieces.append(json.loads(line[6:])["choices"][0]["delta"].get("content", ""))
+    assert "".join(pieces) == text
+
+@pytest.mark.asyncio
+async def test_record_and_replay(tmp_path, monkeypatch):
+    """Proxied traffic is recorded and served back without the upstream."""
+    monkeypatch.setattr(config.settings, "max_retries", 1)
+    path = str(tmp_path / "traffic.jsonl")
+    with MockServer(MockConfig(responses={"hello": "recorded answer"})) as upstream:
+        with MockServer(upstream=upstream.url, record_path=path) as recorder:
+            assert (await _client(recorder).generate("hello"))["choices"][0]["text"] == "recorded answer"
+            assert upstream.request_count == 1
+
+    with MockServer(replay_path=path) as replay:
+        client = _client(replay)
+        assert (await client.generate("hello"))["choices"][0]["text"] == "recorded answer"
+        with pytest.raises(RetryError):
+            await client.generate("never recorded")
@@ -0,0 +1,120 @@
+"""Tests for the parallel test runner's scheduling and result merging."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.parallel_runner import ParallelRunner, load_historical_durations, main, order_by_expected_duration
+from src.result_stream import iter_results
+
+def test_longest_expected_first(tmp_path):
+    """Tests are ordered by median historical duration, unknown tests first."""
+    metrics_path = tmp_path / "test_metrics.json"
+    metrics_path.write_text(json.dumps({
+        "results": [
+            {"test_name": "t::fast", "duration": 1.0},
+            {"test_name": "t::slow", "duration": 9.0},
+            {"test_name": "t::slow", "duration": 11.0},
+            {"test_name": "t::medium", "duration": 4.0}
+        ]
+    }))
+
+    durations = load_historical_durations(str(metrics_path))
+    ordered = order_by_expected_duration(["t::fast", "t::new", "t::medium", "t::slow"], durations)
+
+    assert durations["t::slow"] == 10.0
+    assert [node_id for node_id, _ in ordered] == ["t::new", "t::slow", "t::medium", "t::fast"]
+
+def test_batches_fill_with_short_tests():
+    """A worker batch takes the longest test plus short ones up to the budget."""
+    runner = ParallelRunner(workers=1, batch_seconds=2.5)
+    runner._queue.extend([("a", 2.0), ("b", 0.5), ("c", 0.5), ("d", 0.5)])
+
+    assert runner._next_batch() == ["a", "b"]
+    assert runner._next_batch() == ["c", "d"]
+    assert runner._next_batch() == []
+
+def test_runner_merges_worker_results(tmp_path):
+    """Results from separate worker processes are merged into one stream."""
+    stream_path = str(tmp_path / "merged.jsonl")
+    runner = ParallelRunner(workers=2, stream_path=stream_path)
+    count = runner.run([
+        ("tests/test_simple.py::test_simple", 1.0),
+        ("tests/test_tracing.py::test_disabled_tracer_and_decorator", 1.0)
+    ])
+    results = list(iter_results(stream_path))
+
+    assert sorted(r["test_name"] for r in results) == [
+        "tests/test_simple.py::test_simple",
+        "tests/test_tracing.py::test_disabled_tracer_and_decorator"
+    ]
+    assert count == 2
+    assert runner.exit_code == 0
+
+SELECTION_TESTS = '''
+def test_fast():
+    pass
+
+def test_slow():
+    assert False
+'''
+
+def _run_main(monkeypatch, tmp_path, *pytest_args):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", [
+        "parallel_runner", "-n", "2", "--metrics", str(tmp_path / "metrics.json"),
+        "--stream", str(tmp_path / "results.jsonl"), "-p", "no:cacheprovider", *pytest_args
+    ])
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    return exit_info.value.code
+
+def test_main_forwards_option_values(tmp_path, monkeypatch):
+    """-k keeps its expression in the workers, so deselected tests stay deselected."""
+    (tmp_path / "test_selection.py").write_text(SELECTION_TESTS)
+    assert _run_main(monkeypatch, tmp_path, "-k", "not slow", "test_selection.py") == 0
+    assert _run_main(monkeypatch, tmp_path, "test_selection.py") == 1
+
+def test_main_fails_on_collection_error(tmp_path, monkeypatch, capsys):
+    """A suite that cannot be collected is an error, not an empty green run."""
+    (tmp_path / "test_broken.py").write_text("import no_such_module\n")
+    assert _run_main(monkeypatch, tmp_path, "test_broken.py") == 2
+    assert "no_such_module" in capsys.readouterr().err
+
+def test_checkpoint_is_one_run_finished_by_the_controller(tmp_path, monkeypatch):
+    """Workers record into the controller's run; collection alone creates no run."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from src import config
+    from src.database import Base, EvaluationRun, TestResult
+
+    database_url = f"sqlite:///{tmp_path / 'eval.db'}"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    monkeypatch.setattr(config.settings, "database_url", database_url)
+    monkeypatch.setenv("DATABASE_URL", database_url)
+    monkeypatch.setenv("PYTHONPATH", os.getcwd())
+    (tmp_path / "test_selection.py").write_text(SELECTION_TESTS)
+
+    assert _run_main(monkeypatch, tmp_path, "-p", "tests.conftest", "--checkpoint", "test_selection.py") == 1
+
+    session = Session()
+    run = session.query(EvaluationRun).one()
+    assert run.run_status != "running" and "metrics" in run.run_metadata
+    assert "resumed" not in run.run_metadata
+    assert sorted(r.test_name for r in session.query(TestResult).filter(TestResult.run_id == run.run_id)) == [
+        "test_selection.py::test_fast", "test_selection.py::test_slow"
+    ]
+
+    collected = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", "-p", "no:cacheprovider",
+         "-p", "tests.conftest", "--checkpoint", "test_selection.py"],
+        capture_output=True
+    )
+    assert collected.returncode == 0
+    assert session.query(EvaluationRun).count() == 1
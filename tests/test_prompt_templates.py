@@ -0,0 +1,76 @@
+"""Tests for few-shot templates, prefix ordering and prefix-cache statistics."""
+
+import asyncio
+
+import pytest
+
+from src.evaluation_engine import EvaluationCase, EvaluationEngine
+from src.prompt_templates import FewShotTemplate, PrefixCacheStats, order_by_prefix
+
+EXAMPLES = [
+    {"text": "This product exceeded my expectations!", "sentiment": "positive"},
+    {"text": "I regret buying this, complete waste of money.", "sentiment": "negative"},
+]
+
+def _template(instruction="Classify the sentiment:\n\n"):
+    return FewShotTemplate(instruction, EXAMPLES, "Text: {text}\nSentiment: {sentiment}", "Text: {text}\nSentiment:")
+
+def test_template_matches_concatenated_prompt():
+    """The prefix is built once and renders the same prompt as string concatenation."""
+    template = _template()
+    expected = "Classify the sentiment:\n\n"
+    for example in EXAMPLES:
+        expected += f"Text: {example['text']}\nSentiment: {example['sentiment']}\n\n"
+    assert template.prefix == expected
+    assert template.render(text="Fine.") == expected + "Text: Fine.\nSentiment:"
+
+def test_prefix_order_raises_hit_ratio_under_eviction():
+    """Interleaved tasks evict each other's prefix; grouped ones reuse it."""
+    templates = [_template(f"Task {i}: classify the sentiment of customer reviews.\n\n" * 3) for i in range(4)]
+    prompts = [t.render(text=f"Review number {n}") for n in range(10) for t in templates]
+    assert order_by_prefix(prompts)[:10] == sorted(p for p in prompts if p.startswith("Task 0"))
+
+    capacity = len(templates[0].prefix) // 64 + 2  # room for about one prefix
+    interleaved, grouped = PrefixCacheStats(capacity_blocks=capacity), PrefixCacheStats(capacity_blocks=capacity)
+    for prompt in prompts:
+        interleaved.observe(prompt)
+    for prompt in order_by_prefix(prompts):
+        grouped.observe(prompt)
+    assert interleaved.hit_ratio == 0
+    assert grouped.hit_ratio > 0.5
+    assert grouped.summary()["prompts"] == 40
+
+def test_server_reported_cached_tokens():
+    """The server ratio comes from usage.prompt_tokens_details when present."""
+    stats = PrefixCacheStats()
+    stats.record_usage({"prompt_tokens": 100})
+    assert stats.server_hit_ratio is None
+    stats.record_usage({"prompt_tokens": 100, "prompt_tokens_details": {"cached_tokens": 0}})
+    stats.record_usage({"prompt_tokens": 100, "prompt_tokens_details": {"cached_tokens": 80}})
+    assert stats.server_hit_ratio == pytest.approx(0.4)
+
+@pytest.mark.asyncio
+async def test_engine_sends_cases_grouped_by_prefix():
+    """The engine dispatches cases sorted by prompt and counts prefix hits."""
+    sent = []
+
+    class RecordingClient:
+        async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+            sent.append(prompt)
+            await asyncio.sleep(0)
+            return {"choices": [{"text": "positive", "finish_reason": "stop"}]}
+
+        async def analyze_response(self, response):
+            return {}
+
+    templates = [_template(f"Task {i}\n\n") for i in range(2)]
+    cases = [
+        EvaluationCase(f"{i}-{n}", f"s::{i}-{n}", "t", {"prompt": t.render(text=str(n))}, {"answer": "positive"})
+        for n in range(3) for i, t in enumerate(templates)
+    ]
+    engine = EvaluationEngine(RecordingClient(), concurrency=1)
+    results = await engine.run(cases)
+
+    assert all(result.passed for result in results)
+    assert sent == sorted(sent)
+    assert engine.prefix_cache.hit_ratio > 0
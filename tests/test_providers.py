@@ -0,0 +1,149 @@
+"""Tests for the provider adapters and batched generation."""
+
+import json
+
+import httpx
+import pytest
+
+from src import config
+from src.llm_client import LLMClient
+from src.providers import (
+    LlamaCppProvider,
+    OpenAIChatProvider,
+    OpenAICompletionsProvider,
+    TGIProvider,
+    get_provider,
+)
+
+def test_chat_payload_and_logprobs():
+    """The chat payload is unchanged by default; logprobs come back in the completions layout."""
+    provider = OpenAIChatProvider(system_prompt="Be brief.")
+    payload = provider.build_request("m", ["hi"], 8, 0.0)
+    assert payload == {
+        "model": "m",
+        "messages": [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "hi"}],
+        "temperature": 0.0,
+        "max_tokens": 8
+    }
+    assert len(OpenAIChatProvider().build_request("m", ["hi"], None, 1.0)["messages"]) == 1
+    assert OpenAIChatProvider().build_request("m", ["hi"], None, 1.0, logprobs=2)["top_logprobs"] == 2
+
+    raw = {"model": "m", "choices": [{
+        "message": {"content": "Hi"},
+        "finish_reason": "stop",
+        "logprobs": {"content": [{"token": "Hi", "logprob": -0.1, "top_logprobs": [{"token": "Hi", "logprob": -0.1}]}]}
+    }]}
+    [response] = provider.parse_response(raw, 1)
+    assert response["choices"][0]["text"] == "Hi"
+    assert response["choices"][0]["logprobs"] == {"tokens": ["Hi"], "token_logprobs": [-0.1], "top_logprobs": [{"Hi": -0.1}]}
+
+    with pytest.raises(ValueError):
+        provider.build_request("m", ["a", "b"], None, 1.0)
+
+def test_completions_batch_groups_choices_by_prompt():
+    """Choice i * n + j is sample j of prompt i; batch usage is left to estimation."""
+    provider = OpenAICompletionsProvider()
+    assert provider.build_request("m", ["a", "b"], 4, 1.0, n=2)["prompt"] == ["a", "b"]
+    raw = {"model": "m", "usage": {"prompt_tokens": 2}, "choices": [
+        {"index": i, "text": f"t{i}", "finish_reason": "stop"} for i in (3, 0, 2, 1)
+    ]}
+    responses = provider.parse_response(raw, 2, n=2)
+    assert [[c["text"] for c in r["choices"]] for r in responses] == [["t0", "t1"], ["t2", "t3"]]
+    assert responses[0]["usage"] is None
+
+def test_tgi_native_generate():
+    """best_of sequences become extra choices; TGI finish reasons and token logprobs are mapped."""
+    provider = TGIProvider()
+    payload = provider.build_request("m", ["hi"], 16, 0.0, n=2, logprobs=3)
+    assert payload == {"inputs": "hi", "parameters": {
+        "details": True, "do_sample": True, "max_new_tokens": 16, "best_of": 2, "top_n_tokens": 3
+    }}
+    raw = {"generated_text": "a b", "details": {
+        "finish_reason": "eos_token",
+        "generated_tokens": 2,
+        "prefill": [{"text": "hi"}],
+        "tokens": [{"text": "a", "logprob": -0.5}, {"text": " b", "logprob": -0.25}],
+        "best_of_sequences": [{"generated_text": "c", "finish_reason": "length", "generated_tokens": 1}]
+    }}
+    [response] = provider.parse_response(raw, 1, n=2)
+    assert [(c["text"], c["finish_reason"]) for c in response["choices"]] == [("a b", "stop"), ("c", "length")]
+    assert response["choices"][0]["logprobs"]["token_logprobs"] == [-0.5, -0.25]
+    assert response["usage"] == {"completion_tokens": 3, "prompt_tokens": 1}
+    assert provider.parse_stream_chunk({"token": {"text": "a"}, "details": None}).text == "a"
+
+def test_llama_cpp_completion():
+    """Multi-prompt requests get one result each, with KV cache reuse reported as cached tokens."""
+    provider = LlamaCppProvider()
+    payload = provider.build_request("m", ["a", "b"], 8, 0.5, logprobs=0)
+    assert payload == {"prompt": ["a", "b"], "n_predict": 8, "temperature": 0.5, "cache_prompt": True, "n_probs": 1}
+    raw = [
+        {"content": "x", "stop_type": "eos", "tokens_evaluated": 5, "tokens_predicted": 1, "timings": {"cache_n": 4}},
+        {"content": "y", "stop_type": "limit", "tokens_evaluated": 5, "tokens_predicted": 8,
+         "completion_probabilities": [{"content": "y", "probs": [{"tok_str": "y", "prob": 1.0}]}]}
+    ]
+    first, second = provider.parse_response(raw, 2)
+    assert first["choices"][0]["finish_reason"] == "stop"
+    assert first["usage"]["prompt_tokens_details"] == {"cached_tokens": 4}
+    assert second["choices"][0]["finish_reason"] == "length"
+    assert second["choices"][0]["logprobs"]["token_logprobs"] == [0.0]
+
+    with pytest.raises(ValueError):
+        provider.build_request("m", ["a"], 8, 0.5, n=2)
+    with pytest.raises(ValueError):
+        get_provider("bard")
+
+@pytest.mark.asyncio
+async def test_generate_batch_through_completions(mock_server, monkeypatch):
+    """Prompts are sent in chunks of max_batch_prompts and match single-prompt generations."""
+    monkeypatch.setattr(config.settings, "max_batch_prompts", 3)
+    client = LLMClient(base_url=mock_server.url, api_key="mock", model_name="mock", provider="openai-completions")
+    prompts = [f"question {i}" for i in range(7)]
+
+    responses = await client.generate_batch(prompts, max_tokens=8, temperature=0.0)
+    assert mock_server.request_count == 3
+    single = await client.generate(prompts[4], max_tokens=8, temperature=0.0)
+    assert responses[4]["choices"] == single["choices"]
+    # The last chunk is a single prompt, so its usage comes from the server
+    assert [r["usage"].get("estimated", False) for r in responses] == [True] * 6 + [False]
+    assert all(r["usage"]["prompt_tokens"] == 2 for r in responses)
+
+    samples = await client.generate_samples("question 0", 3, max_tokens=8)
+    assert len(set(samples)) == 3 and mock_server.request_count == 5
+
+@pytest.mark.asyncio
+async def test_generate_batch_without_batch_endpoint(mock_server):
+    """Providers without a multi-prompt endpoint send one request per prompt, concurrently."""
+    client = LLMClient(base_url=mock_server.url, api_key="mock", model_name="mock")
+    responses = await client.generate_batch(["a", "b"])
+    assert [r["choices"][0]["text"] for r in responses] == [
+        (await client.generate(p))["choices"][0]["text"] for p in ("a", "b")
+    ]
+    assert mock_server.request_count == 4
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider, reply", [
+    ("openai-chat", {"model": "judge", "choices": [{"message": {"content": "ok"}, "finish_reason": "stop"}]}),
+    ("tgi", {"generated_text": "ok", "details": {"finish_reason": "eos_token", "generated_tokens": 1}}),
+])
+async def test_per_call_model_override(provider, reply):
+    """A `model` keyword overrides the client's model instead of clashing with it."""
+    bodies = []
+
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json=reply)
+
+    client = LLMClient(base_url="http://h", api_key="k", model_name="base", provider=provider)
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        response = await client.generate("hi", model="judge", max_tokens=4)
+    finally:
+        await client._http.aclose()
+    assert response["choices"][0]["text"] == "ok"
+    assert response["model"] == "judge"
+    assert len(bodies) == 1
+    if provider == "openai-chat":
+        assert bodies[0]["model"] == "judge"
+    else:
+        # TGI serves a single model, so the name is not part of its payload
+        assert "model" not in bodies[0] and "model" not in bodies[0]["parameters"]
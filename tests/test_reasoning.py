@@ -5,9 +5,12 @@ import uuid
 
 from src.llm_client import LLMClient
 from src.database import get_session, UnitTestSuite, UnitTest
+from src.config import settings
+from src.keyword_scorer import KeywordScorer
+from src.sampling import mean_pass_at_k, parse_k_values, pass_at_k_scores, sample_texts
 
 @pytest.mark.asyncio
-async def test_logical_deduction(llm_client, db_session, make_test_suite):
+async def test_logical_deduction(llm_client, db_session, make_test_suite, record_property):
     """Test logical deduction capabilities."""
     client = llm_client  # Removed await
     
@@ -49,6 +52,9 @@ async def test_logical_deduction(llm_client, db_session, make_test_suite):
         db_session.add(test)
     db_session.commit()
     
+    ks = parse_k_values(settings.pass_at_k)
+    per_question_scores = []
+    
     for question in questions:
         prompt = f"""
         Given these premises:
@@ -58,15 +64,15 @@ async def test_logical_deduction(llm_client, db_session, make_test_suite):
         Provide a direct answer without explanation.
         """
         
-        response = await client.generate(
-            prompt=prompt,
-            max_tokens=50,
-            temperature=0.0
-        )
+        scorer = KeywordScorer.from_expected_output({"keywords": question["expected_keywords"]})
+        answers = [text.strip().lower() for text in await sample_texts(client, prompt, max_tokens=50)]
+        passed = [score == 1.0 for score in scorer.score_batch(answers)]
+        per_question_scores.append(pass_at_k_scores(passed, ks))
         
-        answer = response["choices"][0]["text"].strip().lower()
-        assert any(keyword in answer for keyword in question["expected_keywords"]), \
-            f"Answer '{answer}' does not contain any expected keywords: {question['expected_keywords']}"
+        assert any(passed), \
+            f"Answer '{answers[0]}' does not contain any expected keywords: {question['expected_keywords']}"
+    
+    record_property("pass_at_k", mean_pass_at_k(per_question_scores))
 
 @pytest.mark.asyncio
 async def test_cause_effect_analysis(llm_client, db_session, make_test_suite):
@@ -123,7 +129,8 @@ async def test_cause_effect_analysis(llm_client, db_session, make_test_suite):
         )
         
         answer = response["choices"][0]["text"].strip().lower()
-        assert scenario["expected_phrase"] in answer, \
+        scorer = KeywordScorer.from_expected_output({"key_phrase": scenario["expected_phrase"]})
+        assert scorer.score(answer) == 1.0, \
             f"Expected to find '{scenario['expected_phrase']}' in answer: {answer}"
 
 @pytest.mark.asyncio
@@ -0,0 +1,57 @@
+"""Tests for streamed result storage and the metrics report built from it."""
+
+import json
+
+from src.result_stream import ResultStreamWriter, iter_results, summarize_stream
+from src.test_aggregator import write_metrics_report
+
+def _write(path, outcomes):
+    with ResultStreamWriter(str(path)) as stream:
+        for i, outcome in enumerate(outcomes):
+            stream.write({"test_name": f"t::{i}", "outcome": outcome, "duration": 0.1})
+
+def test_stream_round_trip_gzip(tmp_path):
+    """Results written to a .gz stream are read back in order."""
+    path = tmp_path / "results.jsonl.gz"
+    _write(path, ["passed", "failed", "skipped"])
+
+    assert [r["outcome"] for r in iter_results(str(path))] == ["passed", "failed", "skipped"]
+
+def test_partial_stream_is_usable(tmp_path):
+    """A truncated last line from a crashed run is ignored."""
+    path = tmp_path / "results.jsonl"
+    _write(path, ["passed", "passed", "failed"])
+    with open(path, "a") as f:
+        f.write('{"test_name": "t::3", "outc')
+
+    metrics = summarize_stream(str(path))
+
+    assert len(list(iter_results(str(path)))) == 3
+    assert round(metrics["success_rate"], 2) == 66.67
+    assert metrics["coverage_rate"] == 100.0
+
+def test_metrics_report_from_stream(tmp_path):
+    """The streamed report has the same shape as the old single dump."""
+    stream_path = tmp_path / "results.jsonl"
+    report_path = tmp_path / "test_metrics.json"
+    _write(stream_path, ["passed", "skipped"])
+
+    header = write_metrics_report(str(stream_path), str(report_path), "model-x")
+    report = json.loads(report_path.read_text())
+
+    assert report["metrics"] == header["metrics"]
+    assert report["status"] == "partial"
+    assert report["model_name"] == "model-x"
+    assert [r["test_name"] for r in report["results"]] == ["t::0", "t::1"]
+
+def test_metrics_report_without_results(tmp_path):
+    """Results can be left out of the report."""
+    stream_path = tmp_path / "results.jsonl"
+    report_path = tmp_path / "test_metrics.json"
+    _write(stream_path, [])
+
+    write_metrics_report(str(stream_path), str(report_path), "model-x", include_results=False)
+    report = json.loads(report_path.read_text())
+
+    assert "results" not in report
+    assert report["status"] == "insufficient_coverage"
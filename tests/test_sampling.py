@@ -0,0 +1,118 @@
+"""Tests for pass@k sampling."""
+
+import json
+from math import comb
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.llm_client import LLMClient
+from src.result_stream import MetricsAccumulator
+from src.sampling import mean_pass_at_k, parse_k_values, pass_at_k, pass_at_k_scores, sample_texts
+
+def test_pass_at_k_matches_combinatorial_definition():
+    """The running product equals 1 - C(n-c, k) / C(n, k)."""
+    for n, c, k in [(10, 3, 1), (10, 3, 5), (20, 1, 10), (5, 0, 2), (5, 5, 5)]:
+        expected = 1 - comb(n - c, k) / comb(n, k)
+        assert pass_at_k(n, c, k) == pytest.approx(expected)
+
+def test_pass_at_k_edge_cases():
+    """pass@1 is the pass rate; k larger than n is rejected."""
+    assert pass_at_k(4, 1, 1) == pytest.approx(0.25)
+    assert pass_at_k(4, 0, 4) == 0.0
+    assert pass_at_k(4, 1, 4) == 1.0
+    with pytest.raises(ValueError):
+        pass_at_k(2, 1, 3)
+
+def test_scores_skip_k_above_sample_count():
+    """Only k values that fit the number of samples are reported."""
+    assert parse_k_values("10, 1,5,1") == [1, 5, 10]
+    scores = pass_at_k_scores([True, False, False, False, False], [1, 5, 10])
+    assert scores == {"pass@1": pytest.approx(0.2), "pass@5": 1.0}
+    assert mean_pass_at_k([{"pass@1": 1.0}, {"pass@1": 0.0}]) == {"pass@1": 0.5}
+
+class _Recorder:
+    """Stand-in for LLMClient.generate that records the n it was asked for."""
+
+    def __init__(self, native_choices=None, reject_n=False):
+        self.native_choices = native_choices
+        self.reject_n = reject_n
+        self.calls = []
+
+    async def __call__(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+        n = kwargs.get("n", 1)
+        self.calls.append(n)
+        if n > 1 and self.reject_n:
+            request = httpx.Request("POST", "http://test/v1/chat/completions")
+            raise httpx.HTTPStatusError("bad request", request=request, response=httpx.Response(400, request=request))
+        count = self.native_choices if n > 1 else 1
+        return {"choices": [{"text": f"sample {len(self.calls)}.{i}", "finish_reason": "stop"} for i in range(count)]}
+
+@pytest.mark.asyncio
+async def test_generate_samples_uses_single_request():
+    """All samples come from one request when the server honours n."""
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    client.generate = _Recorder(native_choices=4)
+    texts = await client.generate_samples("p", n=4)
+    assert len(texts) == 4
+    assert client.generate.calls == [4]
+
+@pytest.mark.asyncio
+async def test_generate_samples_tops_up_missing_choices():
+    """Servers that ignore n get the remaining samples as concurrent single requests."""
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    client.generate = _Recorder(native_choices=1)
+    texts = await client.generate_samples("p", n=3)
+    assert len(texts) == 3
+    assert client.generate.calls == [3, 1, 1]
+
+    client.generate = _Recorder(reject_n=True)
+    texts = await client.generate_samples("p", n=3)
+    assert len(texts) == 3
+    assert client.generate.calls == [3, 1, 1, 1]
+
+@pytest.mark.asyncio
+async def test_rejected_n_falls_back_without_retrying(monkeypatch):
+    """A 400 for the native n request is not retried; single requests follow at once."""
+    monkeypatch.setattr(settings, "max_retries", 3)
+    monkeypatch.setattr(settings, "retry_delay", 0)
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body.get("n", 1))
+        if body.get("n", 1) > 1:
+            return httpx.Response(400, json={"error": "n is not supported"})
+        return httpx.Response(200, json={
+            "model": "m", "choices": [{"message": {"content": "x"}, "finish_reason": "stop"}]
+        })
+
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        assert len(await client.generate_samples("p", n=3)) == 3
+    finally:
+        await client._http.aclose()
+    assert requests == [3, 1, 1, 1]
+
+@pytest.mark.asyncio
+async def test_sample_texts_defaults_to_greedy(monkeypatch):
+    """With one sample per prompt the test suites keep their temperature 0 call."""
+    monkeypatch.setattr(settings, "samples_per_prompt", 1)
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    client.generate = _Recorder()
+    assert await sample_texts(client, "p", max_tokens=10) == ["sample 1.0"]
+    assert client.generate.calls == [1]
+
+def test_accumulator_averages_pass_at_k_per_suite():
+    """pass@k recorded by tests is averaged overall and per test module."""
+    accumulator = MetricsAccumulator()
+    accumulator.add({"test_name": "tests/a.py::t1", "outcome": "passed", "properties": {"pass_at_k": {"pass@1": 1.0}}})
+    accumulator.add({"test_name": "tests/a.py::t2", "outcome": "failed", "properties": {"pass_at_k": {"pass@1": 0.5}}})
+    accumulator.add({"test_name": "tests/b.py::t1", "outcome": "passed", "properties": {"pass_at_k": {"pass@1": 0.0}}})
+    accumulator.add({"test_name": "tests/b.py::t2", "outcome": "passed"})
+
+    result = accumulator.pass_at_k()
+    assert result["overall"] == {"pass@1": pytest.approx(0.5)}
+    assert result["suites"] == {"tests/a.py": {"pass@1": 0.75}, "tests/b.py": {"pass@1": 0.0}}
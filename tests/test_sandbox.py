@@ -0,0 +1,76 @@
+"""Tests for the sandboxed code execution pool."""
+
+import pytest
+
+from src.sandbox import SandboxPool
+
+FIBONACCI = """
+def fibonacci(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+"""
+
+@pytest.fixture(scope="module")
+def pool():
+    with SandboxPool(workers=2, call_timeout=0.5) as pool:
+        yield pool
+
+def test_correct_code_passes(pool):
+    """Outputs are compared with the expected values per input."""
+    result = pool.run(FIBONACCI, "fibonacci", [1, 2, 3, 4, 5, 6], [1, 1, 2, 3, 5, 8])
+    assert result.all_passed
+    assert result.outputs == [1, 1, 2, 3, 5, 8]
+
+def test_wrong_output_and_exceptions(pool):
+    """Wrong answers and raised exceptions fail individual inputs."""
+    code = "def f(x):\n    return 1 / x\n"
+    result = pool.run(code, "f", [1, 0, 2], [1.0, 0, 1.0])
+    assert result.passed == [True, False, False]
+    assert result.outputs[1].startswith("ZeroDivisionError")
+    assert not result.all_passed
+
+def test_infinite_loop_times_out(pool):
+    """A hanging call is interrupted and the worker stays usable."""
+    result = pool.run("def f(x):\n    while True:\n        pass\n", "f", [1], [1])
+    assert result.timed_out
+    assert pool.run(FIBONACCI, "fibonacci", [10], [55]).all_passed
+
+def test_network_and_memory_are_limited(pool):
+    """Sockets cannot be opened and huge allocations fail."""
+    network = pool.run("import socket\ndef f(x):\n    return socket.socket()\n", "f", [1], [None])
+    memory = pool.run("def f(x):\n    return [0] * (10 ** 10)\n", "f", [1], [None])
+    assert network.outputs[0].startswith("PermissionError")
+    assert memory.outputs[0].startswith("MemoryError")
+
+def test_crashed_worker_is_replaced(pool):
+    """A worker killed by generated code is respawned."""
+    crashed = pool.run("import os\nos._exit(3)\n", "f", [1], [1])
+    assert "crashed" in crashed.error
+    results = pool.run_many([(FIBONACCI, "fibonacci", [10], [55])] * 6)
+    assert all(r.all_passed for r in results)
+
+def test_samples_cannot_affect_each_other(pool):
+    """Builtins and module state patched by one sample are gone for the next."""
+    patch = "import builtins, json\nbuiltins.len = lambda x: 0\njson.dumps = None\ndef f(x):\n    return len(x)\n"
+    check = "import json\ndef f(x):\n    return (len(x), json.dumps(x))\n"
+    assert pool.run_many([(patch, "f", [[1, 2]], [0])] * 2)[0].all_passed
+    results = pool.run_many([(check, "f", [[1, 2]], [(2, "[1, 2]")])] * 4)
+    assert all(r.all_passed for r in results)
+
+def test_dead_zygote_is_replaced_from_pool_threads(pool):
+    """A worker process that dies is replaced, even when the failure is seen on a pool thread."""
+    worker = pool._idle.get()
+    worker.process.kill()
+    worker.process.join()
+    pool._idle.put(worker)
+    results = pool.run_many([(FIBONACCI, "fibonacci", [10], [55])] * 4)
+    assert sum("crashed" in (r.error or "") for r in results) == 1
+    assert all(r.all_passed for r in pool.run_many([(FIBONACCI, "fibonacci", [10], [55])] * 4))
+
+def test_syntax_error_is_reported(pool):
+    """Code that fails to load reports the error without outputs."""
+    result = pool.run("def f(:\n", "f", [1], [1])
+    assert result.error.startswith("SyntaxError")
+    assert result.outputs == []
@@ -0,0 +1,101 @@
+"""Tests for the priority and fair-share evaluation scheduler."""
+
+import asyncio
+
+import pytest
+
+from src.deadline import current_deadline
+from src.evaluation_engine import EvaluationCase, EvaluationEngine
+from src.scheduler import EvaluationScheduler, WorkAborted
+
+def _job(started, name, seconds=0.0):
+    async def run():
+        started.append(name)
+        await asyncio.sleep(seconds)
+        return name
+    return run
+
+@pytest.mark.asyncio
+async def test_priority_outranks_submission_order():
+    """Everything submitted together is queued before the best priority starts."""
+    scheduler = EvaluationScheduler(concurrency=1)
+    started = []
+    futures = [scheduler.submit(_job(started, f"p{p}-{i}"), priority=p) for p in (3, 2, 1) for i in range(2)]
+    assert await asyncio.gather(*futures) == ["p3-0", "p3-1", "p2-0", "p2-1", "p1-0", "p1-1"]
+    assert started == ["p1-0", "p1-1", "p2-0", "p2-1", "p3-0", "p3-1"]
+
+@pytest.mark.asyncio
+async def test_fair_share_across_groups():
+    """Within a priority level, groups alternate instead of one suite running to completion."""
+    scheduler = EvaluationScheduler(concurrency=1)
+    started = []
+    futures = [scheduler.submit(_job(started, f"big{i}"), group="big") for i in range(4)]
+    futures += [scheduler.submit(_job(started, f"small{i}"), group="small") for i in range(2)]
+    await asyncio.gather(*futures)
+    assert sorted(started[:4]) == ["big0", "big1", "small0", "small1"]
+
+    weighted = EvaluationScheduler(concurrency=1, weights={"a": 2.0})
+    started.clear()
+    await asyncio.gather(*(
+        weighted.submit(_job(started, group, 0.02), group=group) for group in ("a", "b") for _ in range(3)
+    ))
+    assert started[:3].count("a") == 2
+
+@pytest.mark.asyncio
+async def test_budget_aborts_work_that_cannot_finish():
+    """Queued work that no longer fits in the budget fails fast with WorkAborted."""
+    scheduler = EvaluationScheduler(concurrency=1, time_budget=0.25)
+    started = []
+    high = [scheduler.submit(_job(started, f"high{i}", 0.1), priority=1, estimate=0.1) for i in range(2)]
+    low = [scheduler.submit(_job(started, f"low{i}", 0.1), priority=2, estimate=0.1) for i in range(2)]
+
+    assert await asyncio.gather(*high) == ["high0", "high1"]
+    outcomes = await asyncio.gather(*low, return_exceptions=True)
+    assert isinstance(outcomes[-1], WorkAborted)
+    assert scheduler.stats()["aborted"] >= 1
+
+@pytest.mark.asyncio
+async def test_abort_margin_keeps_only_top_priority():
+    """Inside the margin only the best remaining priority starts; running work sees the budget."""
+    scheduler = EvaluationScheduler(concurrency=2, time_budget=10, abort_margin=60)
+    budgets = []
+
+    async def top():
+        budgets.append(current_deadline().remaining())
+        await asyncio.sleep(0.05)
+        return "top"
+
+    results = await asyncio.gather(
+        scheduler.submit(top, priority=1),
+        scheduler.submit(_job([], "low"), priority=2),
+        return_exceptions=True
+    )
+    assert results[0] == "top"
+    assert isinstance(results[1], WorkAborted)
+    assert 0 < budgets[0] <= 10
+
+    # Once the top level has drained, the next level is the best remaining and starts
+    assert await scheduler.submit(_job([], "next"), priority=2) == "next"
+
+@pytest.mark.asyncio
+async def test_engine_reports_aborted_cases_as_skipped():
+    """Cases the scheduler aborts come back as skipped results, not errors."""
+
+    class SlowClient:
+        async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+            await asyncio.sleep(0.05)
+            return {"choices": [{"text": "4", "finish_reason": "stop"}]}
+
+        async def analyze_response(self, response):
+            return {}
+
+    cases = [
+        EvaluationCase(str(i), f"s::{i}", "t", {"prompt": f"{i}: 2+2?"}, {"result": 4}, suite_name="s", priority=1 + i % 2)
+        for i in range(6)
+    ]
+    scheduler = EvaluationScheduler(concurrency=1, time_budget=0.12, default_estimate=0.05)
+    results = await EvaluationEngine(SlowClient(), scheduler=scheduler).run(cases)
+
+    skipped = [result for result in results if result.skipped]
+    assert skipped and all(result.to_record()["outcome"] == "skipped" for result in skipped)
+    assert all(result.case.priority == 1 for result in results if result.passed)
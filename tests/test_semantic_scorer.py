@@ -0,0 +1,158 @@
+"""Tests for the embedding-based semantic scorer."""
+
+import multiprocessing
+
+import httpx
+import numpy as np
+import pytest
+
+from src.evaluation_engine import EvaluationCase, EvaluationEngine
+from src.llm_client import LLMClient
+from src.semantic_scorer import SemanticScorer, VectorCache, cosine_similarity, text_key
+
+class FakeEmbeddingClient:
+    """Embeds text as letter counts and records every batch it is sent."""
+
+    embedding_model = "fake-embedding"
+
+    def __init__(self):
+        self.batches = []
+
+    async def get_embeddings(self, texts):
+        self.batches.append(list(texts))
+        vectors = []
+        for text in texts:
+            vector = [0.0] * 26
+            for char in text.lower():
+                if "a" <= char <= "z":
+                    vector[ord(char) - ord("a")] += 1
+            vectors.append(vector)
+        return vectors
+
+    async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+        return {"choices": [{"text": "the cat sat", "finish_reason": "stop"}]}
+
+    async def analyze_response(self, response):
+        return {}
+
+@pytest.mark.asyncio
+async def test_get_embeddings_sends_one_request():
+    """All texts go in one /v1/embeddings request and come back in input order."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"data": [
+            {"index": 1, "embedding": [0.0, 1.0]},
+            {"index": 0, "embedding": [1.0, 0.0]},
+        ]})
+
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        vectors = await client.get_embeddings(["first", "second"])
+    finally:
+        await client._http.aclose()
+    assert vectors == [[1.0, 0.0], [0.0, 1.0]]
+    assert len(requests) == 1
+    assert requests[0].url.path == "/v1/embeddings"
+
+def test_cosine_similarity():
+    """Similarity is computed pairwise and zero vectors do not divide by zero."""
+    a = np.array([[1, 0], [0, 2], [0, 0]])
+    b = np.array([[2, 0], [1, 1]])
+    sims = cosine_similarity(a, b)
+    assert sims.shape == (3, 2)
+    assert sims[0, 0] == pytest.approx(1.0)
+    assert sims[1, 1] == pytest.approx(np.sqrt(0.5))
+    assert not np.isnan(sims).any()
+
+def test_vector_cache_roundtrip(tmp_path):
+    """Vectors survive reopening, and rows without vector data are ignored."""
+    cache = VectorCache(str(tmp_path))
+    cache.put_many(["a", "b"], np.array([[1, 2, 3], [4, 5, 6]]))
+    cache.put_many(["c"], np.array([[7, 8, 9]]))
+
+    reopened = VectorCache(str(tmp_path))
+    assert len(reopened) == 3
+    found = reopened.get_many(["c", "a", "missing"])
+    assert set(found) == {"a", "c"}
+    assert found["c"].tolist() == [7, 8, 9]
+    assert found["a"].dtype == np.float32
+
+    # Simulate a crash after the index line was written but before the vector
+    with open(tmp_path / "default-3.jsonl", "a") as f:
+        f.write('{"key": "d", "row": 3}\n{"key": "e", "ro')
+    assert "d" not in VectorCache(str(tmp_path))
+
+    # Another model or dimension gets its own shard instead of an error
+    reopened.put_many(["x"], np.array([[1.0, 2.0]]), model="other/model")
+    assert sorted(p.name for p in tmp_path.glob("*.f32")) == ["default-3.f32", "other_model-2.f32"]
+    assert VectorCache(str(tmp_path)).get_many(["x", "a"])["x"].tolist() == [1.0, 2.0]
+
+def _append_rows(directory, worker):
+    cache = VectorCache(directory)
+    for i in range(50):
+        cache.put_many([f"{worker}-{i}"], np.full((1, 8), worker * 100 + i))
+
+def test_vector_cache_shared_by_processes(tmp_path):
+    """Concurrent writers to one shard never get overlapping rows."""
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_append_rows, args=(str(tmp_path), w)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    cache = VectorCache(str(tmp_path))
+    assert len(cache) == 200
+    found = cache.get_many([f"{w}-{i}" for w in range(4) for i in range(50)])
+    assert all(found[f"{w}-{i}"].tolist() == [w * 100 + i] * 8 for w in range(4) for i in range(50))
+
+@pytest.mark.asyncio
+async def test_embeddings_are_batched_and_cached(tmp_path):
+    """Unique texts are sent in batches once; later calls are served from disk."""
+    client = FakeEmbeddingClient()
+    scorer = SemanticScorer(client, VectorCache(str(tmp_path)), batch_size=2)
+    matrix = await scorer.embed(["abc", "abd", "abc", "xyz"])
+    assert matrix.shape == (4, 26)
+    assert sorted(len(batch) for batch in client.batches) == [1, 2]
+    assert np.array_equal(matrix[0], matrix[2])
+
+    fresh_client = FakeEmbeddingClient()
+    fresh = SemanticScorer(fresh_client, VectorCache(str(tmp_path)))
+    await fresh.embed(["xyz", "abd"])
+    assert fresh_client.batches == []
+    assert text_key("fake-embedding", "abc") in fresh.cache
+
+@pytest.mark.asyncio
+async def test_scores_against_references():
+    """Scores use the best matching reference, and batches embed everything once."""
+    client = FakeEmbeddingClient()
+    scorer = SemanticScorer(client, threshold=0.9)
+    assert await scorer.score("listen", ["silent", "zzz"]) == pytest.approx(1.0)
+
+    scores = await scorer.score_batch(["tac", "dog"], [["cat"], ["cat", "god"]])
+    assert scores == [pytest.approx(1.0), pytest.approx(1.0)]
+    assert len(client.batches) == 2
+
+    best = await scorer.best_matches(["the cat sat", "a dog"], ["dog", "qqq"])
+    assert best[0] > 0.5 and best[1] == 0.0
+
+@pytest.mark.asyncio
+async def test_engine_uses_semantic_scorer_for_references(tmp_path):
+    """Cases with reference answers are scored by embedding similarity."""
+    client = FakeEmbeddingClient()
+    scorer = SemanticScorer(client, VectorCache(str(tmp_path)), threshold=0.95)
+    engine = EvaluationEngine(client)
+    engine._semantic = scorer.as_scorer()
+
+    cases = [
+        EvaluationCase("1", "s::1", "summary", {"prompt": "p"}, {"references": ["a cat sat there", "sat cat the"]}),
+        EvaluationCase("2", "s::2", "summary", {"prompt": "p"}, {"reference": "dogs bark loudly"}),
+    ]
+    results = {r.case.case_id: r for r in await engine.run(cases)}
+    assert results["1"].passed
+    assert not results["2"].passed and 0 <= results["2"].score < 0.95
+    # Both cases finished together, so their texts and references went in one embeddings request
+    assert len(client.batches) == 1 and len(client.batches[0]) == 4
@@ -0,0 +1,66 @@
+"""Tests for sequential pass-rate testing and the engine's sequential mode."""
+
+import random
+
+import pytest
+
+from src.evaluation_engine import EvaluationCase, EvaluationEngine
+from src.sequential import SequentialTest, score_test_confidence, wilson_interval
+
+def test_wilson_interval_matches_reference_values():
+    """Known values: 8/10 at 95% is about (0.490, 0.943)."""
+    low, high = wilson_interval(8, 10, 0.95)
+    assert low == pytest.approx(0.4902, abs=1e-3)
+    assert high == pytest.approx(0.9433, abs=1e-3)
+    assert wilson_interval(0, 0) == (0.0, 1.0)
+    assert score_test_confidence(95, 100, 0.8) > 0.999
+
+@pytest.mark.parametrize("method", ["wilson", "sprt"])
+def test_clear_pass_and_fail_stop_early(method):
+    """A 95% or 40% pass rate against an 80% threshold is decided from a fraction of 2000 cases."""
+    for rate, expected in ((0.95, "pass"), (0.4, "fail")):
+        rng = random.Random(1)
+        test = SequentialTest(0.8, method=method, population=2000)
+        while test.add(rng.random() < rate) is None:
+            pass
+        assert test.decision == expected
+        assert test.samples < 200
+        assert test.achieved_confidence >= 0.95
+        assert test.summary()["decision"] == expected
+
+def test_exhausted_population_is_exact():
+    """Near the threshold the test runs to the end and decides on the exact pass rate."""
+    test = SequentialTest(0.8, method="wilson", population=10)
+    for passed in [True] * 8 + [False] * 2:
+        test.add(passed)
+    assert (test.decision, test.achieved_confidence, test.pass_rate) == ("pass", 1.0, 0.8)
+
+    with pytest.raises(ValueError):
+        SequentialTest(method="bayes")
+
+@pytest.mark.asyncio
+async def test_engine_sequential_mode_saves_calls():
+    """Only enough cases are evaluated per suite to decide it."""
+    calls = []
+
+    class Client:
+        async def generate(self, prompt, max_tokens=None, temperature=1.0, **kwargs):
+            calls.append(prompt)
+            good = prompt.startswith("good")
+            return {"choices": [{"text": "4" if good else "5", "finish_reason": "stop"}]}
+
+        async def analyze_response(self, response):
+            return {}
+
+    cases = [
+        EvaluationCase(f"{suite}{i}", f"{suite}::{i}", "t", {"prompt": f"{suite} {i}"}, {"result": 4}, suite_name=suite)
+        for suite in ("good", "bad") for i in range(500)
+    ]
+    engine = EvaluationEngine(Client(), concurrency=8)
+    results, tests = await engine.run_sequential(
+        cases, lambda population: SequentialTest(0.8, "sprt", population=population), seed=0
+    )
+
+    assert tests["good"].decision == "pass" and tests["bad"].decision == "fail"
+    assert len(results) == len(calls) < 100
+    assert tests["good"].samples + tests["bad"].samples == len(results)
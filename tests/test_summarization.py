@@ -6,9 +6,10 @@ from datetime import datetime
 
 from src.llm_client import LLMClient
 from src.database import get_session, ModelRegistry, UnitTestSuite, UnitTest
+from src.keyword_scorer import KeywordScorer
 
 @pytest.mark.asyncio
-async def test_article_summarization(llm_client, db_session, make_test_suite):
+async def test_article_summarization(llm_client, db_session, make_test_suite, semantic_scorer):
     """Test article summarization capabilities."""
     client = llm_client  # Removed await
     
@@ -58,9 +59,13 @@ async def test_article_summarization(llm_client, db_session, make_test_suite):
     
     summary = response["choices"][0]["text"].strip()
     
-    # Check if key points are present
-    for point in key_points:
-        assert point.lower() in summary.lower(), f"Missing key point: {point}"
+    # Check if key points are present, literally or paraphrased in some sentence
+    missing = KeywordScorer.from_expected_output(test_case.expected_output).missing(summary)
+    if missing:
+        sentences = [s.strip() for s in summary.split(".") if s.strip()] or [summary]
+        similarities = await semantic_scorer.best_matches(sentences, missing)
+        missing = [point for point, sim in zip(missing, similarities) if sim < semantic_scorer.threshold]
+    assert not missing, f"Missing key points: {missing}"
     
     # Record test results
     metrics = await client.analyze_response(response)
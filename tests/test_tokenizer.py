@@ -0,0 +1,71 @@
+"""Tests for token counting and derived throughput metrics."""
+
+import base64
+import pytest
+
+from src.tokenizer import BPETokenizer, WhitespaceTokenizer
+from src.llm_client import LLMClient
+
+@pytest.fixture
+def rank_file(tmp_path):
+    """Write a tiny .tiktoken file: all single bytes plus a few merges."""
+    tokens = [bytes([i]) for i in range(256)] + [b"he", b"ll", b"llo", b"hello", b" w", b"or", b" wor"]
+    path = tmp_path / "tiny.tiktoken"
+    path.write_bytes(b"".join(
+        base64.b64encode(token) + b" " + str(rank).encode() + b"\n"
+        for rank, token in enumerate(tokens)
+    ))
+    return str(path)
+
+def test_bpe_merges_by_rank(rank_file):
+    """Pieces are merged according to rank order."""
+    tokenizer = BPETokenizer.from_file(rank_file)
+
+    assert tokenizer.count("hello") == 1
+    # " world" -> " wor" + "l" + "d"
+    assert tokenizer.count(" world") == 3
+    assert tokenizer.count("hello world") == 4
+    assert tokenizer.count("") == 0
+
+def test_counts_are_cached(rank_file):
+    """Repeated counts hit the LRU cache."""
+    tokenizer = BPETokenizer.from_file(rank_file)
+    tokenizer.count("hello world")
+    tokenizer.count("hello world")
+
+    assert tokenizer.cache_info().hits == 1
+
+def test_batch_counting_preserves_order():
+    """Batched counts line up with the input texts."""
+    tokenizer = WhitespaceTokenizer()
+    assert tokenizer.count_batch(["a b", "c", "a b"]) == [2, 1, 2]
+
+@pytest.mark.asyncio
+async def test_analyze_response_throughput_and_cost():
+    """Throughput uses completion tokens over the measured latency."""
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    response = {
+        "choices": [{"text": "one two three", "finish_reason": "stop"}],
+        "model": "m",
+        "usage": {"prompt_tokens": 10, "completion_tokens": 40, "total_tokens": 50},
+        "response_ms": 2000
+    }
+
+    metrics = await client.analyze_response(response)
+
+    assert metrics["tokens_generated"] == 40
+    assert metrics["tokens_per_second"] == 20
+    assert metrics["tokens_estimated"] is False
+    assert metrics["cost"] == 0
+
+@pytest.mark.asyncio
+async def test_analyze_response_without_usage():
+    """Missing usage falls back to the local tokenizer."""
+    client = LLMClient(base_url="http://h", api_key="k", model_name="m")
+    response = {"choices": [{"text": "one two three", "finish_reason": "stop"}], "response_ms": 1000}
+
+    metrics = await client.analyze_response(response)
+
+    assert metrics["tokens_generated"] == 3
+    assert metrics["tokens_estimated"] is True
+    assert metrics["tokens_per_second"] == 3
@@ -0,0 +1,86 @@
+"""Tests for tracing spans and exporters."""
+
+import json
+import pytest
+
+from src.tracing import Tracer, FileSpanExporter, OTLPSpanExporter, SpanExporter, traced, _exporters_from_env
+
+class ListExporter(SpanExporter):
+    """Exporter that keeps spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, spans):
+        self.spans.extend(spans)
+
+def test_nested_spans_share_trace():
+    """Child spans inherit the trace id and link to their parent."""
+    exporter = ListExporter()
+    tracer = Tracer([exporter], batch_size=1)
+
+    with tracer.span("parent", model="m") as parent:
+        with tracer.span("child") as child:
+            child.set_attribute("tokens", 3)
+
+    assert [s.name for s in exporter.spans] == ["child", "parent"]
+    assert child.trace_id == parent.trace_id
+    assert child.parent_id == parent.span_id
+    assert parent.attributes["model"] == "m"
+    assert child.duration_ms >= 0
+
+def test_span_records_errors():
+    """Exceptions mark the span as failed and are re-raised."""
+    exporter = ListExporter()
+    tracer = Tracer([exporter])
+
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError("boom")
+    tracer.flush()
+
+    assert exporter.spans[0].status == "error"
+    assert "boom" in exporter.spans[0].error
+
+def test_file_exporter_writes_jsonl(tmp_path):
+    """The file exporter appends one JSON object per span."""
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer([FileSpanExporter(str(path))])
+
+    with tracer.span("a"):
+        pass
+    with tracer.span("b"):
+        pass
+    tracer.flush()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["name"] for line in lines] == ["a", "b"]
+
+def test_unknown_exporter_is_ignored(monkeypatch, caplog, tmp_path):
+    """A misspelled TRACE_EXPORTER warns instead of failing at import time."""
+    monkeypatch.setenv("TRACE_EXPORTER", "file, otlpp")
+    monkeypatch.setenv("TRACE_FILE", str(tmp_path / "traces.jsonl"))
+    exporters = _exporters_from_env()
+    assert [type(e) for e in exporters] == [FileSpanExporter]
+    assert "otlpp" in caplog.text
+
+def test_otlp_encoding():
+    """Spans are encoded with OTLP/JSON field names."""
+    tracer = Tracer()
+    with tracer.span("root", attempt=2, ok=True) as span:
+        pass
+
+    body = OTLPSpanExporter()._encode([span])
+    otlp_span = body["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert otlp_span["name"] == "root"
+    assert {"key": "attempt", "value": {"intValue": "2"}} in otlp_span["attributes"]
+    assert {"key": "ok", "value": {"boolValue": True}} in otlp_span["attributes"]
+
+def test_disabled_tracer_and_decorator():
+    """Traced functions still run normally when no exporter is configured."""
+    @traced("helper")
+    def helper(x):
+        return x * 2
+
+    assert not Tracer().enabled
+    assert helper(21) == 42